@@ -0,0 +1,227 @@
+# benchmarks/bench_chunking.py
+"""
+Chunking micro-benchmarks.
+
+Each case runs in a fresh child process so peak RSS is attributable to it.
+
+    python benchmarks/bench_chunking.py --pages 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def _corpus(pages: int, page_chars: int) -> List[Dict[str, Any]]:
+    words = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do".split()
+    body = " ".join(words[i % len(words)] for i in range(page_chars // 6))
+    return [
+        {
+            "source": f"/data/corpus/file_{p // 50}.pdf",
+            "page": p % 50 + 1,
+            "text": body[:page_chars],
+            "meta": {"tags": ["a", "b", "c"], "owner": {"team": "x", "id": p}},
+        }
+        for p in range(pages)
+    ]
+
+
+def _run_case(args: Tuple[str, Dict[str, Any], int, int]) -> Tuple[float, int, int]:
+    name, kwargs, pages, page_chars = args
+    from flowfoundry.utils import strategies
+    import flowfoundry.functional  # noqa: F401  (registers strategies)
+
+    fn: Callable[..., List[Dict[str, Any]]] = strategies.get("chunking", name)  # type: ignore[assignment]
+    docs = _corpus(pages, page_chars)
+    t0 = time.perf_counter()
+    out = fn(docs, **kwargs)
+    elapsed = time.perf_counter() - t0
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, len(out), peak_kb
+
+
+def _report(label: str, pages: int, page_chars: int, **case: Any) -> None:
+    name = case.pop("strategy")
+    # fork keeps the parent lean (no corpus yet) and lets nested worker pools
+    # start without re-importing flowfoundry
+    ctx = get_context("fork")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+        elapsed, n, peak_kb = ex.submit(
+            _run_case, (name, case, pages, page_chars)
+        ).result()
+    print(
+        f"{label:<40} {elapsed:8.3f}s  {n:>9} chunks  peak RSS {peak_kb / 1024:8.1f} MiB"
+    )
+
+
+def bench_copy(pages: int, page_chars: int) -> None:
+    print(f"\n# chunk record copies ({pages} pages x {page_chars} chars)")
+    for strategy in ("fixed", "recursive"):
+        for copy_metadata in (True, False):
+            label = f"{strategy} copy_metadata={copy_metadata}"
+            _report(
+                label,
+                pages,
+                page_chars,
+                strategy=strategy,
+                chunk_size=200,
+                chunk_overlap=20,
+                copy_metadata=copy_metadata,
+            )
+
+
+def _find_offsets(text: str, chunk_size: int, chunk_overlap: int) -> int:
+    """Previous fixed() offset recovery: slice, then text.find each part."""
+    step = max(1, chunk_size - chunk_overlap)
+    parts = [text[i : i + chunk_size] for i in range(0, len(text), step)]
+    offset = 0
+    for p in parts:
+        idx = text.find(p, offset)
+        if idx == -1:
+            idx = offset
+        offset = idx + len(p)
+    return len(parts)
+
+
+def bench_fixed_offsets(megabytes: int) -> None:
+    from flowfoundry.functional.chunking.fixed import fixed
+
+    print(
+        f"\n# fixed offsets on {megabytes} MiB documents (chunk_size=800, overlap=80)"
+    )
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz "
+    cases = {
+        # overlapping parts never reappear past the old search offset, so
+        # every text.find scans the whole remainder of the document
+        "non-repetitive": "".join(rng.choices(letters, k=megabytes * 1024 * 1024)),
+        "repetitive": "ab" * (megabytes * 512 * 1024),
+        "near-repetitive": ("a" * 799 + "b") * (megabytes * 1024 * 1024 // 800),
+    }
+    for label, text in cases.items():
+        t0 = time.perf_counter()
+        n_old = _find_offsets(text, 800, 80)
+        t_old = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        n_new = len(fixed(text, chunk_size=800, chunk_overlap=80))
+        t_new = time.perf_counter() - t0
+        print(
+            f"{label:<20} text.find {t_old:8.3f}s  arithmetic {t_new:8.3f}s  "
+            f"({n_old} / {n_new} chunks)"
+        )
+
+
+def bench_recursive_splitters(pages: int, page_chars: int) -> None:
+    from flowfoundry.functional.chunking import recursive
+    from flowfoundry.functional.chunking.recursive import (
+        RecursiveCharacterTextSplitter,
+    )
+
+    print(f"\n# recursive splitter backends ({pages} pages x {page_chars} chars)")
+    docs = _corpus(pages, page_chars)
+    if RecursiveCharacterTextSplitter is not None:
+        t0 = time.perf_counter()
+        for d in docs:  # previous behaviour: new splitter per doc + text.find
+            sp = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=20)
+            offset = 0
+            for p in sp.split_text(d["text"]):
+                idx = d["text"].find(p, offset)
+                offset = (idx if idx != -1 else offset) + len(p)
+        print(f"{'langchain per-doc splitter':<40} {time.perf_counter() - t0:8.3f}s")
+    for splitter in ("langchain", "native"):
+        if splitter == "langchain" and RecursiveCharacterTextSplitter is None:
+            continue
+        t0 = time.perf_counter()
+        n = len(recursive(docs, chunk_size=200, chunk_overlap=20, splitter=splitter))
+        elapsed = time.perf_counter() - t0
+        print(f"{'recursive splitter=' + splitter:<40} {elapsed:8.3f}s  {n:>9} chunks")
+
+
+def _legacy_hybrid(docs: List[Dict[str, Any]], chunk_size: int, overlap: int) -> int:
+    """Previous hybrid(): recursive chunks, deepcopy each, merge by string concat."""
+    from copy import deepcopy
+
+    from flowfoundry.functional.chunking import recursive
+
+    merged: List[Dict[str, Any]] = []
+    buf: Dict[str, Any] | None = None
+    for c in recursive(docs, chunk_size=chunk_size, chunk_overlap=overlap):
+        c = deepcopy(c)
+        if buf is None:
+            buf = c
+        elif buf["doc"] == c["doc"] and len(buf["text"]) < chunk_size // 3:
+            buf["text"] = buf["text"] + "\n" + c["text"]
+            buf["end"] = c["end"]
+        else:
+            merged.append(buf)
+            buf = c
+    if buf is not None:
+        merged.append(buf)
+    return len(merged)
+
+
+def bench_hybrid(pages: int) -> None:
+    from flowfoundry.functional.chunking import hybrid
+
+    # many short pages made of tiny lines: lots of small chunks to merge
+    line = "short line of text\n"
+    docs = [
+        {"doc": f"d{p}", "page": p, "text": line * (20 + p % 30)} for p in range(pages)
+    ]
+    chars = sum(len(d["text"]) for d in docs)
+    print(f"\n# hybrid merge on {pages} short pages ({chars / 1e6:.1f} M chars)")
+    for size in (64, 800):
+        t0 = time.perf_counter()
+        n_old = _legacy_hybrid(docs, size, size // 10)
+        t_old = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        n_new = len(hybrid(docs, chunk_size=size, chunk_overlap=size // 10))
+        t_new = time.perf_counter() - t0
+        print(
+            f"chunk_size={size:<5} concat {t_old:7.3f}s ({chars / t_old / 1e6:6.1f} M chars/s)"
+            f"  offsets {t_new:7.3f}s ({chars / t_new / 1e6:6.1f} M chars/s)"
+            f"  [{n_old} / {n_new} chunks]"
+        )
+
+
+def bench_workers(pages: int, page_chars: int, workers: int) -> None:
+    print(f"\n# process-pool chunking ({pages} pages x {page_chars} chars)")
+    for strategy in ("fixed", "recursive", "hybrid"):
+        for w in sorted({1, workers}):
+            _report(
+                f"{strategy} workers={w}",
+                pages,
+                page_chars,
+                strategy=strategy,
+                chunk_size=200,
+                chunk_overlap=20,
+                workers=w,
+                batch_size=256,
+            )
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--pages", type=int, default=20000)
+    ap.add_argument("--page-chars", type=int, default=2000)
+    ap.add_argument("--megabytes", type=int, default=8)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ns = ap.parse_args(argv)
+    bench_copy(ns.pages, ns.page_chars)
+    bench_fixed_offsets(ns.megabytes)
+    bench_recursive_splitters(ns.pages // 4, ns.page_chars)
+    bench_hybrid(ns.pages)
+    bench_workers(ns.pages, ns.page_chars, ns.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# benchmarks/bench_indexing.py
+"""
+Chroma indexing/query benchmarks.
+
+Builds throwaway persistent stores of synthetic chunks and reports:
+  - upsert throughput and peak RSS for a generator input at several batch sizes
+  - per-query latency with a fresh client per call (the old behaviour) vs the
+    pooled collection handle
+  - queries/sec for a loop of chroma_query vs chroma_query_batch
+  - exact NumPy index search latency on random vectors (no embedding)
+  - mmap store vs fully loaded copy: open time and per-process memory in
+    fresh worker processes
+  - BM25 inverted index: build time, postings size and query latency over
+    a Zipf-distributed vocabulary
+The Chroma cases use Chroma's default embedding function.
+
+    python benchmarks/bench_indexing.py --chunks 5000 --queries 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+WORDS = (
+    "budget tax health care policy revenue school transit housing grant "
+    "program county state city report fund service public plan year"
+).split()
+
+
+def _chunks(n: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield {"doc": f"d{i // 10}", "text": " ".join(rnd.choices(WORDS, k=60))}
+
+
+def _ms(samples: List[float]) -> str:
+    return (
+        f"p50 {statistics.median(samples) * 1e3:7.1f} ms  "
+        f"max {max(samples) * 1e3:7.1f} ms"
+    )
+
+
+def bench_query_pool(path: str, queries: int) -> None:
+    import chromadb
+
+    from flowfoundry.functional.indexing import chroma_query, close_chroma
+
+    print(f"\n# chroma_query latency over {queries} queries")
+    qs = [" ".join(random.Random(i).choices(WORDS, k=4)) for i in range(queries)]
+
+    cold = []
+    for q in qs:
+        t0 = time.perf_counter()
+        coll = chromadb.PersistentClient(path=path).get_or_create_collection("docs")
+        coll.query(query_texts=[q], n_results=5)
+        cold.append(time.perf_counter() - t0)
+    print(f"fresh client per call  {_ms(cold)}")
+
+    close_chroma()
+    warm = []
+    for q in qs:
+        t0 = time.perf_counter()
+        chroma_query(q, k=5, path=path, collection="docs")
+        warm.append(time.perf_counter() - t0)
+    print(f"pooled handle          {_ms(warm)}")
+
+
+def bench_upsert(root: Path, n: int) -> None:
+    from flowfoundry.functional.indexing import chroma_upsert
+
+    print(f"\n# chroma_upsert of {n} generated chunks")
+    for batch_size in (64, 256, 1024):
+        t0 = time.perf_counter()
+        chroma_upsert(
+            _chunks(n), path=str(root / f"b{batch_size}"), batch_size=batch_size
+        )
+        dt = time.perf_counter() - t0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(
+            f"batch_size={batch_size:<5} {dt:7.2f}s  {n / dt:9.1f} chunks/s  "
+            f"peak RSS so far {peak:7.1f} MB"
+        )
+
+
+def bench_query_batch(path: str, queries: int) -> None:
+    from flowfoundry.functional.indexing import chroma_query, chroma_query_batch
+
+    print(f"\n# {queries} queries: loop vs batch")
+    qs = [" ".join(random.Random(i).choices(WORDS, k=4)) for i in range(queries)]
+    t0 = time.perf_counter()
+    for q in qs:
+        chroma_query(q, k=5, path=path)
+    loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    chroma_query_batch(qs, k=5, path=path)
+    batch = time.perf_counter() - t0
+    print(f"chroma_query loop   {queries / loop:9.1f} queries/s")
+    print(f"chroma_query_batch  {queries / batch:9.1f} queries/s")
+
+
+def bench_numpy_search(n: int, dim: int, queries: int) -> None:
+    import numpy as np
+
+    from flowfoundry.functional.indexing import NumpyIndex
+
+    print(f"\n# NumpyIndex exact search, {n} x {dim} float32")
+    rng = np.random.default_rng(0)
+    idx = NumpyIndex()
+    for start in range(0, n, 50_000):
+        m = min(50_000, n - start)
+        ids = [str(start + i) for i in range(m)]
+        idx.upsert(ids, ids, [{}] * m, rng.normal(size=(m, dim)))
+    qs = rng.normal(size=(queries, dim)).astype(np.float32)
+    lat = []
+    for q in qs:
+        t0 = time.perf_counter()
+        idx.search(q[None, :], 10)
+        lat.append(time.perf_counter() - t0)
+    print(f"single query k=10   {_ms(lat)}")
+    t0 = time.perf_counter()
+    idx.search(qs, 10)
+    print(f"batch of {queries} k=10   {(time.perf_counter() - t0) * 1e3:7.1f} ms total")
+
+
+def bench_bm25(n: int, queries: int) -> None:
+    import numpy as np
+
+    from flowfoundry.functional.indexing import BM25Index
+
+    print(f"\n# BM25 inverted index, {n} chunks x 60 tokens")
+    rng = np.random.default_rng(0)
+    vocab = np.array([f"t{i}" for i in range(50_000)])
+    weights = 1.0 / np.arange(1, len(vocab) + 1)
+    weights /= weights.sum()
+    idx = BM25Index()
+    t0 = time.perf_counter()
+    for start in range(0, n, 10_000):
+        m = min(10_000, n - start)
+        words = rng.choice(vocab, size=(m, 60), p=weights)
+        ids = [str(start + i) for i in range(m)]
+        idx.add(ids, [" ".join(w) for w in words], [{}] * m)
+    idx.search("t1", 1)  # merge pending postings
+    build = time.perf_counter() - t0
+    postings = sum(len(seg.tfs) for seg in idx.segments)
+    raw = postings * (8 + 8)  # int64 row + int64 tf, uncompressed
+    packed = sum(seg.postings.nbytes + seg.tfs.nbytes for seg in idx.segments)
+    print(f"build               {build:7.2f} s  ({n / build:,.0f} chunks/s)")
+    print(
+        f"postings            {postings:,} ({packed / postings:.2f} B each, "
+        f"{raw / packed:.1f}x smaller than int64 pairs)"
+    )
+    qs = [" ".join(rng.choice(vocab[:5000], size=3)) for _ in range(queries)]
+    lat = []
+    for q in qs:
+        t0 = time.perf_counter()
+        idx.search(q, 10)
+        lat.append(time.perf_counter() - t0)
+    print(f"query k=10          {_ms(lat)}")
+
+
+def _proc_memory_mb() -> Dict[str, float]:
+    """Rss/Pss of this process (Linux); Pss splits shared pages between sharers."""
+    out = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                out[key] = int(rest.split()[0]) / 1024
+    return out
+
+
+def _serve(args: Any) -> Any:
+    mode, path, dim, barrier = args
+    import numpy as np
+
+    from flowfoundry.functional.indexing import MmapStore
+
+    t0 = time.perf_counter()
+    store = MmapStore(Path(path) / "docs")
+    vectors = store.vectors if mode == "mmap" else np.array(store.vectors)
+    opened = time.perf_counter() - t0
+    q = np.random.default_rng(1).normal(size=(dim,)).astype(np.float32)
+    for _ in range(5):
+        np.argpartition(-(vectors @ q), 10)[:10]
+    barrier.wait()  # measure while every worker holds the index
+    mem = _proc_memory_mb()
+    barrier.wait()
+    return opened, mem
+
+
+def bench_mmap_store(n: int, dim: int, workers: int) -> None:
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import Manager, get_context
+
+    from flowfoundry.functional.indexing.mmap_store import append_to_store
+
+    print(f"\n# {workers} serving processes over {n} x {dim} vectors")
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for start in range(0, n, 50_000):
+            m = min(50_000, n - start)
+            ids = [str(start + i) for i in range(m)]
+            append_to_store(
+                Path(tmp) / "docs", ids, ids, [{}] * m, rng.normal(size=(m, dim))
+            )
+        ctx = get_context("spawn")
+        for mode in ("load", "mmap"):
+            with Manager() as mgr, ProcessPoolExecutor(workers, mp_context=ctx) as ex:
+                barrier = mgr.Barrier(workers)
+                res = list(ex.map(_serve, [(mode, tmp, dim, barrier)] * workers))
+            opened = max(r[0] for r in res)
+            pss = sum(r[1].get("Pss", 0.0) for r in res)
+            print(
+                f"{mode:<5} open {opened * 1e3:8.1f} ms  "
+                f"total PSS across workers {pss:8.1f} MB"
+            )
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--chunks", type=int, default=2000)
+    ap.add_argument("--queries", type=int, default=30)
+    ap.add_argument("--vectors", type=int, default=100_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--workers", type=int, default=4)
+    ns = ap.parse_args(argv)
+
+    bench_numpy_search(ns.vectors, ns.dim, ns.queries)
+    bench_mmap_store(ns.vectors, ns.dim, ns.workers)
+    bench_bm25(ns.vectors, ns.queries)
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_upsert(Path(tmp), ns.chunks)
+        bench_query_pool(str(Path(tmp) / "b256"), ns.queries)
+        bench_query_batch(str(Path(tmp) / "b256"), ns.queries * 10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
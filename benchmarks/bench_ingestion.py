@@ -0,0 +1,111 @@
+# benchmarks/bench_ingestion.py
+"""
+PDF ingestion throughput.
+
+Builds a directory of copies of docs/samples/*.pdf and reports pages/sec, then
+merges them into one large PDF to compare eager vs lazy page extraction
+(time to first page and peak RSS, each measured in a fresh process).
+
+    python benchmarks/bench_ingestion.py --copies 50 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import List, Tuple
+
+SAMPLES = Path(__file__).resolve().parents[1] / "docs" / "samples"
+
+
+def _make_corpus(root: Path, copies: int) -> int:
+    n = 0
+    for i in range(copies):
+        for pdf in sorted(SAMPLES.glob("*.pdf")):
+            shutil.copy(pdf, root / f"{pdf.stem}_{i:05d}.pdf")
+            n += 1
+    return n
+
+
+def bench_pdf_loader(root: Path, workers: int) -> None:
+    from flowfoundry.functional.ingestion import IngestStats, pdf_loader_iter
+
+    print(f"\n# pdf_loader_iter over {root}")
+    for w in sorted({1, workers}):
+        stats = IngestStats()
+        first_page_at = None
+        for _ in pdf_loader_iter(root, workers=w, stats=stats):
+            if first_page_at is None:
+                first_page_at = stats.elapsed
+        print(
+            f"workers={w:<3} {stats.pages:>7} pages  {stats.elapsed:8.2f}s  "
+            f"{stats.pages_per_sec:8.1f} pages/s  first page after {first_page_at:.2f}s"
+        )
+
+
+def _make_big_pdf(dst: Path, copies: int) -> int:
+    from pypdf import PdfReader, PdfWriter
+
+    w = PdfWriter()
+    for _ in range(copies):
+        for pdf in sorted(SAMPLES.glob("*.pdf")):
+            w.append(str(pdf))
+    w.write(str(dst))
+    return len(PdfReader(str(dst)).pages)
+
+
+def _run_extract(args: Tuple[str, str]) -> Tuple[float, float, int]:
+    name, pdf = args
+    from flowfoundry.functional.ingestion import pdf_loader, pdf_pages_iter
+
+    t0 = time.perf_counter()
+    first = 0.0
+    pages = pdf_loader(pdf) if name == "pdf_loader" else pdf_pages_iter(pdf)
+    for i, _ in enumerate(pages):
+        if i == 0:
+            first = time.perf_counter() - t0
+    return (
+        first,
+        time.perf_counter() - t0,
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    )
+
+
+def bench_lazy_pages(pdf: Path, n_pages: int) -> None:
+    print(f"\n# eager vs lazy extraction of one {n_pages}-page PDF")
+    ctx = get_context("fork")
+    for name in ("pdf_loader", "pdf_pages_iter"):
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+            first, total, peak_kb = ex.submit(_run_extract, (name, str(pdf))).result()
+        print(
+            f"{name:<15} first page after {first:7.2f}s  total {total:7.2f}s  "
+            f"peak RSS {peak_kb / 1024:7.1f} MB"
+        )
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--copies", type=int, default=20)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ns = ap.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        n = _make_corpus(root, ns.copies)
+        print(f"{n} PDFs")
+        bench_pdf_loader(root, ns.workers)
+    with tempfile.TemporaryDirectory() as tmp:
+        big = Path(tmp) / "big.pdf"
+        bench_lazy_pages(big, _make_big_pdf(big, ns.copies))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
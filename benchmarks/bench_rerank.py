@@ -0,0 +1,164 @@
+# benchmarks/bench_rerank.py
+"""
+Rerank benchmarks.
+
+  - cross-encoder padding: share of padded token slots when each query's
+    hits are scored in their own predict call (input order) vs pooled
+    across queries and length-sorted (cross_encoder_batch); computed from
+    whitespace token counts, no model needed
+  - cross-encoder throughput (pairs/s) for a loop of cross_encoder vs one
+    cross_encoder_batch call; needs sentence-transformers and the model
+  - bm25_preselect latency at 1k-100k hits: the previous implementation
+    (str.split + a fresh rank_bm25.BM25Okapi + full sort, needs rank-bm25)
+    vs the built-in NumPy scorer, with and without stemming
+
+    python benchmarks/bench_rerank.py --queries 64 --hits 20 \\
+        --model cross-encoder/ms-marco-MiniLM-L-6-v2
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+WORDS = (
+    "budget tax health care policy revenue school transit housing grant "
+    "program county state city report fund service public plan year"
+).split()
+
+
+def _workload(
+    queries: int, hits: int, seed: int = 0
+) -> Tuple[List[str], List[List[Dict]]]:
+    rnd = random.Random(seed)
+    qs = [" ".join(rnd.choices(WORDS, k=rnd.randint(2, 8))) for _ in range(queries)]
+    lists = [
+        [
+            {"text": " ".join(rnd.choices(WORDS, k=rnd.randint(10, 250)))}
+            for _ in range(hits)
+        ]
+        for _ in range(queries)
+    ]
+    return qs, lists
+
+
+def _padding(lengths: List[int], batch_size: int) -> float:
+    """Fraction of token slots that are padding when batched in the given order."""
+    slots = real = 0
+    for i in range(0, len(lengths), batch_size):
+        batch = lengths[i : i + batch_size]
+        slots += max(batch) * len(batch)
+        real += sum(batch)
+    return 1 - real / slots
+
+
+def bench_padding(qs: List[str], lists: List[List[Dict]], batch_size: int) -> None:
+    print(
+        f"\n# cross-encoder padding, {len(qs)} queries x {len(lists[0])} hits, batch {batch_size}"
+    )
+    per_query = []
+    for q, hs in zip(qs, lists):
+        per_query.append(
+            _padding([len((q + " " + h["text"]).split()) for h in hs], batch_size)
+        )
+    pooled = sorted(
+        len((q + " " + h["text"]).split()) for q, hs in zip(qs, lists) for h in hs
+    )
+    print(f"per-query, input order   {sum(per_query) / len(per_query):6.1%} padding")
+    print(f"pooled, length-sorted    {_padding(pooled, batch_size):6.1%} padding")
+
+
+def bench_throughput(
+    qs: List[str], lists: List[List[Dict]], model: str, batch_size: int
+) -> None:
+    from flowfoundry.functional.rerank import (
+        cross_encoder,
+        cross_encoder_batch,
+        preload_cross_encoders,
+    )
+
+    preload_cross_encoders([model])
+    pairs = sum(len(h) for h in lists)
+    print(f"\n# cross-encoder throughput, {model}")
+    t0 = time.perf_counter()
+    for q, hs in zip(qs, lists):
+        cross_encoder(q, hs, model=model, batch_size=batch_size)
+    loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cross_encoder_batch(qs, lists, model=model, batch_size=batch_size)
+    batch = time.perf_counter() - t0
+    print(f"cross_encoder loop       {pairs / loop:9.1f} pairs/s")
+    print(f"cross_encoder_batch      {pairs / batch:9.1f} pairs/s")
+
+
+def _rank_bm25_preselect(query: str, hits: List[Dict], top_k: int) -> List[Dict]:
+    """bm25_preselect as it was before the NumPy scorer."""
+    from rank_bm25 import BM25Okapi
+
+    bm25 = BM25Okapi([h.get("text", "").split() for h in hits])
+    scores = bm25.get_scores(query.split())
+    paired = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+    return [hits[i] for i, _ in paired[:top_k]]
+
+
+def bench_bm25(sizes: List[int], repeats: int = 3) -> None:
+    from flowfoundry.functional.rerank import bm25_preselect
+
+    try:
+        import rank_bm25  # noqa: F401
+
+        have_rank_bm25 = True
+    except ImportError:
+        have_rank_bm25 = False
+    print("\n# bm25_preselect, top_k=20 (best of %d, ms)" % repeats)
+    print(f"{'hits':>8} {'rank_bm25':>10} {'numpy':>10} {'numpy+stem':>11}")
+    rnd = random.Random(1)
+    for n in sizes:
+        hits = [
+            {"text": " ".join(rnd.choices(WORDS, k=rnd.randint(40, 120)))}
+            for _ in range(n)
+        ]
+        query = "public housing grant report"
+
+        def best(fn: Any) -> float:
+            out = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                fn()
+                out.append(time.perf_counter() - t0)
+            return min(out) * 1e3
+
+        old = (
+            f"{best(lambda: _rank_bm25_preselect(query, hits, 20)):10.1f}"
+            if have_rank_bm25
+            else f"{'n/a':>10}"
+        )
+        new = best(lambda: bm25_preselect(query, hits, top_k=20))
+        stem = best(lambda: bm25_preselect(query, hits, top_k=20, stem=True))
+        print(f"{n:>8} {old} {new:10.1f} {stem:11.1f}")
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--queries", type=int, default=64)
+    ap.add_argument("--hits", type=int, default=20)
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--model", default=None, help="cross-encoder to time (optional)")
+    ap.add_argument(
+        "--bm25-hits", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    ns = ap.parse_args(argv)
+
+    qs, lists = _workload(ns.queries, ns.hits)
+    bench_padding(qs, lists, ns.batch_size)
+    if ns.model:
+        bench_throughput(qs, lists, ns.model, ns.batch_size)
+    bench_bm25(ns.bm25_hits)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
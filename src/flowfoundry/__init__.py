@@ -4,13 +4,37 @@ from .functional import (
     chunk_fixed,
     chunk_recursive,
     chunk_hybrid,
+    chunk_fixed_iter,
+    chunk_recursive_iter,
+    chunk_hybrid_iter,
+    chunk_token,
+    chunk_token_iter,
+    embed_hashing,
+    embed_sentence_transformer,
+    embed_cached,
+    get_embedder,
     index_chroma_upsert,
     index_chroma_query,
+    index_chroma_query_batch,
+    index_numpy_upsert,
+    index_numpy_query,
+    index_mmap_upsert,
+    index_mmap_query,
+    index_ivf_upsert,
+    index_ivf_query,
+    index_bm25_upsert,
+    index_bm25_query,
+    index_hybrid_upsert,
+    index_hybrid_query,
     rerank_identity,
     rerank_cross_encoder,
+    rerank_cross_encoder_batch,
+    rerank_fusion,
     preselect_bm25,
     compose_llm,
     pdf_loader,
+    pdf_loader_iter,
+    pdf_pages_iter,
 )
 
 from .model import HFProvider, OpenAIProvider, OllamaProvider, LangChainProvider
@@ -24,13 +48,37 @@ __all__ = [
     "chunk_fixed",
     "chunk_recursive",
     "chunk_hybrid",
+    "chunk_fixed_iter",
+    "chunk_recursive_iter",
+    "chunk_hybrid_iter",
+    "chunk_token",
+    "chunk_token_iter",
+    "embed_hashing",
+    "embed_sentence_transformer",
+    "embed_cached",
+    "get_embedder",
     "index_chroma_upsert",
     "index_chroma_query",
+    "index_chroma_query_batch",
+    "index_numpy_upsert",
+    "index_numpy_query",
+    "index_mmap_upsert",
+    "index_mmap_query",
+    "index_ivf_upsert",
+    "index_ivf_query",
+    "index_bm25_upsert",
+    "index_bm25_query",
+    "index_hybrid_upsert",
+    "index_hybrid_query",
     "rerank_identity",
     "rerank_cross_encoder",
+    "rerank_cross_encoder_batch",
+    "rerank_fusion",
     "preselect_bm25",
     "compose_llm",
     "pdf_loader",
+    "pdf_loader_iter",
+    "pdf_pages_iter",
     # providers
     "HFProvider",
     "OpenAIProvider",
@@ -5,7 +5,7 @@ import inspect
 import json
 import os
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import typer
 
@@ -52,6 +52,15 @@ def _load_kwargs(kwargs: str | None, kwargs_file: str | None) -> Dict[str, Any]:
     return {}
 
 
+def _materialize(result: Any) -> Any:
+    """Drain generators/iterators (e.g. streaming strategies) so they can be printed."""
+    if isinstance(result, Iterator):
+        return list(result)
+    if hasattr(result, "tolist"):  # numpy arrays (embedding strategies)
+        return result.tolist()
+    return result
+
+
 def _env_plugin_paths() -> List[str]:
     """
     Read FLOWFOUNDRY_PLUGINS from env (pathsep-separated).
@@ -140,7 +149,7 @@ def call(
     raw = _load_kwargs(kwargs, kwargs_file)
     args = _coerce_kwargs(fn, raw)
 
-    result = fn(**args)
+    result = _materialize(fn(**args))
     try:
         s = json.dumps(result, ensure_ascii=False, indent=2 if pretty else None)
         typer.echo(s)
@@ -176,7 +185,7 @@ def _register_family_commands() -> None:
                 ):
                     raw = _load_kwargs(kwargs, kwargs_file)
                     args = _coerce_kwargs(_fn, raw)
-                    res = _fn(**args)
+                    res = _materialize(_fn(**args))
                     try:
                         s = json.dumps(
                             res, ensure_ascii=False, indent=2 if pretty else None
@@ -2,18 +2,42 @@ from .chunking import (
     fixed as chunk_fixed,
     recursive as chunk_recursive,
     hybrid as chunk_hybrid,
+    fixed_iter as chunk_fixed_iter,
+    recursive_iter as chunk_recursive_iter,
+    hybrid_iter as chunk_hybrid_iter,
+    token as chunk_token,
+    token_iter as chunk_token_iter,
+)
+from .embedding import (
+    hashing as embed_hashing,
+    sentence_transformer as embed_sentence_transformer,
+    cached as embed_cached,
+    get_embedder,
 )
 from .indexing import (
     chroma_upsert as index_chroma_upsert,
     chroma_query as index_chroma_query,
+    chroma_query_batch as index_chroma_query_batch,
+    numpy_upsert as index_numpy_upsert,
+    numpy_query as index_numpy_query,
+    mmap_upsert as index_mmap_upsert,
+    mmap_query as index_mmap_query,
+    ivf_upsert as index_ivf_upsert,
+    ivf_query as index_ivf_query,
+    bm25_upsert as index_bm25_upsert,
+    bm25_query as index_bm25_query,
+    hybrid_upsert as index_hybrid_upsert,
+    hybrid_query as index_hybrid_query,
 )
 from .rerank import (
     identity as rerank_identity,
     cross_encoder as rerank_cross_encoder,
+    cross_encoder_batch as rerank_cross_encoder_batch,
+    fusion as rerank_fusion,
     bm25_preselect as preselect_bm25,
 )
 
-from .ingestion import pdf_loader
+from .ingestion import pdf_loader, pdf_loader_iter, pdf_pages_iter
 
 from .composer import compose_llm
 
@@ -21,11 +45,35 @@ __all__ = [
     "chunk_fixed",
     "chunk_recursive",
     "chunk_hybrid",
+    "chunk_fixed_iter",
+    "chunk_recursive_iter",
+    "chunk_hybrid_iter",
+    "chunk_token",
+    "chunk_token_iter",
     "pdf_loader",
+    "pdf_loader_iter",
+    "pdf_pages_iter",
+    "embed_hashing",
+    "embed_sentence_transformer",
+    "embed_cached",
+    "get_embedder",
     "index_chroma_upsert",
     "index_chroma_query",
+    "index_chroma_query_batch",
+    "index_numpy_upsert",
+    "index_numpy_query",
+    "index_mmap_upsert",
+    "index_mmap_query",
+    "index_ivf_upsert",
+    "index_ivf_query",
+    "index_bm25_upsert",
+    "index_bm25_query",
+    "index_hybrid_upsert",
+    "index_hybrid_query",
     "rerank_identity",
     "rerank_cross_encoder",
+    "rerank_cross_encoder_batch",
+    "rerank_fusion",
     "preselect_bm25",
     "compose_llm",
 ]
@@ -1,5 +1,15 @@
-from .fixed import fixed
-from .recursive import recursive
-from .hybrid import hybrid
+from .fixed import fixed, fixed_iter
+from .recursive import recursive, recursive_iter
+from .hybrid import hybrid, hybrid_iter
+from .token import token, token_iter
 
-__all__ = ["fixed", "recursive", "hybrid"]
+__all__ = [
+    "fixed",
+    "recursive",
+    "hybrid",
+    "fixed_iter",
+    "recursive_iter",
+    "hybrid_iter",
+    "token",
+    "token_iter",
+]
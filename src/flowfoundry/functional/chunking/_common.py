@@ -0,0 +1,106 @@
+from __future__ import annotations
+from copy import deepcopy
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, Tuple, Union
+
+from ...utils import InDoc, Chunk, FFConfigError
+from ...utils.parallel import batched, imap_ordered
+
+# (start, end) character offsets into a document's text
+Span = Tuple[int, int]
+
+
+def _make_chunk(
+    doc: InDoc,
+    text: str,
+    start: int,
+    end: int,
+    index: int,
+    *,
+    default_doc_id: str,
+    copy_metadata: bool = False,
+) -> Chunk:
+    """
+    Build one chunk record from its parent doc.
+
+    By default the record is a shallow copy: metadata values are shared with the
+    parent (and with sibling chunks), only 'text'/'start'/'end'/'chunk_index' are
+    new. Pass copy_metadata=True to get a fully isolated deep copy per chunk.
+    """
+    out = deepcopy(doc) if copy_metadata else dict(doc)
+    out["text"] = text
+    out["start"] = start
+    out["end"] = end
+    out.setdefault("doc", default_doc_id)
+    out["chunk_index"] = index
+    return out
+
+
+def _check_sizes(chunk_size: int, chunk_overlap: int) -> None:
+    """Reject window settings that cannot make progress through a document."""
+    if chunk_size < 1:
+        raise FFConfigError(f"chunk_size must be >= 1, got {chunk_size}")
+    if not 0 <= chunk_overlap < chunk_size:
+        raise FFConfigError(
+            f"chunk_overlap must be in [0, chunk_size), got {chunk_overlap} "
+            f"for chunk_size={chunk_size}"
+        )
+
+
+def _check_doc(doc: InDoc) -> str:
+    """Validate an input dict and return its text."""
+    if "text" not in doc or not isinstance(doc["text"], str):
+        raise ValueError(
+            f"Expected doc['text'] to be a string, got {type(doc.get('text')).__name__}"
+        )
+    return doc["text"]
+
+
+def _chunk_batch(
+    chunk_doc: Callable[[InDoc], List[Chunk]], batch: List[InDoc]
+) -> List[Chunk]:
+    """Chunk a batch of docs in order (one unit of work for a pool worker)."""
+    out: List[Chunk] = []
+    for doc in batch:
+        if not isinstance(doc, dict):
+            raise ValueError(f"Each item must be a dict, got {type(doc).__name__}")
+        out.extend(chunk_doc(doc))
+    return out
+
+
+def _iter_docs(
+    data: Union[str, Iterable[InDoc]],
+    chunk_doc: Callable[[InDoc], List[Chunk]],
+    doc_id: str,
+    workers: int = 1,
+    batch_size: int = 64,
+) -> Iterator[Chunk]:
+    """
+    Lazily apply `chunk_doc` to every input dict, yielding chunks in order.
+
+    `data` may be a single string (treated as one doc with id `doc_id`) or any
+    iterable of dicts, including a generator that is consumed one item at a time.
+
+    With workers > 1, docs are grouped into batches of `batch_size` and chunked
+    in a process pool; output order (and therefore chunk_index) is identical to
+    the serial path. `chunk_doc` must then be picklable (e.g. a functools.partial
+    of a module-level function).
+    """
+    if isinstance(data, str):
+        yield from chunk_doc({"doc": doc_id, "text": data})
+        return
+    if isinstance(data, dict) or not isinstance(data, Iterable):
+        raise ValueError(
+            f"Expected data to be str or an iterable of dicts, got {type(data).__name__}"
+        )
+    if workers > 1:
+        batches = batched(data, batch_size)
+        for chunks in imap_ordered(
+            partial(_chunk_batch, chunk_doc), batches, workers=workers
+        ):
+            yield from chunks
+        return
+    for doc in data:
+        if not isinstance(doc, dict):
+            raise ValueError(f"Each item must be a dict, got {type(doc).__name__}")
+        yield from chunk_doc(doc)
@@ -1,62 +1,58 @@
 from __future__ import annotations
-from typing import List, Union
-from copy import deepcopy
+from functools import partial
+from typing import Iterable, Iterator, List, Union
 
 from ...utils import InDoc, Chunk, register_strategy
+from ._common import Span, _make_chunk, _check_doc, _check_sizes, _iter_docs
 
 
-def _fixed_split(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
-    """Deterministic fixed-size splitting into strings."""
+def _fixed_spans(text: str, chunk_size: int, chunk_overlap: int) -> List[Span]:
+    """Deterministic fixed-size splitting into (start, end) offsets."""
     step = max(1, chunk_size - chunk_overlap)
-    parts: List[str] = []
-    for i in range(0, len(text), step):
-        t = text[i : i + chunk_size]
-        if t:
-            parts.append(t)
-    return parts
+    n = len(text)
+    return [(i, min(i + chunk_size, n)) for i in range(0, n, step)]
 
 
 def _chunk_one_doc(
-    doc: InDoc, chunk_size: int, chunk_overlap: int, default_doc_id: str
+    doc: InDoc,
+    chunk_size: int,
+    chunk_overlap: int,
+    default_doc_id: str,
+    copy_metadata: bool = False,
 ) -> List[Chunk]:
     """Split a single input dict with fixed-size logic, preserving metadata."""
-    if "text" not in doc or not isinstance(doc["text"], str):
-        raise ValueError(
-            f"Expected doc['text'] to be a string, got {type(doc.get('text')).__name__}"
+    text = _check_doc(doc)
+    spans = _fixed_spans(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return [
+        _make_chunk(
+            doc,
+            text[start:end],
+            start,
+            end,
+            i,
+            default_doc_id=default_doc_id,
+            copy_metadata=copy_metadata,
         )
-
-    text = doc["text"]
-    parts = _fixed_split(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-
-    chunks: List[Chunk] = []
-    offset = 0
-    for i, p in enumerate(parts):
-        idx = text.find(p, offset)
-        if idx == -1:
-            idx = offset
-        out = deepcopy(doc)  # preserve all original metadata
-        out["text"] = p
-        out["start"] = idx
-        out["end"] = idx + len(p)
-        out.setdefault("doc", doc.get("doc", default_doc_id))
-        out["chunk_index"] = i
-        chunks.append(out)
-        offset = idx + len(p)
-    return chunks
+        for i, (start, end) in enumerate(spans)
+    ]
 
 
 @register_strategy("chunking", "fixed")
 def fixed(
-    data: Union[str, List[InDoc]],
+    data: Union[str, Iterable[InDoc]],
     *,
     chunk_size: int = 800,
     chunk_overlap: int = 80,
     doc_id: str = "doc",
+    copy_metadata: bool = False,
+    workers: int = 1,
+    batch_size: int = 64,
 ) -> List[Chunk]:
     """
     Fixed-size chunking that accepts:
       - a single string, or
-      - a list of dicts with at least {'text': <str>} plus any extra metadata.
+      - a list (or any iterable) of dicts with at least {'text': <str>} plus any
+        extra metadata.
 
     Returns list[dict] where:
       - 'text' is the chunk text
@@ -64,45 +60,47 @@ def fixed(
       - all original metadata keys are preserved
       - 'doc' is preserved or set to `doc_id` if missing
       - 'chunk_index' is the chunk order within its parent doc
-    """
-    # Case 1: single string input
-    if isinstance(data, str):
-        text = data
-        parts = _fixed_split(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        chunks: List[Chunk] = []
-        offset = 0
-        for i, p in enumerate(parts):
-            idx = text.find(p, offset)
-            if idx == -1:
-                idx = offset
-            chunks.append(
-                {
-                    "doc": doc_id,
-                    "text": p,
-                    "start": idx,
-                    "end": idx + len(p),
-                    "chunk_index": i,
-                }
-            )
-            offset = idx + len(p)
-        return chunks
 
-    # Case 2: list of dicts input
-    if not isinstance(data, list):
-        raise ValueError(
-            f"Expected data to be str or list[dict], got {type(data).__name__}"
-        )
+    Chunks are shallow copies of their parent dict: nested metadata objects are
+    shared, not duplicated. Set `copy_metadata=True` for fully isolated deep copies.
 
-    out: List[Chunk] = []
-    for doc in data:
-        if not isinstance(doc, dict):
-            raise ValueError(f"Each item must be a dict, got {type(doc).__name__}")
-        out.extend(
-            _chunk_one_doc(
-                doc,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                default_doc_id=doc_id,
-            )
+    Set `workers` > 1 to chunk in a process pool (`batch_size` docs per task);
+    output order and chunk_index are identical to the serial path.
+    """
+    return list(
+        fixed_iter(
+            data,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            doc_id=doc_id,
+            copy_metadata=copy_metadata,
+            workers=workers,
+            batch_size=batch_size,
         )
-    return out
+    )
+
+
+@register_strategy("chunking", "fixed_iter")
+def fixed_iter(
+    data: Union[str, Iterable[InDoc]],
+    *,
+    chunk_size: int = 800,
+    chunk_overlap: int = 80,
+    doc_id: str = "doc",
+    copy_metadata: bool = False,
+    workers: int = 1,
+    batch_size: int = 64,
+) -> Iterator[Chunk]:
+    """
+    Streaming variant of `fixed`: consumes `data` lazily (any iterable of dicts,
+    e.g. an ingestion generator) and yields chunks one at a time.
+    """
+    _check_sizes(chunk_size, chunk_overlap)
+    chunk_doc = partial(
+        _chunk_one_doc,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        default_doc_id=doc_id,
+        copy_metadata=copy_metadata,
+    )
+    return _iter_docs(data, chunk_doc, doc_id, workers, batch_size)
@@ -1,89 +1,137 @@
 from __future__ import annotations
-from typing import List, Union
-from copy import deepcopy
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from ...utils import InDoc, Chunk, register_strategy
-from .recursive import recursive
+from ._common import Span, _make_chunk, _check_doc, _check_sizes, _iter_docs
+from .recursive import DEFAULT_SEPARATORS, _spans
+
+
+def _merge_small(spans: List[Span], merge_threshold: int) -> List[Span]:
+    """
+    Merge adjacent spans while the running span is shorter than merge_threshold.
+    Overlapping neighbours collapse into one contiguous range.
+    """
+    merged: List[Span] = []
+    buf: Optional[Span] = None
+    for s, e in spans:
+        if buf is None:
+            buf = (s, e)
+        elif buf[1] - buf[0] < merge_threshold:
+            buf = (buf[0], max(buf[1], e))
+        else:
+            merged.append(buf)
+            buf = (s, e)
+    if buf is not None:
+        merged.append(buf)
+    return merged
+
+
+def _chunk_one_doc(
+    doc: InDoc,
+    chunk_size: int,
+    chunk_overlap: int,
+    merge_threshold: int,
+    default_doc_id: str,
+    copy_metadata: bool = False,
+    separators: Tuple[str, ...] = DEFAULT_SEPARATORS,
+    splitter: str = "native",
+) -> List[Chunk]:
+    """Recursive-split one doc, merge small spans, and slice the text once per chunk."""
+    text = _check_doc(doc)
+    spans = _spans(text, chunk_size, chunk_overlap, separators, splitter)
+    return [
+        _make_chunk(
+            doc,
+            text[start:end],
+            start,
+            end,
+            i,
+            default_doc_id=default_doc_id,
+            copy_metadata=copy_metadata,
+        )
+        for i, (start, end) in enumerate(_merge_small(spans, merge_threshold))
+    ]
 
 
 @register_strategy("chunking", "hybrid")
 def hybrid(
-    data: Union[str, List[InDoc]],
+    data: Union[str, Iterable[InDoc]],
     *,
     chunk_size: int = 800,
     chunk_overlap: int = 80,
     doc_id: str = "doc",
+    merge_threshold: Optional[int] = None,
+    copy_metadata: bool = False,
+    separators: Optional[Sequence[str]] = None,
+    splitter: str = "native",
+    workers: int = 1,
+    batch_size: int = 64,
 ) -> List[Chunk]:
     """
     Hybrid chunking:
-      1) Run recursive chunker to get fine-grained chunks.
-      2) Merge small adjacent chunks (from the same 'doc') into larger ones:
-         - If the current buffer's text length < chunk_size // 3, append the next chunk.
-         - Otherwise, flush the buffer.
+      1) Split each doc with the recursive splitter into (start, end) spans.
+      2) Merge small adjacent spans of the same doc into larger ones:
+         - While the current span is shorter than `merge_threshold`
+           (default: chunk_size // 3), extend it to the end of the next span.
+         - Otherwise, emit it and start a new one.
+      3) Slice the original text once per merged span.
 
     Input:
-      - data: str OR list of dicts with at least {"text": <str>} plus any metadata.
+      - data: str OR list (or any iterable) of dicts with at least {"text": <str>}
+        plus any metadata.
 
     Output:
-      - list of dicts preserving original metadata; with 'text', 'start', 'end', and 'chunk_index'.
+      - list of dicts preserving original metadata; with 'text', 'start', 'end', and
+        'chunk_index' (order within the parent doc). 'text' is always
+        text[start:end] of the parent, so merged chunks keep the original spacing.
+
+    Set `workers` > 1 to chunk in a process pool (`batch_size` docs per task);
+    output order and chunk_index are identical to the serial path.
     """
-    # Step 1: get base chunks via recursive
-    parts: List[Chunk] = recursive(
-        data, chunk_size=chunk_size, chunk_overlap=chunk_overlap, doc_id=doc_id
+    return list(
+        hybrid_iter(
+            data,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            doc_id=doc_id,
+            merge_threshold=merge_threshold,
+            copy_metadata=copy_metadata,
+            separators=separators,
+            splitter=splitter,
+            workers=workers,
+            batch_size=batch_size,
+        )
     )
 
-    merged: List[Chunk] = []
-    buf: Chunk | None = None
-
-    for c in parts:
-        # Defensive copies so we don't mutate upstream
-        c = deepcopy(c)
-
-        # Start a new buffer if empty
-        if buf is None:
-            buf = c
-            continue
-
-        # Merge only if same document id to avoid cross-doc merges
-        same_doc = buf.get("doc") == c.get("doc")
-
-        # If current buffer is "small", append next chunk's text; else flush
-        if same_doc and len(str(buf.get("text", ""))) < (chunk_size // 3):
-            # concatenate text with a newline separator
-            buf_text = str(buf.get("text", ""))
-            c_text = str(c.get("text", ""))
-            new_text = (buf_text + "\n" + c_text) if buf_text else c_text
 
-            # Update buffer text and end offset
-            buf["text"] = new_text
-            # 'start' remains the original buf['start']; 'end' should move forward
-            if "end" in c:
-                buf["end"] = c["end"]
-            else:
-                buf["end"] = buf.get("start", 0) + len(new_text)
-
-            # You could optionally track merged children indices here if useful:
-            # buf.setdefault("merged_from", []).extend([buf.get("chunk_index"), c.get("chunk_index")])
-        else:
-            # Flush buffer, start new one
-            merged.append(buf)
-            buf = c
-
-    if buf is not None:
-        merged.append(buf)
-
-    # Re-number chunk_index to reflect post-merge ordering
-    for i, m in enumerate(merged):
-        m["chunk_index"] = i
-
-        # Ensure start/end exist (for safety if upstream didn't set them)
-        t = str(m.get("text", ""))
-        if "start" not in m or not isinstance(m["start"], int):
-            m["start"] = 0
-        if "end" not in m or not isinstance(m["end"], int):
-            m["end"] = m["start"] + len(t)
-
-        # Ensure doc id is present
-        m.setdefault("doc", doc_id)
-
-    return merged
+@register_strategy("chunking", "hybrid_iter")
+def hybrid_iter(
+    data: Union[str, Iterable[InDoc]],
+    *,
+    chunk_size: int = 800,
+    chunk_overlap: int = 80,
+    doc_id: str = "doc",
+    merge_threshold: Optional[int] = None,
+    copy_metadata: bool = False,
+    separators: Optional[Sequence[str]] = None,
+    splitter: str = "native",
+    workers: int = 1,
+    batch_size: int = 64,
+) -> Iterator[Chunk]:
+    """
+    Streaming variant of `hybrid`: consumes `data` lazily and yields merged
+    chunks one at a time.
+    """
+    _check_sizes(chunk_size, chunk_overlap)
+    chunk_doc = partial(
+        _chunk_one_doc,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        merge_threshold=chunk_size // 3 if merge_threshold is None else merge_threshold,
+        default_doc_id=doc_id,
+        copy_metadata=copy_metadata,
+        separators=tuple(separators) if separators else DEFAULT_SEPARATORS,
+        splitter=splitter,
+    )
+    return _iter_docs(data, chunk_doc, doc_id, workers, batch_size)
@@ -1,9 +1,21 @@
 from __future__ import annotations
-from typing import List, Optional, Any, cast, Union
-from copy import deepcopy
+from bisect import bisect_left, bisect_right
+from functools import lru_cache, partial
+from itertools import accumulate
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
-from ...utils import InDoc, Chunk, register_strategy
-from .fixed import fixed
+from ...utils import InDoc, Chunk, register_strategy, FFConfigError, FFDependencyError
+from ._common import Span, _make_chunk, _check_doc, _check_sizes, _iter_docs
 
 RecursiveCharacterTextSplitter: Optional[Any]
 try:
@@ -13,61 +25,204 @@ try:
 except Exception:
     RecursiveCharacterTextSplitter = None
 
+DEFAULT_SEPARATORS: Tuple[str, ...] = ("\n\n", "\n", " ", "")
 
-def _chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
-    """Chunk a single string using RCTS if available, else fixed()."""
+
+# ---------- native splitter (offset based) ----------
+def _strip_span(text: str, start: int, end: int) -> Optional[Span]:
+    """Shrink [start, end) past surrounding whitespace; None if nothing is left."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return (start, end) if start < end else None
+
+
+def _split_on(text: str, start: int, end: int, separator: str) -> List[Span]:
+    """
+    Split text[start:end] on `separator`, keeping the separator at the start of
+    the following piece (so the pieces stay contiguous).
+    """
+    if not separator:
+        return [(i, i + 1) for i in range(start, end)]
+    k = len(separator)
+    pieces = text[start:end].split(separator)
+    # piece 0 stands alone; every later piece is re-prefixed with its separator
+    lengths = [len(pieces[0])] + [len(p) + k for p in pieces[1:]]
+    bounds = list(accumulate(lengths, initial=start))
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _merge_spans(
+    text: str, splits: List[Span], chunk_size: int, chunk_overlap: int
+) -> List[Span]:
+    """
+    Greedily merge contiguous small spans (each < chunk_size) into chunks of
+    <= chunk_size, carrying a tail of <= chunk_overlap chars into the next one.
+
+    Works on the split boundaries, so each chunk costs a couple of bisections
+    rather than a step per split.
+    """
+    if not splits:
+        return []
+    bounds = [splits[0][0]] + [e for _, e in splits]
+    m = len(splits)
+    out: List[Span] = []
+    lo = 0  # current window starts at split `lo`
+    while True:
+        # first split that no longer fits in a window starting at `lo`
+        hi = bisect_right(bounds, bounds[lo] + chunk_size, lo + 1) - 1
+        if hi >= m:
+            break
+        merged = _strip_span(text, bounds[lo], bounds[hi])
+        if merged is not None:
+            out.append(merged)
+        # drop leading splits until the tail fits the overlap and the next split
+        lo = max(
+            bisect_left(bounds, bounds[hi] - chunk_overlap, lo, hi),
+            bisect_left(bounds, bounds[hi + 1] - chunk_size, lo, hi),
+        )
+    merged = _strip_span(text, bounds[lo], bounds[m])
+    if merged is not None:
+        out.append(merged)
+    return out
+
+
+def _recursive_spans(
+    text: str,
+    start: int,
+    end: int,
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: Sequence[str],
+) -> List[Span]:
+    """
+    Offset-based equivalent of LangChain's RecursiveCharacterTextSplitter:
+    split on the first separator present, recurse into pieces that are still
+    too long, and merge runs of small pieces back up to chunk_size.
+    """
+    separator = separators[-1]
+    rest: Sequence[str] = ()
+    for i, sep in enumerate(separators):
+        if sep == "":
+            separator = sep
+            break
+        if text.find(sep, start, end) != -1:
+            separator = sep
+            rest = separators[i + 1 :]
+            break
+
+    out: List[Span] = []
+    good: List[Span] = []
+    for s, e in _split_on(text, start, end, separator):
+        if e - s < chunk_size:
+            good.append((s, e))
+            continue
+        if good:
+            out.extend(_merge_spans(text, good, chunk_size, chunk_overlap))
+            good = []
+        if rest:
+            out.extend(_recursive_spans(text, s, e, chunk_size, chunk_overlap, rest))
+        else:
+            out.append((s, e))
+    if good:
+        out.extend(_merge_spans(text, good, chunk_size, chunk_overlap))
+    return out
+
+
+# ---------- LangChain splitter (cached instances) ----------
+@lru_cache(maxsize=32)
+def _get_splitter(
+    chunk_size: int, chunk_overlap: int, separators: Tuple[str, ...]
+) -> Any:
+    """One RecursiveCharacterTextSplitter per configuration, reused across docs."""
     if RecursiveCharacterTextSplitter is None:
-        fixed_chunks = fixed(
-            text, chunk_size=chunk_size, chunk_overlap=chunk_overlap, doc_id=""
+        raise FFDependencyError(
+            "splitter='langchain' requires `pip install langchain-text-splitters`"
         )
-        return [cast(str, ch["text"]) for ch in fixed_chunks]
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=list(separators)
+    )
+
+
+def _langchain_spans(
+    text: str, chunk_size: int, chunk_overlap: int, separators: Tuple[str, ...]
+) -> List[Span]:
+    splitter = _get_splitter(chunk_size, chunk_overlap, separators)
+    parts = cast(List[str], splitter.split_text(text))
+    # Same start-index recovery LangChain uses for add_start_index=True
+    spans: List[Span] = []
+    idx, prev_len = -1, 0
+    for p in parts:
+        offset = idx + prev_len - chunk_overlap
+        idx = text.find(p, max(0, offset))
+        spans.append((idx, idx + len(p)))
+        prev_len = len(p)
+    return spans
+
+
+def _spans(
+    text: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: Tuple[str, ...],
+    splitter: str,
+) -> List[Span]:
+    if splitter == "native":
+        return _recursive_spans(
+            text, 0, len(text), chunk_size, chunk_overlap, separators
+        )
+    if splitter == "langchain":
+        return _langchain_spans(text, chunk_size, chunk_overlap, separators)
+    raise FFConfigError(
+        f"Unknown splitter '{splitter}'. Expected 'native' or 'langchain'."
     )
-    return cast(List[str], splitter.split_text(text))
 
 
 def _chunk_one_doc(
-    doc: InDoc, chunk_size: int, chunk_overlap: int, default_doc_id: str
+    doc: InDoc,
+    chunk_size: int,
+    chunk_overlap: int,
+    default_doc_id: str,
+    copy_metadata: bool = False,
+    separators: Tuple[str, ...] = DEFAULT_SEPARATORS,
+    splitter: str = "native",
 ) -> List[Chunk]:
     """Chunk a single input dict, preserving metadata and adding start/end offsets."""
-    if "text" not in doc or not isinstance(doc["text"], str):
-        raise ValueError(
-            f"Expected doc['text'] to be a string, got {type(doc.get('text')).__name__}"
+    text = _check_doc(doc)
+    spans = _spans(text, chunk_size, chunk_overlap, separators, splitter)
+    return [
+        _make_chunk(
+            doc,
+            text[start:end],
+            start,
+            end,
+            i,
+            default_doc_id=default_doc_id,
+            copy_metadata=copy_metadata,
         )
-
-    text = doc["text"]
-    parts = _chunk_text(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-
-    chunks: List[Chunk] = []
-    offset = 0
-    for i, p in enumerate(parts):
-        idx = text.find(p, offset)
-        if idx == -1:
-            idx = offset
-        out = deepcopy(doc)  # preserve all input metadata
-        out["text"] = p  # replace with chunk text
-        out["start"] = idx
-        out["end"] = idx + len(p)
-        out.setdefault("doc", doc.get("doc", default_doc_id))
-        out["chunk_index"] = i
-        chunks.append(out)
-        offset = idx + len(p)
-    return chunks
+        for i, (start, end) in enumerate(spans)
+    ]
 
 
 @register_strategy("chunking", "recursive")
 def recursive(
-    data: Union[str, List[InDoc]],
+    data: Union[str, Iterable[InDoc]],
     *,
     chunk_size: int = 800,
     chunk_overlap: int = 80,
     doc_id: str = "doc",
+    copy_metadata: bool = False,
+    separators: Optional[Sequence[str]] = None,
+    splitter: str = "native",
+    workers: int = 1,
+    batch_size: int = 64,
 ) -> List[Chunk]:
     """
     Recursive chunking that accepts:
       - a single string, or
-      - a list of dicts with at least {"text": <str>} plus any extra metadata.
+      - a list (or any iterable) of dicts with at least {"text": <str>} plus any
+        extra metadata.
 
     Returns a list of dicts where:
       - 'text' is the chunk text
@@ -75,45 +230,58 @@ def recursive(
       - all original metadata keys are preserved
       - 'doc' is preserved or set to `doc_id` if missing
       - 'chunk_index' indicates the chunk order within its parent doc
+
+    Splitting tries `separators` in order (default: paragraph, line, space,
+    character), recursing into pieces that are still longer than chunk_size.
+    `splitter="native"` (default) works directly on offsets; `splitter="langchain"`
+    delegates to a cached RecursiveCharacterTextSplitter instead.
+
+    Chunks are shallow copies of their parent dict: nested metadata objects are
+    shared, not duplicated. Set `copy_metadata=True` for fully isolated deep copies.
+
+    Set `workers` > 1 to chunk in a process pool (`batch_size` docs per task);
+    output order and chunk_index are identical to the serial path.
     """
-    # Case 1: single string input
-    if isinstance(data, str):
-        text = data
-        parts = _chunk_text(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        chunks: List[Chunk] = []
-        offset = 0
-        for i, p in enumerate(parts):
-            idx = text.find(p, offset)
-            if idx == -1:
-                idx = offset
-            chunks.append(
-                {
-                    "doc": doc_id,
-                    "text": p,
-                    "start": idx,
-                    "end": idx + len(p),
-                    "chunk_index": i,
-                }
-            )
-            offset = idx + len(p)
-        return chunks
-
-    # Case 2: list of dicts input
-    if not isinstance(data, list):
-        raise ValueError(
-            f"Expected data to be str or list[dict], got {type(data).__name__}"
+    return list(
+        recursive_iter(
+            data,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            doc_id=doc_id,
+            copy_metadata=copy_metadata,
+            separators=separators,
+            splitter=splitter,
+            workers=workers,
+            batch_size=batch_size,
         )
+    )
 
-    out: List[Chunk] = []
-    for doc in data:
-        if not isinstance(doc, dict):
-            raise ValueError(f"Each item must be a dict, got {type(doc).__name__}")
-        out.extend(
-            _chunk_one_doc(
-                doc,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                default_doc_id=doc_id,
-            )
-        )
-    return out
+
+@register_strategy("chunking", "recursive_iter")
+def recursive_iter(
+    data: Union[str, Iterable[InDoc]],
+    *,
+    chunk_size: int = 800,
+    chunk_overlap: int = 80,
+    doc_id: str = "doc",
+    copy_metadata: bool = False,
+    separators: Optional[Sequence[str]] = None,
+    splitter: str = "native",
+    workers: int = 1,
+    batch_size: int = 64,
+) -> Iterator[Chunk]:
+    """
+    Streaming variant of `recursive`: consumes `data` lazily (any iterable of
+    dicts, e.g. an ingestion generator) and yields chunks one at a time.
+    """
+    _check_sizes(chunk_size, chunk_overlap)
+    chunk_doc = partial(
+        _chunk_one_doc,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        default_doc_id=doc_id,
+        copy_metadata=copy_metadata,
+        separators=tuple(separators) if separators else DEFAULT_SEPARATORS,
+        splitter=splitter,
+    )
+    return _iter_docs(data, chunk_doc, doc_id, workers, batch_size)
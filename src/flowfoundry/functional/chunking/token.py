@@ -0,0 +1,192 @@
+from __future__ import annotations
+import re
+from functools import lru_cache, partial
+from typing import Any, Iterable, Iterator, List, Protocol, Union
+
+from ...utils import InDoc, Chunk, register_strategy, FFConfigError, FFDependencyError
+from ._common import Span, _make_chunk, _check_doc, _check_sizes, _iter_docs
+
+
+class Tokenizer(Protocol):
+    """Anything that can map a text to the (start, end) char offsets of its tokens."""
+
+    def spans(self, text: str) -> List[Span]: ...
+
+
+class RegexTokenizer:
+    """Pure-Python tokenizer: every regex match is one token. Works offline."""
+
+    def __init__(self, pattern: str = r"\w+|[^\w\s]") -> None:
+        self._re = re.compile(pattern)
+
+    def spans(self, text: str) -> List[Span]:
+        return [m.span() for m in self._re.finditer(text)]
+
+
+class TiktokenTokenizer:
+    """OpenAI BPE encodings via `tiktoken` (e.g. 'cl100k_base', 'o200k_base')."""
+
+    def __init__(self, encoding: str) -> None:
+        try:
+            import tiktoken
+        except Exception as e:
+            raise FFDependencyError(
+                "tokenizer='tiktoken:...' requires `pip install tiktoken`"
+            ) from e
+        self._enc = tiktoken.get_encoding(encoding)
+
+    def spans(self, text: str) -> List[Span]:
+        tokens = self._enc.encode(text, disallowed_special=())
+        _, starts = self._enc.decode_with_offsets(tokens)
+        ends = starts[1:] + [len(text)]
+        return [(s, e) for s, e in zip(starts, ends) if e > s]
+
+
+class HFTokenizer:
+    """Hugging Face fast tokenizers (needs offset mapping support)."""
+
+    def __init__(self, name: str) -> None:
+        try:
+            from transformers import AutoTokenizer
+        except Exception as e:
+            raise FFDependencyError(
+                "tokenizer='hf:...' requires `pip install transformers`"
+            ) from e
+        self._tok: Any = AutoTokenizer.from_pretrained(name, use_fast=True)
+
+    def spans(self, text: str) -> List[Span]:
+        enc = self._tok(text, add_special_tokens=False, return_offsets_mapping=True)
+        return [(int(s), int(e)) for s, e in enc["offset_mapping"] if e > s]
+
+
+@lru_cache(maxsize=16)
+def get_tokenizer(spec: str) -> Tokenizer:
+    """
+    Return a cached tokenizer for `spec`:
+      - "regex"             words and punctuation (default, offline)
+      - "whitespace"        runs of non-space characters (offline)
+      - "tiktoken:<name>"   e.g. "tiktoken:cl100k_base"
+      - "hf:<model>"        e.g. "hf:bert-base-uncased"
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "regex":
+        return RegexTokenizer(arg or r"\w+|[^\w\s]")
+    if kind == "whitespace":
+        return RegexTokenizer(r"\S+")
+    if kind == "tiktoken":
+        return TiktokenTokenizer(arg or "cl100k_base")
+    if kind == "hf" and arg:
+        return HFTokenizer(arg)
+    raise FFConfigError(
+        f"Unknown tokenizer '{spec}'. Expected 'regex', 'whitespace', "
+        "'tiktoken:<encoding>' or 'hf:<model>'."
+    )
+
+
+def _token_windows(n_tokens: int, chunk_size: int, chunk_overlap: int) -> List[Span]:
+    """Token index windows [i, j); stops once a window reaches the last token."""
+    step = max(1, chunk_size - chunk_overlap)
+    out: List[Span] = []
+    for i in range(0, n_tokens, step):
+        j = min(i + chunk_size, n_tokens)
+        out.append((i, j))
+        if j == n_tokens:
+            break
+    return out
+
+
+def _chunk_one_doc(
+    doc: InDoc,
+    chunk_size: int,
+    chunk_overlap: int,
+    tokenizer: Union[str, Tokenizer],
+    default_doc_id: str,
+    copy_metadata: bool = False,
+) -> List[Chunk]:
+    """Tokenize one doc once, then slice token windows back to char offsets."""
+    text = _check_doc(doc)
+    tok = get_tokenizer(tokenizer) if isinstance(tokenizer, str) else tokenizer
+    spans = tok.spans(text)
+    chunks: List[Chunk] = []
+    for idx, (i, j) in enumerate(_token_windows(len(spans), chunk_size, chunk_overlap)):
+        start, end = spans[i][0], spans[j - 1][1]
+        c = _make_chunk(
+            doc,
+            text[start:end],
+            start,
+            end,
+            idx,
+            default_doc_id=default_doc_id,
+            copy_metadata=copy_metadata,
+        )
+        c["n_tokens"] = j - i
+        chunks.append(c)
+    return chunks
+
+
+@register_strategy("chunking", "token")
+def token(
+    data: Union[str, Iterable[InDoc]],
+    *,
+    chunk_size: int = 256,
+    chunk_overlap: int = 32,
+    doc_id: str = "doc",
+    tokenizer: Union[str, Tokenizer] = "regex",
+    copy_metadata: bool = False,
+    workers: int = 1,
+    batch_size: int = 64,
+) -> List[Chunk]:
+    """
+    Token-aware chunking: `chunk_size` and `chunk_overlap` count tokens, not chars.
+
+    Accepts a single string or a list (or any iterable) of dicts with at least
+    {"text": <str>}. Each doc is tokenized once; token windows are mapped back
+    to character offsets, so 'text' is always text[start:end] of the parent.
+
+    `tokenizer` is a spec understood by `get_tokenizer` ("regex" by default,
+    works offline; "tiktoken:cl100k_base", "hf:<model>", ...) or any object with
+    a `spans(text)` method. Named tokenizers are built once and cached.
+
+    Returns the same dict shape as the other chunkers, plus 'n_tokens'.
+    Set `workers` > 1 to chunk in a process pool (`batch_size` docs per task).
+    """
+    return list(
+        token_iter(
+            data,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            doc_id=doc_id,
+            tokenizer=tokenizer,
+            copy_metadata=copy_metadata,
+            workers=workers,
+            batch_size=batch_size,
+        )
+    )
+
+
+@register_strategy("chunking", "token_iter")
+def token_iter(
+    data: Union[str, Iterable[InDoc]],
+    *,
+    chunk_size: int = 256,
+    chunk_overlap: int = 32,
+    doc_id: str = "doc",
+    tokenizer: Union[str, Tokenizer] = "regex",
+    copy_metadata: bool = False,
+    workers: int = 1,
+    batch_size: int = 64,
+) -> Iterator[Chunk]:
+    """
+    Streaming variant of `token`: consumes `data` lazily and yields chunks one
+    at a time.
+    """
+    _check_sizes(chunk_size, chunk_overlap)
+    chunk_doc = partial(
+        _chunk_one_doc,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        tokenizer=tokenizer,
+        default_doc_id=doc_id,
+        copy_metadata=copy_metadata,
+    )
+    return _iter_docs(data, chunk_doc, doc_id, workers, batch_size)
@@ -0,0 +1,22 @@
+from .hashing import hashing
+from .sentence_transformer import sentence_transformer, get_sentence_transformer
+from .cache import (
+    cached,
+    EmbeddingCache,
+    get_embedding_cache,
+    close_embedding_caches,
+)
+from .resolve import Embedder, EmbedderSpec, get_embedder
+
+__all__ = [
+    "hashing",
+    "sentence_transformer",
+    "get_sentence_transformer",
+    "cached",
+    "EmbeddingCache",
+    "get_embedding_cache",
+    "close_embedding_caches",
+    "Embedder",
+    "EmbedderSpec",
+    "get_embedder",
+]
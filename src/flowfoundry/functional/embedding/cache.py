@@ -0,0 +1,158 @@
+from __future__ import annotations
+import hashlib
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ...utils import register_strategy
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key    BLOB PRIMARY KEY,
+    dim    INTEGER NOT NULL,
+    vector BLOB NOT NULL
+) WITHOUT ROWID
+"""
+_SQL_VARS = 500  # stay well below SQLite's bound-parameter limit
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache in a single SQLite file.
+
+    Rows are keyed by sha256(namespace, text), where the namespace names the
+    model and every option that changes its output, so identical texts are
+    embedded once per model no matter which collection, index or re-index
+    run asks for them. Vectors are stored as raw float32 bytes. WAL mode
+    lets several processes share one cache file.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def key(namespace: str, text: str) -> bytes:
+        h = hashlib.sha256(namespace.encode("utf-8"))
+        h.update(b"\0")
+        h.update(text.encode("utf-8"))
+        return h.digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        out: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for i in range(0, len(keys), _SQL_VARS):
+                part = keys[i : i + _SQL_VARS]
+                rows = self._conn.execute(
+                    "SELECT key, vector FROM embeddings WHERE key IN (%s)"
+                    % ",".join("?" * len(part)),
+                    part,
+                )
+                for key, blob in rows:
+                    out[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+        return out
+
+    def put_many(self, items: Iterable[Tuple[bytes, np.ndarray]]) -> None:
+        rows = [
+            (key, int(vec.shape[0]), np.ascontiguousarray(vec, np.float32).tobytes())
+            for key, vec in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(
+                self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_CACHES: Dict[str, EmbeddingCache] = {}
+_LOCK = Lock()
+
+
+def get_embedding_cache(
+    path: Union[str, Path] = ".ff_embed_cache.sqlite",
+) -> EmbeddingCache:
+    """Return the process-wide cache handle for `path` (opened on first use)."""
+    key = str(Path(path).resolve())
+    with _LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = EmbeddingCache(path)
+            _CACHES[key] = cache
+        return cache
+
+
+def close_embedding_caches() -> None:
+    """Close every pooled cache handle."""
+    with _LOCK:
+        for cache in _CACHES.values():
+            cache.close()
+        _CACHES.clear()
+
+
+def embed_with_cache(
+    embed: Callable[[List[str]], Any],
+    texts: List[str],
+    cache: EmbeddingCache,
+    namespace: str,
+) -> np.ndarray:
+    """
+    Embed `texts`, reading hits from `cache` and embedding only the misses
+    (each distinct text once, in one call), which are then stored.
+    """
+    keys = [EmbeddingCache.key(namespace, t) for t in texts]
+    found = cache.get_many(list(dict.fromkeys(keys)))
+    missing: Dict[bytes, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in found:
+            missing.setdefault(key, text)
+    if missing:
+        vecs = np.asarray(embed(list(missing.values())), dtype=np.float32)
+        fresh = list(zip(missing, vecs))
+        cache.put_many(fresh)
+        found.update(fresh)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.stack([found[k] for k in keys])
+
+
+@register_strategy("embedding", "cached")
+def cached(
+    texts: List[str],
+    *,
+    embedder: Any = "hashing",
+    cache: str = ".ff_embed_cache.sqlite",
+    cache_key: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Wrap any embedder spec (see `get_embedder`) with the persistent
+    content-hash cache at `cache`. Equivalent to
+    `get_embedder(embedder, cache=cache, cache_key=cache_key)(texts)`.
+    """
+    from .resolve import get_embedder
+
+    return np.asarray(
+        get_embedder(embedder, cache=cache, cache_key=cache_key)(texts),
+        dtype=np.float32,
+    )
@@ -0,0 +1,38 @@
+from __future__ import annotations
+import hashlib
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+from ...utils import register_strategy
+
+_WORD = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_bucket(token: str, dim: int) -> Tuple[int, float]:
+    h = int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+    return h % dim, (1.0 if (h >> 63) & 1 else -1.0)
+
+
+@register_strategy("embedding", "hashing")
+def hashing(texts: List[str], *, dim: int = 256) -> np.ndarray:
+    """
+    Deterministic feature-hashing embedder (signed bag of lower-cased words,
+    L2-normalised). Needs no model or network, so it suits tests and scratch
+    indexes; it captures word overlap, not meaning.
+
+    Returns a (len(texts), dim) float32 array.
+    """
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for tok in _WORD.findall(text.lower()):
+            col, sign = _token_bucket(tok, dim)
+            out[row, col] += sign
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out
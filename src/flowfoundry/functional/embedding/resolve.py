@@ -0,0 +1,84 @@
+from __future__ import annotations
+import json
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ...utils import strategies, FFConfigError
+from .cache import embed_with_cache, get_embedding_cache
+
+# Maps a batch of texts to a (len(texts), dim) float32 array.
+Embedder = Callable[[List[str]], Any]
+
+# 'hashing', 'hashing:512', 'sentence_transformer:<model>',
+# {"name": "sentence_transformer", "model": ..., "device": "cuda", "cache": ...}
+# or a callable.
+EmbedderSpec = Union[str, Dict[str, Any], Embedder]
+
+# Options that change how fast vectors are computed, not their values;
+# left out of the cache namespace so they can be tuned without a cold cache.
+_RUNTIME_OPTIONS = ("batch_size", "device")
+
+
+def _spec_kwargs(name: str, arg: str) -> Dict[str, Any]:
+    if not arg:
+        return {}
+    if name == "hashing":
+        return {"dim": int(arg)}
+    return {"model": arg}
+
+
+def _bind(strategy: Callable[..., Any], kwargs: Dict[str, Any]) -> Embedder:
+    bound = dict(kwargs)
+    return lambda texts: strategy(texts, **bound)
+
+
+def get_embedder(
+    spec: EmbedderSpec,
+    *,
+    cache: Optional[str] = None,
+    cache_key: Optional[str] = None,
+) -> Embedder:
+    """
+    Resolve an embedder spec to a callable `texts -> (n, dim) array`.
+
+    - a string '<name>[:<arg>]' names an `embedding` strategy; the argument is
+      the dimension for 'hashing' and the model for every other strategy
+    - a dict {"name": ..., **kwargs} passes kwargs to that strategy; an
+      optional "cache" entry adds the persistent cache
+    - a callable is used as is
+
+    With `cache` (a SQLite file), vectors are looked up by a hash of the
+    model options and text first and only misses are embedded. Callables
+    need an explicit `cache_key` naming their model, since nothing else
+    identifies what they compute.
+    """
+    name: Optional[str] = None
+    kwargs: Dict[str, Any] = {}
+    if callable(spec):
+        fn = spec
+    else:
+        if isinstance(spec, str):
+            name, _, arg = spec.partition(":")
+            kwargs = _spec_kwargs(name, arg)
+        elif isinstance(spec, dict):
+            kwargs = dict(spec)
+            name = kwargs.pop("name", None)
+            cache = kwargs.pop("cache", cache)
+            cache_key = kwargs.pop("cache_key", cache_key)
+        if not name or not strategies.has("embedding", name):
+            raise FFConfigError(
+                f"Unknown embedder {spec!r}. Expected one of "
+                f"{strategies.list_names('embedding')} ('<name>[:<arg>]' or "
+                "{'name': ..., **kwargs}) or a callable."
+            )
+        fn = _bind(strategies.get("embedding", name), kwargs)
+
+    if cache is None:
+        return fn
+    if cache_key is None:
+        if name is None:
+            raise FFConfigError("Caching a callable embedder needs a `cache_key`")
+        options = {k: v for k, v in kwargs.items() if k not in _RUNTIME_OPTIONS}
+        cache_key = json.dumps({"name": name, **options}, sort_keys=True)
+    store = get_embedding_cache(cache)
+    namespace = cache_key
+    return lambda texts: embed_with_cache(fn, list(texts), store, namespace)
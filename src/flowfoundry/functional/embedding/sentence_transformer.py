@@ -0,0 +1,67 @@
+from __future__ import annotations
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ...utils import register_strategy, FFDependencyError
+
+SentenceTransformer: Optional[Any]
+try:
+    from sentence_transformers import SentenceTransformer as _SentenceTransformer
+
+    SentenceTransformer = _SentenceTransformer
+except Exception:
+    SentenceTransformer = None
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Loaded models, one per (model, device); loading dominates small calls.
+_MODELS: Dict[Tuple[str, Optional[str]], Any] = {}
+_LOCK = Lock()
+
+
+def get_sentence_transformer(
+    model: str = DEFAULT_MODEL, device: Optional[str] = None
+) -> Any:
+    """Return a process-wide SentenceTransformer for (model, device)."""
+    if SentenceTransformer is None:
+        raise FFDependencyError(
+            "Install with `pip install flowfoundry[rag]` for sentence-transformers embeddings"
+        )
+    key = (model, device)
+    with _LOCK:
+        st = _MODELS.get(key)
+        if st is None:
+            st = SentenceTransformer(model, device=device)
+            _MODELS[key] = st
+        return st
+
+
+@register_strategy("embedding", "sentence_transformer")
+def sentence_transformer(
+    texts: List[str],
+    *,
+    model: str = DEFAULT_MODEL,
+    batch_size: int = 32,
+    device: Optional[str] = None,
+    normalize: bool = True,
+) -> np.ndarray:
+    """
+    Embed texts with a sentence-transformers model.
+
+    kwargs:
+      - model: model name or local path (loaded once per process and device)
+      - batch_size: texts per forward pass
+      - device: "cpu", "cuda", "cuda:1", "mps", ... (None = library default)
+      - normalize: L2-normalise the vectors (cosine == dot product)
+    """
+    st = get_sentence_transformer(model, device)
+    vecs = st.encode(
+        list(texts),
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=normalize,
+        show_progress_bar=False,
+    )
+    return np.asarray(vecs, dtype=np.float32)
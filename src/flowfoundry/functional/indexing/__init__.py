@@ -1,3 +1,66 @@
-from .chroma import chroma_upsert, chroma_query
+from .chroma import (
+    chroma_upsert,
+    chroma_query,
+    chroma_query_batch,
+    get_chroma_collection,
+    evict_chroma_collection,
+    close_chroma,
+)
+from .numpy_index import (
+    numpy_upsert,
+    numpy_query,
+    NumpyIndex,
+    get_numpy_index,
+    drop_numpy_index,
+)
+from .mmap_store import (
+    mmap_upsert,
+    mmap_query,
+    MmapStore,
+    open_mmap_store,
+)
+from .ivf import (
+    ivf_upsert,
+    ivf_query,
+    IVFIndex,
+    get_ivf_collection,
+    drop_ivf_collection,
+)
+from .bm25_index import (
+    bm25_upsert,
+    bm25_query,
+    BM25Index,
+    get_bm25_index,
+    drop_bm25_index,
+)
+from .hybrid import hybrid_upsert, hybrid_query
 
-__all__ = ["chroma_upsert", "chroma_query"]
+__all__ = [
+    "chroma_upsert",
+    "chroma_query",
+    "chroma_query_batch",
+    "get_chroma_collection",
+    "evict_chroma_collection",
+    "close_chroma",
+    "numpy_upsert",
+    "numpy_query",
+    "NumpyIndex",
+    "get_numpy_index",
+    "drop_numpy_index",
+    "mmap_upsert",
+    "mmap_query",
+    "MmapStore",
+    "open_mmap_store",
+    "ivf_upsert",
+    "ivf_query",
+    "IVFIndex",
+    "get_ivf_collection",
+    "drop_ivf_collection",
+    "bm25_upsert",
+    "bm25_query",
+    "BM25Index",
+    "get_bm25_index",
+    "drop_bm25_index",
+    "hybrid_upsert",
+    "hybrid_query",
+]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from ...utils import FFConfigError
+
+_SCALARS = (str, int, float, bool)
+
+
+def _chunk_metadata(c: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Every scalar field of a chunk except 'text' (doc, source, page, start,
+    end, chunk_index, tenant, ...), plus scalar fields of a nested
+    'metadata' dict. Top-level fields win; None and non-scalars are dropped
+    because vector stores cannot store them.
+    """
+    meta: Dict[str, Any] = {}
+    nested = c.get("metadata")
+    for src in (nested if isinstance(nested, dict) else {}, c):
+        for key, value in src.items():
+            if key != "text" and isinstance(value, _SCALARS):
+                meta[str(key)] = value
+    return meta
+
+
+def _as_matrix(vectors: Any) -> np.ndarray:
+    """Embedder output as a C-contiguous 2-D float32 array."""
+    arr = np.ascontiguousarray(vectors, dtype=np.float32)
+    if arr.ndim != 2:
+        raise FFConfigError(f"Embedder must return a 2-D array, got shape {arr.shape}")
+    return arr
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    out = np.zeros_like(vectors)
+    np.divide(vectors, norms, out=out, where=norms > 0)
+    return out
+
+
+def _topk(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row-wise top-k of a (queries, n) score matrix, best first.
+
+    A partition finds the k-th best score per row in O(n); rows scoring above
+    it, then the lowest-index rows tied with it, are kept and only those k
+    are sorted. Ties are ordered by index, so equal scores keep their input
+    order (e.g. hits with no term overlap stay in retrieval order).
+    Returns (indices, scores), each of shape (queries, min(k, n)).
+    """
+    q, n = scores.shape
+    k = min(k, n)
+    if k <= 0:
+        empty = np.empty((q, 0))
+        return empty.astype(np.int64), empty.astype(scores.dtype)
+    if k < n:
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        kth = np.take_along_axis(scores, top, axis=1).min(axis=1)
+        part = np.empty((q, k), dtype=np.int64)
+        for i, (row, t) in enumerate(zip(scores, kth)):
+            sel = np.flatnonzero(row >= t)  # ascending index
+            if len(sel) > k:  # ties at the k-th score: keep the earliest
+                tied = row[sel] == t
+                keep = ~tied
+                keep[np.flatnonzero(tied)[: k - int(keep.sum())]] = True
+                sel = sel[keep]
+            elif len(sel) < k:  # NaN scores compare False: keep the partition
+                sel = np.sort(top[i])
+            part[i] = sel
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape).copy()
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(part, order, axis=1),
+        np.take_along_axis(part_scores, order, axis=1),
+    )
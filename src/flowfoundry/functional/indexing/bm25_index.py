@@ -0,0 +1,516 @@
+from __future__ import annotations
+import math
+import mmap
+from collections import Counter
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ...utils import register_strategy, chunk_id, tokenize, FFConfigError
+from ...utils.parallel import batched
+from ._common import _chunk_metadata, _topk
+from .mmap_store import (
+    FORMAT_VERSION,
+    _append_files,
+    _encode_records,
+    _map_records,
+    _read_header,
+    _read_ids,
+    _read_record,
+    _write_header,
+)
+
+# per-segment arrays, saved as <segment>.<array>.npy (in _Segment's order)
+_SEGMENT_ARRAYS = ("doc_len", "postings", "tfs", "byte_offsets", "post_offsets")
+_TF_MAX = np.iinfo(np.uint16).max
+
+
+def _varint_sizes(values: np.ndarray) -> np.ndarray:
+    """Encoded length in bytes of each value."""
+    nbytes = np.ones(len(values), dtype=np.int64)
+    for shift in (7, 14, 21, 28):
+        nbytes += values >= (1 << shift)
+    return nbytes
+
+
+def _encode_varint(values: np.ndarray) -> np.ndarray:
+    """LEB128-encode non-negative integers (< 2**35): 7 bits per byte, high bit = more."""
+    v = values.astype(np.uint64)
+    nbytes = _varint_sizes(v)
+    starts = np.cumsum(nbytes) - nbytes
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for i in range(5):
+        m = nbytes > i
+        if not m.any():
+            break
+        byte = (v[m] >> np.uint64(7 * i)) & np.uint64(0x7F)
+        byte |= np.where(nbytes[m] > i + 1, np.uint64(0x80), np.uint64(0))
+        out[starts[m] + i] = byte
+    return out
+
+
+def _decode_varint(data: np.ndarray) -> np.ndarray:
+    """Inverse of `_encode_varint`, vectorised over the whole byte array."""
+    if data.size == 0:
+        return np.empty(0, dtype=np.int64)
+    b = np.asarray(data, dtype=np.uint8)
+    last = b < 0x80
+    ends = np.flatnonzero(last)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    group = np.concatenate(([0], np.cumsum(last)[:-1]))
+    shift = (np.arange(len(b)) - starts[group]) * 7
+    parts = (b & 0x7F).astype(np.int64) << shift
+    return np.add.reduceat(parts, starts)
+
+
+class _Segment:
+    """
+    Postings of the rows [row0, row0 + len(doc_len)) in a CSR layout over
+    term ids: per term, the ascending rows (relative to row0) of the chunks
+    containing it, delta- then varint-encoded, and a parallel uint16
+    term-frequency array. Term ids beyond `post_offsets` have no postings.
+    """
+
+    def __init__(
+        self,
+        row0: int,
+        doc_len: np.ndarray,
+        postings: np.ndarray,
+        tfs: np.ndarray,
+        byte_offsets: np.ndarray,
+        post_offsets: np.ndarray,
+        name: Optional[str] = None,
+    ) -> None:
+        self.row0 = row0
+        self.doc_len = doc_len
+        self.postings = postings
+        self.tfs = tfs
+        self.byte_offsets = byte_offsets
+        self.post_offsets = post_offsets
+        self.name = name  # file prefix once saved
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    @classmethod
+    def build(
+        cls,
+        row0: int,
+        terms: np.ndarray,
+        rows: np.ndarray,
+        tfs: np.ndarray,
+        doc_len: np.ndarray,
+    ) -> "_Segment":
+        """Encode (term, relative row, tf) triples; rows ascend within a term."""
+        order = np.lexsort((rows, terms))
+        terms, rows, tfs = terms[order], rows[order], tfs[order]
+        counts = np.bincount(terms, minlength=int(terms.max(initial=-1)) + 1)
+        post_offsets = np.concatenate(([0], np.cumsum(counts)))
+        gaps = rows.copy()
+        gaps[1:] -= rows[:-1]
+        firsts = post_offsets[:-1][counts > 0]
+        gaps[firsts] = rows[firsts]
+        byte_ends = np.concatenate(([0], np.cumsum(_varint_sizes(gaps))))
+        return cls(
+            row0,
+            doc_len.astype(np.int32),
+            _encode_varint(gaps),
+            np.minimum(tfs, _TF_MAX).astype(np.uint16),
+            byte_ends[post_offsets].astype(np.int64),
+            post_offsets.astype(np.int64),
+        )
+
+    def triples(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Decode every posting as (term, relative row, tf) arrays."""
+        df = np.diff(self.post_offsets)
+        terms = np.repeat(np.arange(len(df)), df)
+        gaps = _decode_varint(self.postings)
+        # per-term running sum of the gaps restores the rows
+        cs = np.cumsum(gaps)
+        seg_base = np.concatenate(([0], cs))[self.post_offsets[:-1]]
+        return terms, cs - np.repeat(seg_base, df), self.tfs.astype(np.int64)
+
+    def merge(self, later: "_Segment") -> "_Segment":
+        """One segment covering this one's rows followed by `later`'s."""
+        terms, rows, tfs = zip(self.triples(), later.triples())
+        shift = np.array([0, len(self)])
+        return _Segment.build(
+            self.row0,
+            np.concatenate(terms),
+            np.concatenate([r + s for r, s in zip(rows, shift)]),
+            np.concatenate(tfs),
+            np.concatenate((self.doc_len, later.doc_len)),
+        )
+
+    def postings_of(self, tid: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(relative rows, term frequencies) of term id `tid`."""
+        if tid + 1 >= len(self.post_offsets):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint16)
+        p0, p1 = self.post_offsets[tid], self.post_offsets[tid + 1]
+        b0, b1 = self.byte_offsets[tid], self.byte_offsets[tid + 1]
+        rows = np.cumsum(_decode_varint(self.postings[b0:b1]))
+        return rows, np.asarray(self.tfs[p0:p1])
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over chunk texts, persisted next to a vector
+    store so lexical search covers the whole corpus, not just vector hits.
+
+    Postings live in segments, each covering a contiguous range of rows (see
+    `_Segment`). New chunks are buffered and turned into a new segment
+    before the next search or save; adjacent segments are merged while the
+    older one is not larger, so there are O(log n) segments and each
+    posting is re-encoded O(log n) times. A query decodes only its own
+    terms' postings.
+
+    On disk (see `save`), records use the mmap store's append-only log and
+    segments are written once, so a save costs the new chunks plus any
+    merged segments, and a loaded index keeps only ids and vocabulary in
+    RAM (postings and records are memory-mapped).
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.terms: List[str] = []
+        self.segments: List[_Segment] = []
+        self._vocab: Dict[str, int] = {}
+        self._rows: Dict[str, int] = {}
+        self._total_len = 0
+        # (term, row, tf) triples and lengths added since the last compaction
+        self._pending: List[Tuple[int, int, int]] = []
+        self._pending_len: List[int] = []
+        self._unsaved: List[Tuple[str, str, Dict[str, Any]]] = []  # id, text, meta
+        self._header: Optional[Dict[str, Any]] = None  # committed on-disk state
+        self._records: Optional[mmap.mmap] = None
+        self._offsets = np.empty((0,), dtype=np.uint64)
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, cid: object) -> bool:
+        return cid in self._rows
+
+    def add(
+        self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]
+    ) -> int:
+        """Index chunks whose id is not present yet; returns how many were added."""
+        added = 0
+        with self._lock:
+            for cid, text, meta in zip(ids, texts, metadatas):
+                if cid in self._rows:
+                    continue
+                row = self._rows[cid] = len(self._rows)
+                self._unsaved.append((cid, text, meta))
+                tokens = tokenize(text)
+                for term, tf in Counter(tokens).items():
+                    tid = self._vocab.get(term)
+                    if tid is None:
+                        tid = self._vocab[term] = len(self.terms)
+                        self.terms.append(term)
+                    self._pending.append((tid, row, tf))
+                self._pending_len.append(len(tokens))
+                self._total_len += len(tokens)
+                added += 1
+        return added
+
+    def _compact(self) -> None:
+        """Turn pending postings into a segment (caller holds the lock)."""
+        if not self._pending_len:
+            return
+        row0 = len(self._rows) - len(self._pending_len)
+        new = np.array(self._pending, dtype=np.int64).reshape(-1, 3)
+        self.segments.append(
+            _Segment.build(
+                row0,
+                new[:, 0],
+                new[:, 1] - row0,
+                new[:, 2],
+                np.array(self._pending_len),
+            )
+        )
+        segs = self.segments
+        while len(segs) > 1 and len(segs[-2]) <= len(segs[-1]):
+            later = segs.pop()
+            segs[-1] = segs[-1].merge(later)
+        self._pending = []
+        self._pending_len = []
+
+    def _postings(self, term: str) -> List[Tuple[_Segment, np.ndarray, np.ndarray]]:
+        tid = self._vocab.get(term)
+        if tid is None:
+            return []
+        out = []
+        for seg in self.segments:
+            rows, tfs = seg.postings_of(tid)
+            if rows.size:
+                out.append((seg, rows, tfs))
+        return out
+
+    def term_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, term frequencies) of the chunks containing `term`."""
+        with self._lock:
+            self._compact()
+            parts = self._postings(term)
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint16)
+        return (
+            np.concatenate([seg.row0 + rows for seg, rows, _ in parts]),
+            np.concatenate([tfs for _, _, tfs in parts]),
+        )
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every indexed chunk for `query` (0 where no term matches)."""
+        with self._lock:
+            self._compact()
+            n = len(self._rows)
+            out = np.zeros(n, dtype=np.float32)
+            if n == 0:
+                return out
+            avgdl = max(self._total_len / n, 1e-9)
+            for term in dict.fromkeys(tokenize(query)):
+                parts = self._postings(term)
+                df = sum(rows.size for _, rows, _ in parts)
+                if df == 0:
+                    continue
+                idf = math.log1p((n - df + 0.5) / (df + 0.5))
+                for seg, rows, tf in parts:
+                    tf = tf.astype(np.float32)
+                    dl = seg.doc_len[rows]
+                    norm = self.k1 * (1.0 - self.b + self.b * dl / avgdl)
+                    out[seg.row0 + rows] += idf * tf * (self.k1 + 1.0) / (tf + norm)
+            return out
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Top-k (row, score) for `query`, best first; only matching chunks."""
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores)
+        if matched.size == 0:
+            return []
+        idx, vals = _topk(scores[matched][None, :], k)
+        return [(int(matched[i]), float(s)) for i, s in zip(idx[0], vals[0])]
+
+    def record(self, row: int) -> Tuple[str, Dict[str, Any]]:
+        """(text, metadata) of a row, from memory or the saved record log."""
+        saved = len(self._offsets)
+        if row >= saved:
+            _, text, meta = self._unsaved[row - saved]
+            return text, meta
+        assert self._records is not None and self._header is not None
+        rec = _read_record(
+            self._records, self._offsets, row, self._header["records_bytes"]
+        )
+        return rec["text"], rec["metadata"]
+
+    def _map(self, d: Path, header: Dict[str, Any]) -> None:
+        if self._records is not None:
+            self._records.close()
+            self._records = None
+        self._header = header
+        if header["count"]:
+            self._records, self._offsets = _map_records(d, header["count"])
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """
+        Append unsaved records and new vocabulary to their logs, write
+        segments that are not on disk yet (`<segment>.<array>.npy`), then
+        commit by replacing bm25.json and delete segments merged away
+        (single writer; the directory this index was loaded from or first
+        saved to).
+        """
+        d = Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._compact()
+            header = _read_header(d, "bm25.json") or {
+                "version": FORMAT_VERSION,
+                "k1": self.k1,
+                "b": self.b,
+                "count": 0,
+                "records_bytes": 0,
+                "ids_bytes": 0,
+                "terms": 0,
+                "terms_bytes": 0,
+                "next_segment": 0,
+                "segments": [],
+            }
+            if header["count"] != len(self._offsets):
+                raise FFConfigError(
+                    f"{d} holds {header['count']} records, this index saved "
+                    f"{len(self._offsets)}; save an index to its own directory"
+                )
+            records, offsets, records_bytes = _encode_records(
+                [text for _, text, _ in self._unsaved],
+                [meta for _, _, meta in self._unsaved],
+                header["records_bytes"],
+            )
+            id_bytes = "".join(f"{cid}\n" for cid, _, _ in self._unsaved)
+            term_bytes = "".join(f"{t}\n" for t in self.terms[header["terms"] :])
+            data = {
+                "offsets.u64": [offsets.tobytes()],
+                "records.jsonl": records,
+                "ids.txt": [id_bytes.encode("utf-8")],
+                "terms.txt": [term_bytes.encode("utf-8")],
+            }
+            _append_files(
+                d,
+                {
+                    "offsets.u64": header["count"] * 8,
+                    "records.jsonl": header["records_bytes"],
+                    "ids.txt": header["ids_bytes"],
+                    "terms.txt": header["terms_bytes"],
+                },
+                data,
+            )
+            for seg in self.segments:
+                if seg.name is None:
+                    seg.name = f"seg{header['next_segment']:06d}"
+                    header["next_segment"] += 1
+                    for array in _SEGMENT_ARRAYS:
+                        np.save(d / f"{seg.name}.{array}.npy", getattr(seg, array))
+            dropped = {s["name"] for s in header["segments"]}
+            dropped -= {seg.name for seg in self.segments}
+
+            header["count"] += len(self._unsaved)
+            header["records_bytes"] += records_bytes
+            header["ids_bytes"] += len(data["ids.txt"][0])
+            header["terms"] = len(self.terms)
+            header["terms_bytes"] += len(data["terms.txt"][0])
+            header["total_len"] = self._total_len
+            header["segments"] = [
+                {"name": seg.name, "row0": seg.row0} for seg in self.segments
+            ]
+            _write_header(d, header, "bm25.json")
+            for name in dropped:
+                for array in _SEGMENT_ARRAYS:
+                    (d / f"{name}.{array}.npy").unlink(missing_ok=True)
+            self._unsaved = []
+            self._map(d, header)
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "BM25Index":
+        """Load a saved index; postings and records stay memory-mapped."""
+        d = Path(directory)
+        header = _read_header(d, "bm25.json")
+        if header is None:
+            raise FFConfigError(f"No BM25 index at {d}")
+        idx = cls(k1=header["k1"], b=header["b"])
+        with open(d / "terms.txt", "rb") as f:
+            idx.terms = f.read(header["terms_bytes"]).decode("utf-8").splitlines()
+        idx._vocab = {t: i for i, t in enumerate(idx.terms)}
+        idx._rows = {cid: i for i, cid in enumerate(_read_ids(d, header["ids_bytes"]))}
+        idx._total_len = header["total_len"]
+        for s in header["segments"]:
+            arrays = [
+                np.load(d / f"{s['name']}.{array}.npy", mmap_mode="r")
+                for array in _SEGMENT_ARRAYS
+            ]
+            seg = _Segment(s["row0"], *arrays)
+            seg.name = s["name"]
+            idx.segments.append(seg)
+        idx._map(d, header)
+        return idx
+
+
+# ---------- process-wide index registry ----------
+_INDEXES: Dict[Tuple[Optional[str], str], BM25Index] = {}
+_LOCK = Lock()
+
+
+def _key(path: Optional[str], collection: str) -> Tuple[Optional[str], str]:
+    return (str(Path(path).resolve()) if path is not None else None, collection)
+
+
+def get_bm25_index(
+    path: Optional[str] = ".ff_bm25", collection: str = "docs", create: bool = True
+) -> BM25Index:
+    """
+    Return the BM25 index for (path, collection), loading it from
+    `<path>/<collection>/` or creating it on first use. With `path=None` the
+    index only lives in this process. With `create=False` a missing index
+    raises FFConfigError.
+    """
+    key = _key(path, collection)
+    with _LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None:
+            d = Path(path) / collection if path is not None else None
+            if d is not None and (d / "bm25.json").exists():
+                idx = BM25Index.load(d)
+            elif create:
+                idx = BM25Index()
+            else:
+                where = f"at {d}" if d is not None else "in memory"
+                raise FFConfigError(
+                    f"No BM25 index for collection '{collection}' {where}"
+                )
+            _INDEXES[key] = idx
+        return idx
+
+
+def drop_bm25_index(path: Optional[str] = ".ff_bm25", collection: str = "docs") -> None:
+    """Forget a cached index (files on disk are left untouched)."""
+    with _LOCK:
+        _INDEXES.pop(_key(path, collection), None)
+
+
+def _add_chunks(idx: BM25Index, batch: List[Dict], offset: int) -> int:
+    return idx.add(
+        [chunk_id(c, offset + i) for i, c in enumerate(batch)],
+        [str(c["text"]) for c in batch],
+        [_chunk_metadata(c) for c in batch],
+    )
+
+
+@register_strategy("indexing", "bm25_upsert")
+def bm25_upsert(
+    chunks: Iterable[Dict],
+    *,
+    path: Optional[str] = ".ff_bm25",
+    collection: str = "docs",
+    batch_size: int = 1024,
+) -> str:
+    """
+    Add chunks to a persistent BM25 inverted index at `<path>/<collection>/`.
+
+    Ids and metadata follow `chroma_upsert`; chunks already indexed
+    (same content-addressed id) are skipped. `chunks` may be a generator;
+    it is consumed `batch_size` at a time and the index is saved once at
+    the end. See `hybrid_upsert` to build it alongside a vector store.
+    """
+    idx = get_bm25_index(path, collection)
+    offset = 0
+    for batch in batched(chunks, batch_size):
+        _add_chunks(idx, batch, offset)
+        offset += len(batch)
+    if path is not None:
+        idx.save(Path(path) / collection)
+    return collection
+
+
+@register_strategy("indexing", "bm25_query")
+def bm25_query(
+    query: str,
+    *,
+    k: int = 5,
+    path: Optional[str] = ".ff_bm25",
+    collection: str = "docs",
+) -> List[Dict]:
+    """
+    Top-k BM25 search over the full index.
+
+    Returns {"text", "metadata", "score"} hits, best first; `score` is the
+    BM25 score (higher is better). Chunks sharing no term with the query
+    are never returned, so there may be fewer than `k` hits. Raises
+    FFConfigError for a collection that was never upserted.
+    """
+    idx = get_bm25_index(path, collection, create=False)
+    hits = []
+    for row, score in idx.search(query, k):
+        text, meta = idx.record(row)
+        hits.append({"text": text, "metadata": meta, "score": score})
+    return hits
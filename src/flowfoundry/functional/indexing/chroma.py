@@ -1,6 +1,16 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, cast
-from ...utils import register_strategy, FFDependencyError
+import logging
+import time
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, cast
+from ...utils import register_strategy, chunk_id, FFConfigError, FFDependencyError
+from ...utils.parallel import batched
+from ..ingestion.manifest import IngestManifest
+from ..embedding import EmbedderSpec, get_embedder
+from ._common import _chunk_metadata
 
 chromadb: Optional[Any]
 try:
@@ -10,40 +20,343 @@ try:
 except Exception:
     chromadb = None
 
+logger = logging.getLogger(__name__)
 
-@register_strategy("indexing", "chroma_upsert")
-def chroma_upsert(
-    chunks: List[Dict], *, path: str = ".ff_chroma", collection: str = "docs"
-) -> str:
+
+# ---------- process-wide client / collection pool ----------
+_CLIENTS: Dict[str, Any] = {}
+_COLLECTIONS: Dict[Tuple[str, str], Any] = {}
+_LOCK = Lock()
+
+
+def _store_key(path: str) -> str:
+    return str(Path(path).resolve())
+
+
+def get_chroma_collection(path: str = ".ff_chroma", collection: str = "docs") -> Any:
+    """
+    Return a warm collection handle for (path, collection).
+
+    One PersistentClient is opened per store path and one handle per
+    collection; both are reused by every later call in the process (thread
+    safe). Use `evict_chroma_collection` after deleting/recreating a
+    collection elsewhere and `close_chroma` to release the store files.
+    """
     if chromadb is None:
         raise FFDependencyError(
             "Install with `pip install flowfoundry[rag]` for Chroma support"
         )
-    client = chromadb.PersistentClient(path=path)
-    coll = client.get_or_create_collection(collection)
-    ids = [f"{c['doc']}::{i}" for i, c in enumerate(chunks)]
-    texts = [str(c["text"]) for c in chunks]
-    metas = [
-        {"doc": c["doc"], "start": c.get("start"), "end": c.get("end")} for c in chunks
-    ]
-    coll.upsert(ids=ids, documents=texts, metadatas=metas)
+    key = (_store_key(path), collection)
+    with _LOCK:
+        coll = _COLLECTIONS.get(key)
+        if coll is None:
+            client = _CLIENTS.get(key[0])
+            if client is None:
+                client = chromadb.PersistentClient(path=path)
+                _CLIENTS[key[0]] = client
+            coll = client.get_or_create_collection(collection)
+            _COLLECTIONS[key] = coll
+        return coll
+
+
+def evict_chroma_collection(path: str = ".ff_chroma", collection: str = "docs") -> None:
+    """Drop a cached collection handle; the next call re-fetches it."""
+    with _LOCK:
+        _COLLECTIONS.pop((_store_key(path), collection), None)
+
+
+def close_chroma(path: Optional[str] = None) -> None:
+    """Close the pooled client for `path` (or every pooled client) and drop its handles."""
+    with _LOCK:
+        keys = list(_CLIENTS) if path is None else [_store_key(path)]
+        for key in keys:
+            for ck in [ck for ck in _COLLECTIONS if ck[0] == key]:
+                del _COLLECTIONS[ck]
+            client = _CLIENTS.pop(key, None)
+            close = getattr(client, "close", None)  # chromadb >= 1.1
+            if close is not None:
+                close()
+
+
+def _max_batch_size(path: str) -> Optional[int]:
+    client = _CLIENTS.get(_store_key(path))
+    get_max = getattr(client, "get_max_batch_size", None)
+    return int(get_max()) if get_max is not None else None
+
+
+def _embedder_arg(
+    embedder: Optional[EmbedderSpec], embedding: Optional[EmbedderSpec]
+) -> Optional[EmbedderSpec]:
+    """`embedder`, or the deprecated `embedding` alias it replaced."""
+    if embedding is None:
+        return embedder
+    if embedder is not None:
+        raise FFConfigError(
+            "Pass `embedder` only (`embedding` is its deprecated alias)"
+        )
+    warnings.warn(
+        "`embedding=` is deprecated, use `embedder=` like the other stores",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+    return embedding
+
+
+# ids, documents, metadatas
+_Batch = Tuple[List[str], List[str], List[Dict[str, Any]]]
+
+
+def _iter_batches(
+    chunks: Iterable[Dict],
+    batch_size: int,
+    by_source: Optional[Dict[str, List[str]]] = None,
+) -> Iterator[_Batch]:
+    """
+    Turn chunks into (ids, texts, metadatas) batches; only one batch is built
+    at a time. Ids of chunks with a 'source' are collected into `by_source`.
+    """
+    offset = 0
+    for batch in batched(chunks, batch_size):
+        ids = [chunk_id(c, offset + i) for i, c in enumerate(batch)]
+        texts = [str(c["text"]) for c in batch]
+        metas = [_chunk_metadata(c) for c in batch]
+        offset += len(batch)
+        if by_source is not None:
+            for cid, c in zip(ids, batch):
+                if "source" in c:
+                    by_source.setdefault(str(c["source"]), []).append(cid)
+        yield ids, texts, metas
+
+
+def _skip_existing(
+    batches: Iterator[_Batch], coll: Any, skipped: List[int]
+) -> Iterator[_Batch]:
+    """
+    Drop chunks whose id is already stored. Ids are content-addressed, so an
+    existing id means the same text is already embedded. Also drops
+    duplicate ids within a batch (Chroma rejects those).
+    """
+    for ids, texts, metas in batches:
+        existing = set(coll.get(ids=ids, include=[])["ids"])
+        keep, seen = [], set()
+        for i, cid in enumerate(ids):
+            if cid not in existing and cid not in seen:
+                keep.append(i)
+                seen.add(cid)
+        skipped[0] += len(ids) - len(keep)
+        if keep:
+            yield (
+                [ids[i] for i in keep],
+                [texts[i] for i in keep],
+                [metas[i] for i in keep],
+            )
+
+
+def _prefetch_embeddings(
+    batches: Iterator[_Batch], embed: Optional[Any], ex: ThreadPoolExecutor
+) -> Iterator[Tuple[_Batch, Optional[Any]]]:
+    """
+    Yield (batch, embeddings) while the next batch is already being embedded
+    on `ex`, so embedding batch N+1 overlaps with writing batch N.
+    Without an `embedder` spec, embeddings are None and Chroma embeds with
+    the collection's own function inside upsert (no overlap).
+    """
+    pending: Optional[Tuple[_Batch, Optional[Future[Any]]]] = None
+    for batch in batches:
+        fut = ex.submit(embed, batch[1]) if embed is not None else None
+        if pending is not None:
+            prev, prev_fut = pending
+            yield prev, prev_fut.result() if prev_fut is not None else None
+        pending = (batch, fut)
+    if pending is not None:
+        prev, prev_fut = pending
+        yield prev, prev_fut.result() if prev_fut is not None else None
+
+
+@register_strategy("indexing", "chroma_upsert")
+def chroma_upsert(
+    chunks: Iterable[Dict],
+    *,
+    path: str = ".ff_chroma",
+    collection: str = "docs",
+    manifest: Optional[str] = None,
+    batch_size: int = 256,
+    skip_existing: bool = True,
+    embedder: Optional[EmbedderSpec] = None,
+    embedding: Optional[EmbedderSpec] = None,
+) -> str:
+    """
+    Upsert chunks into a persistent Chroma collection (pooled handle, see
+    `get_chroma_collection`).
+
+    All scalar chunk fields except 'text' (doc, source, page, start, end,
+    chunk_index, ...) are stored as metadata and can be filtered on at query
+    time. Ids are content-addressed (`flowfoundry.utils.chunk_id`: source or doc,
+    page, chunk_index and a text hash), so re-running a pipeline produces the
+    same ids. With `skip_existing` (default), chunks already in the
+    collection are neither re-embedded nor re-written (pass False to
+    refresh their metadata).
+
+    `chunks` may be any iterable, including a generator from a streaming
+    ingestion/chunking step; it is consumed in batches of `batch_size`
+    (capped at the client's maximum batch size), so only a couple of batches
+    are held in memory. With `embedder`, batch N+1 is embedded in a
+    background thread while batch N is written; per-batch throughput is
+    logged at INFO level.
+
+    With `manifest` (the same file passed to the ingestion step), the ids
+    produced for each source file are recorded, and chunks of modified or
+    removed files that did not reappear unchanged are deleted afterwards.
+
+    `embedder` (an `embedding` spec, e.g. {"name": "sentence_transformer",
+    "device": "cuda", "batch_size": 64, "cache": ".ff_embed_cache.sqlite"})
+    replaces the collection's built-in embedding function; pass the same
+    spec to `chroma_query`. Unlike the NumPy stores it defaults to None
+    (Chroma's own function). `embedding` is a deprecated alias.
+    """
+    coll = get_chroma_collection(path, collection)
+
+    size = max(1, batch_size)
+    max_size = _max_batch_size(path)
+    if max_size is not None:
+        size = min(size, max_size)
+    embedder = _embedder_arg(embedder, embedding)
+    embed = get_embedder(embedder) if embedder is not None else None
+
+    by_source: Optional[Dict[str, List[str]]] = {} if manifest is not None else None
+    batches = _iter_batches(chunks, size, by_source)
+    skipped = [0]
+    if skip_existing:
+        batches = _skip_existing(batches, coll, skipped)
+
+    total = 0
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        for n, ((ids, texts, metas), embeddings) in enumerate(
+            _prefetch_embeddings(batches, embed, ex), 1
+        ):
+            tb = time.perf_counter()
+            coll.upsert(
+                ids=ids, documents=texts, metadatas=metas, embeddings=embeddings
+            )
+            total += len(ids)
+            logger.info(
+                "chroma_upsert batch %d: %d chunks written in %.2fs "
+                "(%.1f chunks/s overall)",
+                n,
+                len(ids),
+                time.perf_counter() - tb,
+                total / (time.perf_counter() - t0),
+            )
+    logger.info(
+        "chroma_upsert: %d chunks written, %d unchanged skipped in %.2fs",
+        total,
+        skipped[0],
+        time.perf_counter() - t0,
+    )
+
+    if manifest is not None and by_source is not None:
+        # reload: ingestion may have updated it while `chunks` was consumed
+        m = IngestManifest.load(manifest)
+        current = {cid for ids in by_source.values() for cid in ids}
+        stale = [cid for cid in dict.fromkeys(m.stale_ids) if cid not in current]
+        if stale:
+            coll.delete(ids=stale)
+        m.record(by_source)
+        m.save()
     return cast(str, coll.name)
 
 
+def _hits(res: Dict[str, Any], i: int) -> List[Dict]:
+    """Hits for the i-th query of a Chroma query result."""
+    return [
+        {"text": txt, "metadata": md, "score": float(dist)}
+        for txt, md, dist in zip(
+            res["documents"][i], res["metadatas"][i], res["distances"][i]
+        )
+    ]
+
+
+def _filters(
+    where: Optional[Dict[str, Any]], where_document: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Only pass non-empty filters; Chroma rejects empty ones."""
+    out: Dict[str, Any] = {}
+    if where:
+        out["where"] = where
+    if where_document:
+        out["where_document"] = where_document
+    return out
+
+
+def _query_input(
+    queries: List[str], embedder: Optional[EmbedderSpec]
+) -> Dict[str, Any]:
+    """query_texts for Chroma to embed, or query_embeddings from `embedder`."""
+    if embedder is None:
+        return {"query_texts": queries}
+    return {"query_embeddings": get_embedder(embedder)(queries)}
+
+
 @register_strategy("indexing", "chroma_query")
 def chroma_query(
-    query: str, *, k: int = 5, path: str = ".ff_chroma", collection: str = "docs"
+    query: str,
+    *,
+    k: int = 5,
+    path: str = ".ff_chroma",
+    collection: str = "docs",
+    where: Optional[Dict[str, Any]] = None,
+    where_document: Optional[Dict[str, Any]] = None,
+    embedder: Optional[EmbedderSpec] = None,
+    embedding: Optional[EmbedderSpec] = None,
 ) -> List[Dict]:
-    if chromadb is None:
-        raise FFDependencyError(
-            "Install with `pip install flowfoundry[rag]` for Chroma support"
-        )
-    client = chromadb.PersistentClient(path=path)
-    coll = client.get_or_create_collection(collection)
-    res = coll.query(query_texts=[query], n_results=k)
-    hits = []
-    for txt, md, dist in zip(
-        res["documents"][0], res["metadatas"][0], res["distances"][0]
-    ):
-        hits.append({"text": txt, "metadata": md, "score": float(dist)})
-    return hits
+    """
+    Return the `k` nearest chunks as {"text", "metadata", "score"} hits.
+
+    `where` filters on stored metadata (e.g. {"source": "a.pdf"} or
+    {"$and": [{"tenant": "acme"}, {"page": {"$lte": 10}}]}) and
+    `where_document` on the text (e.g. {"$contains": "budget"}); both are
+    applied inside the index, so `k` hits are returned from the matching set.
+    `embedder` must match the spec used by `chroma_upsert`, if any
+    (`embedding` is a deprecated alias).
+    """
+    embedder = _embedder_arg(embedder, embedding)
+    coll = get_chroma_collection(path, collection)
+    res = coll.query(
+        **_query_input([query], embedder),
+        n_results=k,
+        **_filters(where, where_document),
+    )
+    return _hits(res, 0)
+
+
+@register_strategy("indexing", "chroma_query_batch")
+def chroma_query_batch(
+    queries: List[str],
+    *,
+    k: int = 5,
+    path: str = ".ff_chroma",
+    collection: str = "docs",
+    batch_size: int = 256,
+    where: Optional[Dict[str, Any]] = None,
+    where_document: Optional[Dict[str, Any]] = None,
+    embedder: Optional[EmbedderSpec] = None,
+    embedding: Optional[EmbedderSpec] = None,
+) -> List[List[Dict]]:
+    """
+    Query many strings at once; returns one hit list per query, in order.
+
+    Queries are sent `batch_size` at a time, so each Chroma call embeds a
+    whole batch in one model dispatch and searches it in one index pass.
+    `where` / `where_document` / `embedder` apply to every query (see
+    `chroma_query`); with `embedder`, each batch is embedded in one call.
+    """
+    embedder = _embedder_arg(embedder, embedding)
+    coll = get_chroma_collection(path, collection)
+    filters = _filters(where, where_document)
+    out: List[List[Dict]] = []
+    embed = get_embedder(embedder) if embedder is not None else None
+    for batch in batched(queries, batch_size):
+        res = coll.query(**_query_input(batch, embed), n_results=k, **filters)
+        out.extend(_hits(res, i) for i in range(len(batch)))
+    return out
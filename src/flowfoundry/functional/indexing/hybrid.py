@@ -0,0 +1,95 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ...utils import register_strategy, strategies, FFConfigError
+from ...utils.parallel import batched
+from ..rerank.fusion import fusion
+from .bm25_index import _add_chunks, get_bm25_index, bm25_query
+
+
+def _store_fn(store: str, op: str) -> Any:
+    name = f"{store}_{op}"
+    if not strategies.has("indexing", name):
+        raise FFConfigError(
+            f"Unknown vector store '{store}': no 'indexing:{name}' strategy registered"
+        )
+    return strategies.get("indexing", name)
+
+
+def _store_kwargs(
+    path: Optional[str], collection: str, store_kwargs: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    kw: Dict[str, Any] = {"collection": collection, **(store_kwargs or {})}
+    if path is not None:  # otherwise keep the store's own default
+        kw["path"] = path
+    return kw
+
+
+@register_strategy("indexing", "hybrid_upsert")
+def hybrid_upsert(
+    chunks: Iterable[Dict],
+    *,
+    store: str = "numpy",
+    path: Optional[str] = None,
+    collection: str = "docs",
+    lexical_path: Optional[str] = ".ff_bm25",
+    batch_size: int = 256,
+    store_kwargs: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Upsert chunks into a vector store and a BM25 index in one pass.
+
+    `store` names any vector store with `<store>_upsert` / `<store>_query`
+    indexing strategies ("numpy", "mmap", "ivf", "chroma", ...); `path`,
+    `collection` and `store_kwargs` (e.g. {"embedder": ...}) are passed to
+    it. Each batch the vector store consumes is also added to the BM25 index
+    at `<lexical_path>/<collection>/`, so a generator is still read once.
+    """
+    idx = get_bm25_index(lexical_path, collection)
+
+    def tee() -> Iterator[Dict]:
+        offset = 0
+        for batch in batched(chunks, batch_size):
+            _add_chunks(idx, batch, offset)
+            offset += len(batch)
+            yield from batch
+
+    upsert = _store_fn(store, "upsert")
+    kw = _store_kwargs(path, collection, store_kwargs)
+    result = upsert(tee(), batch_size=batch_size, **kw)
+    if lexical_path is not None:
+        idx.save(Path(lexical_path) / collection)
+    return str(result)
+
+
+@register_strategy("indexing", "hybrid_query")
+def hybrid_query(
+    query: str,
+    *,
+    k: int = 5,
+    store: str = "numpy",
+    path: Optional[str] = None,
+    collection: str = "docs",
+    lexical_path: Optional[str] = ".ff_bm25",
+    candidates: int = 50,
+    rrf_k: int = 60,
+    store_kwargs: Optional[Dict[str, Any]] = None,
+) -> List[Dict]:
+    """
+    Lexical + vector search over the full corpus, fused by reciprocal rank.
+
+    The top `candidates` of the vector store (see `hybrid_upsert`) and of
+    the BM25 index are fused with RRF (`rerank.fusion`), so chunks that
+    only one side finds still surface; `rrf_k` damps the weight of the top
+    ranks. Returns the best `k` as {"text", "metadata", "score"} hits, where
+    `score` is the fused RRF score (higher is better).
+    """
+    search = _store_fn(store, "query")
+    vector_hits = search(
+        query, k=candidates, **_store_kwargs(path, collection, store_kwargs)
+    )
+    lexical_hits = bm25_query(
+        query, k=candidates, path=lexical_path, collection=collection
+    )
+    return fusion(query, vector_hits, lists=[lexical_hits], k=rrf_k, top_k=k)
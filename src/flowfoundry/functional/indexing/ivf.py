@@ -0,0 +1,572 @@
+from __future__ import annotations
+import mmap
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from ...utils import register_strategy, chunk_id, FFConfigError
+from ...utils.parallel import batched
+from ..embedding import EmbedderSpec, get_embedder
+from ._common import (
+    _as_matrix,
+    _chunk_metadata,
+    _normalize,
+    _topk,
+)
+from .mmap_store import (
+    FORMAT_VERSION,
+    _append_files,
+    _encode_records,
+    _map_records,
+    _read_header,
+    _read_ids,
+    _read_record,
+    _write_header,
+)
+from .numpy_index import METRICS
+
+QUANTIZERS = ("none", "int8", "pq")
+
+
+def _half_sq_norms(centroids: np.ndarray) -> np.ndarray:
+    """|c|^2 / 2 per centroid: argmax of x.c - |c|^2/2 is the L2-nearest centroid."""
+    return np.asarray(0.5 * np.einsum("ij,ij->i", centroids, centroids))
+
+
+def _nearest(x: np.ndarray, centroids: np.ndarray, block: int = 8192) -> np.ndarray:
+    """Index of the closest centroid (L2) for each row, in row blocks."""
+    half_sq = _half_sq_norms(centroids)
+    out = np.empty(len(x), dtype=np.int64)
+    for s in range(0, len(x), block):
+        out[s : s + block] = np.argmax(x[s : s + block] @ centroids.T - half_sq, axis=1)
+    return out
+
+
+def _kmeans(x: np.ndarray, k: int, iters: int = 20, seed: int = 0) -> np.ndarray:
+    """Lloyd's k-means; empty clusters are re-seeded from random points."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(x))
+    centroids = x[rng.choice(len(x), k, replace=False)].astype(np.float32)
+    for _ in range(iters):
+        assign = _nearest(x, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=k)
+        nonempty = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+        sums = np.add.reduceat(x[order], starts, axis=0)
+        centroids[nonempty] = sums / counts[nonempty, None]
+        n_empty = int((~nonempty).sum())
+        if n_empty:
+            centroids[~nonempty] = x[rng.choice(len(x), n_empty, replace=False)]
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index with optional vector quantization.
+
+    Vectors are assigned to the nearest of `nlist` k-means centroids; each
+    list stores the residual (vector - centroid) encoded by `quantizer`:
+
+      - "none"  float32 residuals (exact within the probed lists)
+      - "int8"  per-dimension scaled int8 residuals (4x smaller)
+      - "pq"    product quantization: `pq_m` sub-vectors, one byte each
+                (4 * dim / pq_m smaller, e.g. 16x with pq_m = dim / 4)
+
+    Vectors go to their L2-nearest centroid (the smallest residual, so the
+    least quantization error) and a query probes the `nprobe` lists whose
+    centroids are L2-nearest to it, the same partition of space. Scores are
+    inner products (vectors are normalised for metric="cosine"):
+    q.x ~= q.centroid + q.residual, so probed codes are scored without
+    decoding them. Larger `nprobe` = higher recall, higher latency. The rows
+    of all lists live in one CSR layout.
+    """
+
+    def __init__(
+        self,
+        nlist: int = 256,
+        quantizer: str = "int8",
+        pq_m: Optional[int] = None,
+        metric: str = "cosine",
+    ) -> None:
+        if quantizer not in QUANTIZERS:
+            raise FFConfigError(
+                f"quantizer must be one of {QUANTIZERS}, got {quantizer!r}"
+            )
+        if metric not in METRICS:
+            raise FFConfigError(f"metric must be one of {METRICS}, got {metric!r}")
+        self.nlist = nlist
+        self.quantizer = quantizer
+        self.pq_m = pq_m
+        self.metric = metric
+        self.centroids: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None  # int8: per-dim step
+        self.codebooks: Optional[np.ndarray] = None  # pq: (m, ks, dim / m)
+        # CSR storage: codes/rows sorted by list, list i = [offsets[i], offsets[i+1])
+        self.codes = np.empty((0, 0), dtype=np.float32)
+        self.rows = np.empty((0,), dtype=np.int64)
+        self.offsets = np.zeros((1,), dtype=np.int64)
+        self._pending: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._n = 0
+        self._lock = Lock()
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def bytes_per_vector(self) -> int:
+        return int(self.codes.shape[1] * self.codes.itemsize) if len(self.codes) else 0
+
+    # ----- training -----
+    def train(self, vectors: Any, iters: int = 20, seed: int = 0) -> None:
+        x = self._prep(vectors)
+        self.centroids = _kmeans(x, self.nlist, iters, seed)
+        self.nlist = len(self.centroids)
+        res = x - self.centroids[_nearest(x, self.centroids)]
+        dim = x.shape[1]
+        if self.quantizer == "int8":
+            self.scale = np.maximum(np.abs(res).max(axis=0), 1e-12) / 127.0
+        elif self.quantizer == "pq":
+            m = self.pq_m or dim // 4
+            if m <= 0 or dim % m:
+                raise FFConfigError(
+                    f"pq_m must divide the vector dimension {dim}, got {m}"
+                )
+            self.pq_m = m
+            sub = res.reshape(len(res), m, dim // m)
+            ks = min(256, len(res))
+            self.codebooks = np.stack(
+                [_kmeans(sub[:, j], ks, iters, seed + j) for j in range(m)]
+            )
+        self.offsets = np.zeros((self.nlist + 1,), dtype=np.int64)
+
+    def _prep(self, vectors: Any) -> np.ndarray:
+        x = _as_matrix(vectors)
+        return _normalize(x) if self.metric == "cosine" else x
+
+    # ----- encoding -----
+    def _encode(self, res: np.ndarray) -> np.ndarray:
+        if self.quantizer == "int8":
+            assert self.scale is not None
+            q8: np.ndarray = np.clip(np.rint(res / self.scale), -127, 127)
+            return q8.astype(np.int8)
+        if self.quantizer == "pq":
+            assert self.codebooks is not None
+            m, _, d_sub = self.codebooks.shape
+            sub = res.reshape(len(res), m, d_sub)
+            return np.stack(
+                [_nearest(sub[:, j], self.codebooks[j]) for j in range(m)], axis=1
+            ).astype(np.uint8)
+        return res.astype(np.float32)
+
+    def add(self, vectors: Any, rows: np.ndarray) -> None:
+        """Assign, encode and queue vectors; `rows` are caller-side record ids."""
+        if self.centroids is None:
+            raise FFConfigError("IVFIndex must be trained before adding vectors")
+        x = self._prep(vectors)
+        lists = _nearest(x, self.centroids)
+        codes = self._encode(x - self.centroids[lists])
+        with self._lock:
+            self._pending.append((lists, codes, np.asarray(rows, dtype=np.int64)))
+            self._n += len(x)
+
+    def _compact(self) -> None:
+        """Merge queued additions into the CSR arrays (once per batch of adds)."""
+        if not self._pending:
+            return
+        lists = np.concatenate([self._list_of_rows()] + [p[0] for p in self._pending])
+        codes = np.concatenate(
+            ([self.codes] if len(self.codes) else []) + [p[1] for p in self._pending]
+        )
+        rows = np.concatenate([self.rows] + [p[2] for p in self._pending])
+        order = np.argsort(lists, kind="stable")
+        self.codes, self.rows = codes[order], rows[order]
+        counts = np.bincount(lists, minlength=self.nlist)
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self._pending = []
+
+    def _list_of_rows(self) -> np.ndarray:
+        return np.repeat(np.arange(self.nlist), np.diff(self.offsets))
+
+    # ----- search -----
+    def search(
+        self, queries: Any, k: int, nprobe: int = 8
+    ) -> List[List[Tuple[int, float]]]:
+        """Top-k (row, approximate score) per query, probing `nprobe` lists."""
+        if self.centroids is None:
+            return [[] for _ in range(len(_as_matrix(queries)))]
+        q = self._prep(queries)
+        with self._lock:
+            self._compact()
+            codes, rows, offsets = self.codes, self.rows, self.offsets
+        coarse = q @ self.centroids.T
+        probe_idx, _ = _topk(coarse - _half_sq_norms(self.centroids), max(1, nprobe))
+        out: List[List[Tuple[int, float]]] = []
+        for qi, lists in enumerate(probe_idx):
+            spans = [np.arange(offsets[c], offsets[c + 1]) for c in lists]
+            cand = np.concatenate(spans) if spans else np.empty(0, np.int64)
+            if len(cand) == 0:
+                out.append([])
+                continue
+            base = np.repeat(coarse[qi, lists], [len(s) for s in spans])
+            scores = base + self._residual_scores(q[qi], codes[cand])
+            top, vals = _topk(scores[None, :], k)
+            out.append(
+                [(int(rows[cand[i]]), float(v)) for i, v in zip(top[0], vals[0])]
+            )
+        return out
+
+    def _residual_scores(self, q: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        if self.quantizer == "int8":
+            assert self.scale is not None
+            return np.asarray(codes @ (q * self.scale).astype(np.float32))
+        if self.quantizer == "pq":
+            assert self.codebooks is not None
+            m, _, d_sub = self.codebooks.shape
+            lut = np.einsum("mkd,md->mk", self.codebooks, q.reshape(m, d_sub))
+            return np.asarray(lut[np.arange(m), codes].sum(axis=1))
+        return np.asarray(codes @ q)
+
+    # ----- persistence -----
+    def state(self) -> Dict[str, np.ndarray]:
+        with self._lock:
+            self._compact()
+        arrays: Dict[str, np.ndarray] = {
+            "codes": self.codes,
+            "rows": self.rows,
+            "offsets": self.offsets,
+            "params": np.array(
+                [self.nlist, self.pq_m or 0, QUANTIZERS.index(self.quantizer)]
+            ),
+        }
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+        if self.scale is not None:
+            arrays["scale"] = self.scale
+        if self.codebooks is not None:
+            arrays["codebooks"] = self.codebooks
+        return arrays
+
+    @classmethod
+    def from_state(cls, arrays: Dict[str, np.ndarray], metric: str) -> "IVFIndex":
+        nlist, pq_m, q = (int(v) for v in arrays["params"])
+        idx = cls(
+            nlist=nlist, quantizer=QUANTIZERS[q], pq_m=pq_m or None, metric=metric
+        )
+        idx.centroids = arrays.get("centroids")
+        idx.scale = arrays.get("scale")
+        idx.codebooks = arrays.get("codebooks")
+        idx.codes, idx.rows, idx.offsets = (
+            arrays["codes"],
+            arrays["rows"],
+            arrays["offsets"],
+        )
+        idx._n = len(idx.rows)
+        return idx
+
+
+class IVFCollection:
+    """
+    An IVFIndex plus the id / text / metadata records its rows point to.
+
+    Records use the mmap store's append-only layout (records.jsonl,
+    offsets.u64, ids.txt): new records stay in memory until `save` appends
+    them, and saved ones are read back through a memory map. A persisted
+    collection therefore keeps only its ids and the compressed index in RAM,
+    and each save writes only the new records.
+    """
+
+    def __init__(self, index: IVFIndex) -> None:
+        self.index = index
+        self._known: Set[str] = set()
+        self._count = 0
+        self._unsaved: List[Tuple[str, str, Dict[str, Any]]] = []  # id, text, metadata
+        self._header: Optional[Dict[str, Any]] = None  # committed on-disk state
+        self._records: Optional[mmap.mmap] = None
+        self._offsets = np.empty((0,), dtype=np.uint64)
+        self._untrained: List[np.ndarray] = []  # vectors buffered until training
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        vectors: Any,
+    ) -> None:
+        rows = np.arange(self._count, self._count + len(ids))
+        self._unsaved.extend(zip(ids, texts, metadatas))
+        self._known.update(ids)
+        self._count += len(ids)
+        if self.index.is_trained:
+            self.index.add(vectors, rows)
+        else:
+            self._untrained.append(_as_matrix(vectors))
+
+    def __contains__(self, cid: object) -> bool:
+        return cid in self._known
+
+    def record(self, row: int) -> Tuple[str, Dict[str, Any]]:
+        """(text, metadata) of a row, from memory or the saved record log."""
+        saved = len(self._offsets)
+        if row >= saved:
+            _, text, meta = self._unsaved[row - saved]
+            return text, meta
+        assert self._records is not None and self._header is not None
+        rec = _read_record(
+            self._records, self._offsets, row, self._header["records_bytes"]
+        )
+        return rec["text"], rec["metadata"]
+
+    @property
+    def n_untrained(self) -> int:
+        return sum(len(v) for v in self._untrained)
+
+    def train_pending(self) -> None:
+        """Train on the buffered vectors, then index them."""
+        if not self._untrained:
+            return
+        x = np.concatenate(self._untrained)
+        self._untrained = []
+        if not self.index.is_trained:
+            self.index.train(x)
+        self.index.add(x, np.arange(self._count - len(x), self._count))
+
+    def _map(self, d: Path, header: Dict[str, Any]) -> None:
+        if self._records is not None:
+            self._records.close()
+            self._records = None
+        self._header = header
+        if header["count"]:
+            self._records, self._offsets = _map_records(d, header["count"])
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """
+        Append unsaved records, rewrite ivf.npz, then commit by replacing
+        ivf.json (single writer; the directory this collection was loaded
+        from or first saved to).
+        """
+        d = Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        header = _read_header(d, "ivf.json") or {
+            "version": FORMAT_VERSION,
+            "metric": self.index.metric,
+            "count": 0,
+            "records_bytes": 0,
+            "ids_bytes": 0,
+        }
+        if header["count"] != len(self._offsets):
+            raise FFConfigError(
+                f"{d} holds {header['count']} records, this collection saved "
+                f"{len(self._offsets)}; save a collection to its own directory"
+            )
+        texts = [text for _, text, _ in self._unsaved]
+        metas = [meta for _, _, meta in self._unsaved]
+        records, offsets, records_bytes = _encode_records(
+            texts, metas, header["records_bytes"]
+        )
+        id_bytes = "".join(f"{cid}\n" for cid, _, _ in self._unsaved).encode("utf-8")
+        _append_files(
+            d,
+            {
+                "offsets.u64": header["count"] * 8,
+                "records.jsonl": header["records_bytes"],
+                "ids.txt": header["ids_bytes"],
+            },
+            {
+                "offsets.u64": [offsets.tobytes()],
+                "records.jsonl": records,
+                "ids.txt": [id_bytes],
+            },
+        )
+        tmp = d / "ivf.tmp.npz"
+        state: Dict[str, Any] = dict(self.index.state())
+        np.savez(tmp, **state)
+        os.replace(tmp, d / "ivf.npz")
+
+        header["count"] += len(self._unsaved)
+        header["records_bytes"] += records_bytes
+        header["ids_bytes"] += len(id_bytes)
+        _write_header(d, header, "ivf.json")
+        self._unsaved = []
+        self._map(d, header)
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "IVFCollection":
+        d = Path(directory)
+        header = _read_header(d, "ivf.json")
+        if header is None:
+            raise FFConfigError(f"No IVF collection at {d}")
+        with np.load(d / "ivf.npz") as z:
+            arrays = {name: z[name] for name in z.files}
+        coll = cls(IVFIndex.from_state(arrays, header["metric"]))
+        coll._known = set(_read_ids(d, header["ids_bytes"]))
+        coll._count = header["count"]
+        coll._map(d, header)
+        return coll
+
+
+# ---------- process-wide registry ----------
+_COLLECTIONS: Dict[Tuple[Optional[str], str], IVFCollection] = {}
+_LOCK = Lock()
+
+
+def _key(path: Optional[str], collection: str) -> Tuple[Optional[str], str]:
+    return (str(Path(path).resolve()) if path is not None else None, collection)
+
+
+def get_ivf_collection(
+    path: Optional[str] = None,
+    collection: str = "docs",
+    nlist: Optional[int] = None,
+    quantizer: Optional[str] = None,
+    pq_m: Optional[int] = None,
+    metric: Optional[str] = None,
+    create: bool = True,
+) -> IVFCollection:
+    """
+    Return the IVF collection for (path, collection), loading
+    `<path>/<collection>/` or creating it on first use.
+
+    The index settings are used for a new collection (defaults: nlist=256,
+    "int8", "cosine"); None keeps an existing collection's settings and an
+    explicit value must match them (a trained index's `nlist` is its actual
+    number of lists). With `create=False` a missing collection raises
+    FFConfigError.
+    """
+    key = _key(path, collection)
+    settings = {"nlist": nlist, "quantizer": quantizer, "pq_m": pq_m, "metric": metric}
+    with _LOCK:
+        coll = _COLLECTIONS.get(key)
+        if coll is None:
+            d = Path(path) / collection if path is not None else None
+            if d is not None and (d / "ivf.json").exists():
+                coll = IVFCollection.load(d)
+            elif create:
+                coll = IVFCollection(
+                    IVFIndex(
+                        nlist=nlist or 256,
+                        quantizer=quantizer or "int8",
+                        pq_m=pq_m,
+                        metric=metric or "cosine",
+                    )
+                )
+            else:
+                where = f"at {d}" if d is not None else "in memory"
+                raise FFConfigError(f"No IVF collection '{collection}' {where}")
+            _COLLECTIONS[key] = coll
+    index = coll.index
+    for name, value in settings.items():
+        current = getattr(index, name)
+        if name == "pq_m" and (index.quantizer != "pq" or current is None):
+            continue  # unused, or picked at training time
+        if value is not None and value != current:
+            raise FFConfigError(
+                f"Collection '{collection}' uses {name}={current!r}, got {value!r}"
+            )
+    return coll
+
+
+def drop_ivf_collection(path: Optional[str] = None, collection: str = "docs") -> None:
+    """Forget a cached IVF collection (files on disk are left untouched)."""
+    with _LOCK:
+        _COLLECTIONS.pop(_key(path, collection), None)
+
+
+@register_strategy("indexing", "ivf_upsert")
+def ivf_upsert(
+    chunks: Iterable[Dict],
+    *,
+    path: Optional[str] = None,
+    collection: str = "docs",
+    embedder: EmbedderSpec = "hashing",
+    nlist: Optional[int] = None,
+    quantizer: Optional[str] = None,
+    pq_m: Optional[int] = None,
+    metric: Optional[str] = None,
+    train_size: int = 65536,
+    batch_size: int = 256,
+) -> str:
+    """
+    Embed chunks into an approximate (IVF) index with quantized vectors.
+
+    The index is trained (k-means + quantizer) on the first `train_size`
+    vectors, or on everything in this call if there are fewer; later vectors
+    and later upserts are only assigned and encoded. `nlist` defaults to
+    ~4 * sqrt(n) of the training set. `nlist`, `quantizer` ("int8" for a
+    new collection), `pq_m` and `metric` ("cosine") are fixed when the
+    collection is created; None keeps the existing settings and a
+    conflicting value raises FFConfigError. Ids/metadata follow
+    `chroma_upsert`; ids already present are skipped. With `path`, the index
+    is saved to `<path>/<collection>/` (ivf.npz, ivf.json and an append-only
+    record log: only this call's records are written).
+    """
+    embed = get_embedder(embedder)
+    coll = get_ivf_collection(
+        path, collection, nlist=nlist, quantizer=quantizer, pq_m=pq_m, metric=metric
+    )
+    offset = 0
+    for batch in batched(chunks, batch_size):
+        ids = [chunk_id(c, offset + i) for i, c in enumerate(batch)]
+        offset += len(batch)
+        keep, seen = [], set()
+        for i, cid in enumerate(ids):
+            if cid not in coll and cid not in seen:
+                keep.append(i)
+                seen.add(cid)
+        if not keep:
+            continue
+        texts = [str(batch[i]["text"]) for i in keep]
+        coll.add(
+            [ids[i] for i in keep],
+            texts,
+            [_chunk_metadata(batch[i]) for i in keep],
+            embed(texts),
+        )
+        if not coll.index.is_trained and coll.n_untrained >= train_size:
+            _train(coll, nlist)
+    if not coll.index.is_trained:
+        _train(coll, nlist)
+    if path is not None:
+        coll.save(Path(path) / collection)
+    return collection
+
+
+def _train(coll: IVFCollection, nlist: Optional[int]) -> None:
+    if nlist is None:
+        coll.index.nlist = max(1, int(4 * np.sqrt(coll.n_untrained)))
+    coll.train_pending()
+
+
+@register_strategy("indexing", "ivf_query")
+def ivf_query(
+    query: str,
+    *,
+    k: int = 5,
+    path: Optional[str] = None,
+    collection: str = "docs",
+    embedder: EmbedderSpec = "hashing",
+    nprobe: int = 8,
+) -> List[Dict]:
+    """
+    Approximate top-k search: probe the `nprobe` closest lists (recall vs
+    latency knob; nprobe = nlist is exhaustive). Returns {"text", "metadata",
+    "score"} hits, best first; `score` is an approximate similarity.
+    Raises FFConfigError for a collection that was never upserted.
+    """
+    coll = get_ivf_collection(path, collection, create=False)
+    embed = get_embedder(embedder)
+    hits = []
+    for row, score in coll.index.search(embed([query]), k, nprobe)[0]:
+        text, meta = coll.record(row)
+        hits.append({"text": text, "metadata": meta, "score": score})
+    return hits
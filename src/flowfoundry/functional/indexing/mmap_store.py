@@ -0,0 +1,347 @@
+from __future__ import annotations
+import json
+import mmap
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from ...utils import register_strategy, chunk_id, FFConfigError
+from ...utils.parallel import batched
+from ..embedding import EmbedderSpec, get_embedder
+from ._common import (
+    _as_matrix,
+    _chunk_metadata,
+    _normalize,
+    _topk,
+)
+from .numpy_index import METRICS
+
+FORMAT_VERSION = 1
+
+# File layout inside <path>/<collection>/:
+#   header.json    committed counts/sizes; rewritten atomically after each append
+#   vectors.f32    row-major float32 matrix, `count` x `dim`
+#   offsets.u64    byte offset of each record in records.jsonl
+#   records.jsonl  one {"text", "metadata"} JSON object per row
+#   ids.txt        one chunk id per row
+
+
+def _read_header(d: Path, name: str = "header.json") -> Optional[Dict[str, Any]]:
+    p = d / name
+    if not p.exists():
+        return None
+    return dict(json.loads(p.read_text(encoding="utf-8")))
+
+
+def _write_header(d: Path, header: Dict[str, Any], name: str = "header.json") -> None:
+    tmp = d / f"{name}.tmp"
+    tmp.write_text(json.dumps(header), encoding="utf-8")
+    os.replace(tmp, d / name)
+
+
+# ---------- append-only record log (records.jsonl + offsets.u64 + ids.txt) ----------
+def _encode_records(
+    texts: List[str], metadatas: List[Dict[str, Any]], start: int
+) -> Tuple[List[bytes], np.ndarray, int]:
+    """JSON lines for the records, their byte offsets from `start`, and total size."""
+    records = [
+        (json.dumps({"text": t, "metadata": m}, ensure_ascii=False) + "\n").encode(
+            "utf-8"
+        )
+        for t, m in zip(texts, metadatas)
+    ]
+    lengths = np.fromiter((len(r) for r in records), np.uint64, len(records))
+    offsets = np.uint64(start) + np.cumsum(lengths, dtype=np.uint64) - lengths
+    return records, offsets, int(lengths.sum())
+
+
+def _append_files(
+    d: Path, committed: Dict[str, int], data: Dict[str, List[bytes]]
+) -> None:
+    """
+    Append `data` to each file after truncating it to its committed size
+    (dropping bytes of an interrupted append), then fsync. The caller
+    commits by rewriting its header afterwards.
+    """
+    handles = {name: open(d / name, "ab") for name in data}
+    try:
+        for name, f in handles.items():
+            f.truncate(committed[name])
+            f.writelines(data[name])
+            f.flush()
+            os.fsync(f.fileno())
+    finally:
+        for f in handles.values():
+            f.close()
+
+
+def _map_records(d: Path, count: int) -> Tuple[mmap.mmap, np.ndarray]:
+    """Memory-map records.jsonl and its `count` offsets."""
+    offsets = np.memmap(d / "offsets.u64", np.uint64, "r", shape=(count,))
+    with open(d / "records.jsonl", "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), offsets
+
+
+def _read_record(
+    records: mmap.mmap, offsets: np.ndarray, row: int, records_bytes: int
+) -> Dict[str, Any]:
+    start = int(offsets[row])
+    end = int(offsets[row + 1]) if row + 1 < len(offsets) else records_bytes
+    return dict(json.loads(records[start:end]))
+
+
+def _read_ids(d: Path, ids_bytes: int) -> List[str]:
+    with open(d / "ids.txt", "rb") as f:
+        return f.read(ids_bytes).decode("utf-8").splitlines()
+
+
+class MmapStore:
+    """
+    Read side of the on-disk vector store.
+
+    Vectors, record offsets and records are memory-mapped, so opening is O(1)
+    and every process on a host shares the same page cache. Only the rows a
+    query returns are decoded from `records.jsonl`.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        header = _read_header(self.directory)
+        if header is None:
+            raise FFConfigError(f"No mmap store at {self.directory}")
+        self.header = header
+        self.metric: str = header["metric"]
+        self.count: int = header["count"]
+        self.dim: int = header["dim"]
+        self._records: Optional[mmap.mmap] = None
+        self.vectors: np.ndarray
+        self.offsets: np.ndarray
+        if self.count:
+            d = self.directory
+            self.vectors = np.memmap(
+                d / "vectors.f32", np.float32, "r", shape=(self.count, self.dim)
+            )
+            self._records, self.offsets = _map_records(d, self.count)
+        else:
+            self.vectors = np.empty((0, self.dim), dtype=np.float32)
+            self.offsets = np.empty((0,), dtype=np.uint64)
+
+    def record(self, row: int) -> Dict[str, Any]:
+        assert self._records is not None
+        return _read_record(
+            self._records, self.offsets, row, self.header["records_bytes"]
+        )
+
+    def search(self, queries: Any, k: int) -> List[List[Tuple[int, float]]]:
+        q = _as_matrix(queries)
+        if self.metric == "cosine":
+            q = _normalize(q)
+        if self.count == 0:
+            return [[] for _ in range(q.shape[0])]
+        if q.shape[1] != self.dim:
+            raise FFConfigError(
+                f"Query dimension {q.shape[1]} does not match store dimension {self.dim}"
+            )
+        rows, scores = _topk(q @ self.vectors.T, k)
+        return [
+            [(int(r), float(s)) for r, s in zip(rr, ss)] for rr, ss in zip(rows, scores)
+        ]
+
+    def close(self) -> None:
+        if self._records is not None:
+            self._records.close()
+            self._records = None
+
+
+def append_to_store(
+    directory: Union[str, Path],
+    ids: List[str],
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+    vectors: Any,
+    metric: Optional[str] = None,
+) -> int:
+    """
+    Append rows to the store at `directory` (created on first use).
+
+    `metric` is fixed when the store is created ("cosine" if None) and must
+    match an existing store's. Data files are appended and fsynced first; the header, which is all a
+    reader trusts, is replaced atomically last. Bytes beyond the committed
+    sizes (from an interrupted append) are truncated before writing.
+    Returns the new row count. Single writer per store.
+    """
+    d = Path(directory)
+    d.mkdir(parents=True, exist_ok=True)
+    vecs = _as_matrix(vectors)
+    header = _read_header(d) or {
+        "version": FORMAT_VERSION,
+        "metric": metric or "cosine",
+        "dim": int(vecs.shape[1]),
+        "count": 0,
+        "records_bytes": 0,
+        "ids_bytes": 0,
+    }
+    _check_metric(d, header, metric)
+    if vecs.shape[1] != header["dim"]:
+        raise FFConfigError(
+            f"Vector dimension {vecs.shape[1]} does not match store dimension {header['dim']}"
+        )
+    if header["metric"] == "cosine":
+        vecs = _normalize(vecs)
+
+    count = header["count"]
+    committed = {
+        "vectors.f32": count * header["dim"] * 4,
+        "offsets.u64": count * 8,
+        "records.jsonl": header["records_bytes"],
+        "ids.txt": header["ids_bytes"],
+    }
+    records, offsets, records_bytes = _encode_records(
+        texts, metadatas, header["records_bytes"]
+    )
+    id_bytes = "".join(f"{cid}\n" for cid in ids).encode("utf-8")
+    _append_files(
+        d,
+        committed,
+        {
+            "vectors.f32": [vecs.tobytes()],
+            "offsets.u64": [offsets.tobytes()],
+            "records.jsonl": records,
+            "ids.txt": [id_bytes],
+        },
+    )
+
+    header["count"] = count + len(ids)
+    header["records_bytes"] += records_bytes
+    header["ids_bytes"] += len(id_bytes)
+    _write_header(d, header)
+    return int(header["count"])
+
+
+def _check_metric(d: Path, header: Dict[str, Any], metric: Optional[str]) -> None:
+    if header["metric"] not in METRICS:
+        raise FFConfigError(
+            f"metric must be one of {METRICS}, got {header['metric']!r}"
+        )
+    if metric is not None and metric != header["metric"]:
+        raise FFConfigError(
+            f"Store at {d} uses metric {header['metric']!r}, got {metric!r}"
+        )
+
+
+def _store_ids(d: Path) -> Set[str]:
+    header = _read_header(d)
+    if header is None:
+        return set()
+    return set(_read_ids(d, header["ids_bytes"]))
+
+
+# ---------- per-process reader cache ----------
+_READERS: Dict[str, Tuple[Tuple[int, int], MmapStore]] = {}
+_LOCK = Lock()
+
+
+def open_mmap_store(path: str = ".ff_mmap", collection: str = "docs") -> MmapStore:
+    """
+    Return a reader for (path, collection), reopened only when the header
+    changed (i.e. after an append), so repeated queries reuse the mappings.
+
+    A replaced reader is not closed: callers that fetched it earlier may
+    still be reading from it in other threads. It stays valid (a snapshot
+    of the store at its header) and its maps are released when the last
+    reference to it goes away.
+    """
+    d = Path(path).resolve() / collection
+    try:
+        st = (d / "header.json").stat()
+    except FileNotFoundError:
+        raise FFConfigError(f"No mmap store at {d}") from None
+    stamp = (st.st_ino, st.st_mtime_ns)  # the header is replaced on every append
+    key = str(d)
+    with _LOCK:
+        cached = _READERS.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        store = MmapStore(d)
+        _READERS[key] = (stamp, store)
+        return store
+
+
+@register_strategy("indexing", "mmap_upsert")
+def mmap_upsert(
+    chunks: Iterable[Dict],
+    *,
+    path: str = ".ff_mmap",
+    collection: str = "docs",
+    embedder: EmbedderSpec = "hashing",
+    metric: Optional[str] = None,
+    batch_size: int = 256,
+) -> str:
+    """
+    Embed chunks and append them to a memory-mapped on-disk store at
+    `<path>/<collection>/`.
+
+    The store is append-only and meant for read-mostly serving: build it once
+    (or append new chunks), then let any number of processes query it via
+    `mmap_query`, sharing the OS page cache. Ids and metadata follow
+    `chroma_upsert`; ids already in the store (unchanged chunks) are neither
+    re-embedded nor appended again.
+
+    `metric` ("cosine" or "dot") is fixed when the store is created; None
+    keeps the existing one ("cosine" for a new store) and a different value
+    raises FFConfigError.
+    """
+    embed = get_embedder(embedder)
+    d = Path(path) / collection
+    header = _read_header(d)
+    if header is not None:
+        _check_metric(d, header, metric)
+    existing = _store_ids(d)
+    offset = 0
+    for batch in batched(chunks, batch_size):
+        ids = [chunk_id(c, offset + i) for i, c in enumerate(batch)]
+        offset += len(batch)
+        keep = []
+        for i, cid in enumerate(ids):
+            if cid not in existing:
+                keep.append(i)
+                existing.add(cid)
+        if not keep:
+            continue
+        texts = [str(batch[i]["text"]) for i in keep]
+        append_to_store(
+            d,
+            [ids[i] for i in keep],
+            texts,
+            [_chunk_metadata(batch[i]) for i in keep],
+            embed(texts),
+            metric=metric,
+        )
+    return collection
+
+
+@register_strategy("indexing", "mmap_query")
+def mmap_query(
+    query: str,
+    *,
+    k: int = 5,
+    path: str = ".ff_mmap",
+    collection: str = "docs",
+    embedder: EmbedderSpec = "hashing",
+) -> List[Dict]:
+    """
+    Exact top-k search over a memory-mapped store (see `mmap_upsert`).
+
+    Returns {"text", "metadata", "score"} hits, best first; `score` is a
+    similarity (higher is better).
+    """
+    store = open_mmap_store(path, collection)
+    embed = get_embedder(embedder)
+    hits = []
+    for row, score in store.search(embed([query]), k)[0]:
+        rec = store.record(row)
+        hits.append({"text": rec["text"], "metadata": rec["metadata"], "score": score})
+    return hits
@@ -0,0 +1,275 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ...utils import register_strategy, chunk_id, FFConfigError
+from ...utils.parallel import batched
+from ..embedding import EmbedderSpec, get_embedder
+from ._common import (
+    _as_matrix,
+    _chunk_metadata,
+    _normalize,
+    _topk,
+)
+
+METRICS = ("cosine", "dot")
+
+
+class NumpyIndex:
+    """
+    Exact in-process vector index: one contiguous float32 matrix plus parallel
+    id / text / metadata lists.
+
+    Rows are appended into an over-allocated buffer (amortised O(1) growth);
+    re-upserting an id overwrites its row in place. With metric="cosine"
+    vectors are normalised on insert, so every search is a single
+    matrix-vector product followed by an argpartition top-k.
+    """
+
+    def __init__(self, metric: str = "cosine") -> None:
+        if metric not in METRICS:
+            raise FFConfigError(f"metric must be one of {METRICS}, got {metric!r}")
+        self.metric = metric
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._buf: Optional[np.ndarray] = None
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, cid: object) -> bool:
+        return cid in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        if self._buf is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._buf[: len(self.ids)]
+
+    def _reserve(self, n_rows: int, dim: int) -> None:
+        buf = self._buf
+        if buf is not None and buf.shape[1] != dim:
+            raise FFConfigError(
+                f"Vector dimension {dim} does not match index dimension {buf.shape[1]}"
+            )
+        if buf is not None and buf.shape[0] >= n_rows and buf.flags.writeable:
+            return
+        cap = max(n_rows, 2 * (buf.shape[0] if buf is not None else 0), 64)
+        new = np.empty((cap, dim), dtype=np.float32)
+        if buf is not None:
+            new[: len(self.ids)] = buf[: len(self.ids)]  # also copies a loaded memmap
+        self._buf = new
+
+    def upsert(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        vectors: Any,
+    ) -> None:
+        vecs = _as_matrix(vectors)
+        if self.metric == "cosine":
+            vecs = _normalize(vecs)
+        with self._lock:
+            new_ids = [cid for cid in dict.fromkeys(ids) if cid not in self._rows]
+            self._reserve(len(self.ids) + len(new_ids), vecs.shape[1])
+            assert self._buf is not None
+            for cid, text, meta, vec in zip(ids, texts, metadatas, vecs):
+                row = self._rows.get(cid)
+                if row is None:
+                    row = len(self.ids)
+                    self._rows[cid] = row
+                    self.ids.append(cid)
+                    self.texts.append(text)
+                    self.metadatas.append(meta)
+                else:
+                    self.texts[row] = text
+                    self.metadatas[row] = meta
+                self._buf[row] = vec
+
+    def search(self, queries: Any, k: int) -> List[List[Tuple[int, float]]]:
+        """Top-k (row, score) per query; score is cosine similarity or dot product."""
+        q = _as_matrix(queries)
+        if self.metric == "cosine":
+            q = _normalize(q)
+        with self._lock:  # snapshot; the product itself runs unlocked
+            mat = self.vectors
+        if mat.shape[0] == 0:
+            return [[] for _ in range(q.shape[0])]
+        if q.shape[1] != mat.shape[1]:
+            raise FFConfigError(
+                f"Query dimension {q.shape[1]} does not match index dimension {mat.shape[1]}"
+            )
+        rows, scores = _topk(q @ mat.T, k)
+        return [
+            [(int(r), float(s)) for r, s in zip(rr, ss)] for rr, ss in zip(rows, scores)
+        ]
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Write `vectors.npy` and `records.json` (ids, texts, metadata) to `directory`."""
+        d = Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            records = {
+                "metric": self.metric,
+                "ids": self.ids,
+                "texts": self.texts,
+                "metadatas": self.metadatas,
+            }
+            tmp = d / "vectors.tmp.npy"
+            np.save(tmp, self.vectors)
+            os.replace(tmp, d / "vectors.npy")
+            tmp = d / "records.json.tmp"
+            tmp.write_text(json.dumps(records), encoding="utf-8")
+            os.replace(tmp, d / "records.json")
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> "NumpyIndex":
+        """
+        Load a saved index. With `mmap` (default) the vectors stay a read-only
+        memory map of `vectors.npy` until the next upsert copies them to RAM.
+        """
+        d = Path(directory)
+        records = json.loads((d / "records.json").read_text(encoding="utf-8"))
+        idx = cls(metric=records["metric"])
+        idx.ids = list(records["ids"])
+        idx.texts = list(records["texts"])
+        idx.metadatas = list(records["metadatas"])
+        idx._rows = {cid: i for i, cid in enumerate(idx.ids)}
+        if idx.ids:
+            idx._buf = np.load(d / "vectors.npy", mmap_mode="r" if mmap else None)
+        return idx
+
+
+# ---------- process-wide index registry ----------
+_INDEXES: Dict[Tuple[Optional[str], str], NumpyIndex] = {}
+_LOCK = Lock()
+
+
+def _index_dir(path: str, collection: str) -> Path:
+    return Path(path) / collection
+
+
+def get_numpy_index(
+    path: Optional[str] = None,
+    collection: str = "docs",
+    metric: Optional[str] = None,
+    create: bool = True,
+) -> NumpyIndex:
+    """
+    Return the index for (path, collection), creating it on first use.
+
+    Without `path` the index only lives in this process (scratch indexes,
+    tests). With `path` it is loaded from `<path>/<collection>/` if present
+    (vectors memory-mapped) and saved back there by `numpy_upsert`.
+    `metric` is used for a new index ("cosine" if None) and must match an
+    existing one. With `create=False` a missing index raises FFConfigError.
+    """
+    key = (str(Path(path).resolve()) if path is not None else None, collection)
+    with _LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None:
+            d = _index_dir(path, collection) if path is not None else None
+            if d is not None and (d / "records.json").exists():
+                idx = NumpyIndex.load(d)
+            elif create:
+                idx = NumpyIndex(metric=metric or "cosine")
+            else:
+                where = f"at {d}" if d is not None else "in memory"
+                raise FFConfigError(
+                    f"No numpy index for collection '{collection}' {where}"
+                )
+            _INDEXES[key] = idx
+    if metric is not None and metric != idx.metric:
+        raise FFConfigError(
+            f"Collection '{collection}' uses metric {idx.metric!r}, got {metric!r}"
+        )
+    return idx
+
+
+def drop_numpy_index(path: Optional[str] = None, collection: str = "docs") -> None:
+    """Forget a cached index (files on disk are left untouched)."""
+    key = (str(Path(path).resolve()) if path is not None else None, collection)
+    with _LOCK:
+        _INDEXES.pop(key, None)
+
+
+@register_strategy("indexing", "numpy_upsert")
+def numpy_upsert(
+    chunks: Iterable[Dict],
+    *,
+    path: Optional[str] = None,
+    collection: str = "docs",
+    embedder: EmbedderSpec = "hashing",
+    metric: Optional[str] = None,
+    batch_size: int = 256,
+    skip_existing: bool = True,
+) -> str:
+    """
+    Embed chunks and upsert them into a NumPy index (no database needed).
+
+    Ids and metadata follow `chroma_upsert` (content-addressed ids, scalar
+    chunk fields as metadata); with `skip_existing`, chunks already in the
+    index are not re-embedded. `embedder` is any `embedding` spec
+    (see `flowfoundry.functional.embedding.get_embedder`): "hashing[:<dim>]"
+    (offline, default), "sentence_transformer:<model>", a dict with options
+    and an optional "cache", or a callable; use the same one for
+    `numpy_query`. Chunks are embedded `batch_size` at a time.
+
+    `metric` ("cosine" or "dot") is fixed when the collection is created;
+    None keeps the existing one ("cosine" for a new collection).
+
+    With `path`, the index is persisted to `<path>/<collection>/` after the
+    upsert.
+    """
+    embed = get_embedder(embedder)
+    idx = get_numpy_index(path, collection, metric)
+    offset = 0
+    for batch in batched(chunks, batch_size):
+        ids = [chunk_id(c, offset + i) for i, c in enumerate(batch)]
+        offset += len(batch)
+        keep = [i for i, cid in enumerate(ids) if not (skip_existing and cid in idx)]
+        if not keep:
+            continue
+        texts = [str(batch[i]["text"]) for i in keep]
+        idx.upsert(
+            [ids[i] for i in keep],
+            texts,
+            [_chunk_metadata(batch[i]) for i in keep],
+            embed(texts),
+        )
+    if path is not None:
+        idx.save(_index_dir(path, collection))
+    return collection
+
+
+@register_strategy("indexing", "numpy_query")
+def numpy_query(
+    query: str,
+    *,
+    k: int = 5,
+    path: Optional[str] = None,
+    collection: str = "docs",
+    embedder: EmbedderSpec = "hashing",
+) -> List[Dict]:
+    """
+    Exact top-k search over a NumPy index.
+
+    Returns {"text", "metadata", "score"} hits, best first. Unlike Chroma's
+    distance, `score` is a similarity (cosine or dot product): higher is better.
+    Raises FFConfigError for a collection that was never upserted.
+    """
+    idx = get_numpy_index(path, collection, create=False)
+    embed = get_embedder(embedder)
+    return [
+        {"text": idx.texts[row], "metadata": idx.metadatas[row], "score": score}
+        for row, score in idx.search(embed([query]), k)[0]
+    ]
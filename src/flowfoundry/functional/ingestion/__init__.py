@@ -1,3 +1,11 @@
-from .pdf_loader import pdf_loader
+from .pdf_loader import pdf_loader, pdf_loader_iter, IngestStats
+from .pdf_pages import pdf_pages_iter
+from .manifest import IngestManifest
 
-__all__ = ["pdf_loader"]
+__all__ = [
+    "pdf_loader",
+    "pdf_loader_iter",
+    "pdf_pages_iter",
+    "IngestStats",
+    "IngestManifest",
+]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """Content hash of a file, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class FileEntry:
+    size: int
+    mtime: float
+    sha256: str
+    indexed: bool = False  # set once an upsert has recorded this file's chunks
+    chunk_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class IngestManifest:
+    """
+    Ingestion manifest persisted as JSON next to an index.
+
+    Tracks, per source file (resolved path): size, mtime, content hash and the
+    chunk ids an upsert produced from it. Ingestion uses `scan` to select only
+    new/modified files; ids belonging to modified or removed files are queued
+    in `stale_ids` until the indexing step deletes them.
+    """
+
+    path: Path
+    files: Dict[str, FileEntry] = field(default_factory=dict)
+    stale_ids: List[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "IngestManifest":
+        p = Path(path)
+        if not p.exists():
+            return cls(path=p)
+        raw = json.loads(p.read_text(encoding="utf-8"))
+        files = {k: FileEntry(**v) for k, v in raw.get("files", {}).items()}
+        return cls(path=p, files=files, stale_ids=list(raw.get("stale_ids", [])))
+
+    def save(self) -> None:
+        """Write atomically (temp file + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": {k: asdict(v) for k, v in sorted(self.files.items())},
+            "stale_ids": self.stale_ids,
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def scan(self, root: Union[str, Path], files: Iterable[Path]) -> List[Path]:
+        """
+        Compare `files` (everything currently under `root`) with the manifest.
+
+        Returns the files that need (re-)ingestion: new ones, ones whose content
+        hash changed, and ones never confirmed by an upsert. Size+mtime matches
+        skip hashing entirely. Entries under `root` that no longer exist are
+        dropped and their chunk ids queued for deletion.
+        """
+        root_key = str(Path(root).resolve())
+        todo: List[Path] = []
+        seen = set()
+        for f in files:
+            key = str(f.resolve())
+            seen.add(key)
+            st = f.stat()
+            entry = self.files.get(key)
+            if entry is not None and entry.indexed:
+                if entry.size == st.st_size and entry.mtime == st.st_mtime:
+                    continue
+                digest = file_sha256(f)
+                if digest == entry.sha256:
+                    entry.size, entry.mtime = st.st_size, st.st_mtime
+                    continue
+            else:
+                digest = file_sha256(f)
+            if entry is not None:
+                self.stale_ids.extend(entry.chunk_ids)
+            self.files[key] = FileEntry(
+                size=st.st_size, mtime=st.st_mtime, sha256=digest
+            )
+            todo.append(f)
+
+        for key in list(self.files):
+            under_root = key == root_key or key.startswith(root_key + os.sep)
+            if under_root and key not in seen:
+                self.stale_ids.extend(self.files.pop(key).chunk_ids)
+        return todo
+
+    def forget(self, source: Union[str, Path]) -> None:
+        """Drop a file's entry so the next scan treats it as new (e.g. it failed to load)."""
+        self.files.pop(str(Path(source).resolve()), None)
+
+    def record(self, ids_by_source: Dict[str, List[str]]) -> None:
+        """
+        Record the chunk ids produced for each source by an upsert and mark every
+        pending file as indexed (files that yielded no chunks included).
+        """
+        for source, ids in ids_by_source.items():
+            entry = self.files.get(source)
+            if entry is not None:
+                entry.chunk_ids = list(dict.fromkeys([*entry.chunk_ids, *ids]))
+        for entry in self.files.values():
+            entry.indexed = True
+        self.stale_ids = []
@@ -1,21 +1,37 @@
 from __future__ import annotations
 
+import logging
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-from ...utils import register_strategy, FFIngestionError
+from ...utils import register_strategy, FFIngestionError, FFConfigError
+from ...utils.parallel import imap_ordered
+from .manifest import IngestManifest
 
 from langchain_community.document_loaders import PyPDFLoader
 
+logger = logging.getLogger(__name__)
 
-@register_strategy("ingestion", "pdf_loader")
-def pdf_loader(path: Union[str, Path]) -> List[Dict]:
-    """
-    Extract text from one or many PDF files into structured dictionaries.
 
-    Raises:
-        FFIngestionError: If the path is invalid, not a PDF, or no PDFs found.
-    """
+@dataclass
+class IngestStats:
+    """Counters filled in while an ingestion generator runs."""
+
+    files: int = 0
+    pages: int = 0
+    skipped: int = 0  # unchanged files skipped via a manifest
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (file, error)
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_sec(self) -> float:
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _resolve_pdfs(path: Union[str, Path]) -> List[Path]:
+    """Expand a file or directory into the list of PDFs to load."""
     path = Path(path)
 
     if not path.exists():
@@ -26,27 +42,142 @@ def pdf_loader(path: Union[str, Path]) -> List[Dict]:
             raise FFIngestionError(f"❌ File is not a PDF: {path}")
         pdf_files = [path]
     elif path.is_dir():
-        pdf_files = list(path.rglob("*.pdf"))
+        pdf_files = sorted(path.rglob("*.pdf"))
     else:
         raise FFIngestionError(f"❌ Path is neither a file nor directory: {path}")
 
     if not pdf_files:
         raise FFIngestionError(f"❌ No PDF files found under {path}")
+    return pdf_files
+
+
+def _load_pdf(pdf: Path) -> Tuple[str, List[Dict], Optional[str]]:
+    """
+    Load every page of one PDF. Runs in pool workers, so errors are returned
+    as a string instead of raised.
+    """
+    try:
+        pages = PyPDFLoader(str(pdf)).load()
+        source = str(pdf.resolve())
+        docs = [
+            {"source": source, "page": i, "text": page.page_content.strip()}
+            for i, page in enumerate(pages, start=1)
+        ]
+        return str(pdf), docs, None
+    except Exception as e:
+        return str(pdf), [], str(e)
+
+
+def _iter_pages(
+    pdf_files: List[Path],
+    workers: int,
+    on_error: str,
+    st: IngestStats,
+    manifest: Optional[IngestManifest] = None,
+) -> Iterator[Dict]:
+    t0 = time.perf_counter()
+    if workers > 1:
+        results = imap_ordered(_load_pdf, pdf_files, workers=workers)
+    else:
+        results = map(_load_pdf, pdf_files)
+
+    try:
+        for pdf, docs, err in results:
+            if err is not None:
+                if on_error == "raise":
+                    raise FFIngestionError(f"❌ Failed to load {pdf}: {err}")
+                logger.warning("Skipping %s: %s", pdf, err)
+                st.failed.append((pdf, err))
+                if manifest is not None:
+                    manifest.forget(pdf)  # retry on the next run
+                continue
+            st.files += 1
+            st.pages += len(docs)
+            st.elapsed = time.perf_counter() - t0
+            yield from docs
+    finally:
+        st.elapsed = time.perf_counter() - t0
+        if manifest is not None and st.failed:
+            manifest.save()
+        logger.info(
+            "Ingested %d pages from %d PDFs in %.2fs (%.1f pages/s), "
+            "%d failed, %d unchanged",
+            st.pages,
+            st.files,
+            st.elapsed,
+            st.pages_per_sec,
+            len(st.failed),
+            st.skipped,
+        )
+
 
-    all_docs: List[Dict] = []
-    for pdf in pdf_files:
-        try:
-            loader = PyPDFLoader(str(pdf))
-            pages = loader.load()
-            for i, page in enumerate(pages, start=1):
-                all_docs.append(
-                    {
-                        "source": str(pdf.resolve()),
-                        "page": i,
-                        "text": page.page_content.strip(),
-                    }
-                )
-        except Exception as e:
-            raise FFIngestionError(f"❌ Failed to load {pdf}: {e}") from e
-
-    return all_docs
+@register_strategy("ingestion", "pdf_loader_iter")
+def pdf_loader_iter(
+    path: Union[str, Path],
+    *,
+    workers: int = 1,
+    on_error: str = "raise",
+    stats: Optional[IngestStats] = None,
+    manifest: Optional[Union[str, Path]] = None,
+) -> Iterator[Dict]:
+    """
+    Stream pages ({"source", "page", "text"}) from one or many PDF files.
+
+    Files are yielded in sorted path order, each as soon as it has been
+    extracted. With workers > 1, files are extracted in a process pool (at
+    most 2 * workers files in flight).
+
+    on_error:
+      - "raise"   (default) stop at the first file that fails to load
+      - "collect" skip failing files, recording (file, error) in `stats.failed`
+
+    Pass an `IngestStats` to read files/pages/failures and pages_per_sec
+    after (or while) the generator runs; a summary is also logged.
+
+    With `manifest` (a JSON path, typically inside the index directory), only
+    new or modified files are loaded; unchanged ones are skipped and chunks of
+    modified/removed files are queued for deletion. Pass the same manifest to
+    the indexing step (e.g. `chroma_upsert(..., manifest=...)`), which deletes
+    the stale chunks and records the new chunk ids per file.
+
+    Raises:
+        FFIngestionError: If the path is invalid, not a PDF, or no PDFs found
+        (immediately), or, with on_error="raise", when a file fails to load.
+    """
+    if on_error not in ("raise", "collect"):
+        raise FFConfigError(f"on_error must be 'raise' or 'collect', got {on_error!r}")
+    pdf_files = _resolve_pdfs(path)
+    st = stats if stats is not None else IngestStats()
+    m = None
+    if manifest is not None:
+        m = IngestManifest.load(manifest)
+        todo = m.scan(path, pdf_files)
+        m.save()
+        st.skipped = len(pdf_files) - len(todo)
+        pdf_files = todo
+    return _iter_pages(pdf_files, workers, on_error, st, m)
+
+
+@register_strategy("ingestion", "pdf_loader")
+def pdf_loader(
+    path: Union[str, Path],
+    *,
+    workers: int = 1,
+    on_error: str = "raise",
+    stats: Optional[IngestStats] = None,
+    manifest: Optional[Union[str, Path]] = None,
+) -> List[Dict]:
+    """
+    Extract text from one or many PDF files into structured dictionaries.
+
+    See `pdf_loader_iter` for `workers`, `on_error`, `stats` and `manifest`;
+    this returns the same pages as a list.
+
+    Raises:
+        FFIngestionError: If the path is invalid, not a PDF, or no PDFs found.
+    """
+    return list(
+        pdf_loader_iter(
+            path, workers=workers, on_error=on_error, stats=stats, manifest=manifest
+        )
+    )
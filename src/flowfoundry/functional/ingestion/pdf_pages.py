@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple, Union, cast
+
+from ...utils import register_strategy, FFIngestionError, FFConfigError
+from .pdf_loader import IngestStats, _resolve_pdfs
+
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+
+def _page_bounds(
+    n_pages: int, start_page: int, end_page: Optional[int]
+) -> Tuple[int, int]:
+    """1-based inclusive [start_page, end_page] -> 0-based [lo, hi) clipped to the file."""
+    hi = n_pages if end_page is None else min(end_page, n_pages)
+    return start_page - 1, hi
+
+
+def _iter_pdf_pages(
+    pdf: Path, start_page: int, end_page: Optional[int], st: IngestStats
+) -> Iterator[Dict]:
+    """
+    Yield the pages of one PDF, extracting each only when requested.
+
+    The file is memory-mapped (the OS pages it in on demand) and objects the
+    reader resolves while extracting a page are evicted afterwards, so memory
+    stays proportional to one page rather than to the whole document.
+    """
+    source = str(pdf.resolve())
+    with open(pdf, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        reader = PdfReader(cast(BinaryIO, mm))
+        lo, hi = _page_bounds(len(reader.pages), start_page, end_page)
+        keep = set(reader.resolved_objects)  # page tree, catalog, ...
+        for i in range(lo, hi):
+            text = reader.pages[i].extract_text()
+            for key in set(reader.resolved_objects) - keep:
+                del reader.resolved_objects[key]
+            st.pages += 1
+            yield {"source": source, "page": i + 1, "text": text.strip()}
+        st.files += 1
+
+
+def _iter_pages(
+    path: Union[str, Path],
+    start_page: int,
+    end_page: Optional[int],
+    on_error: str,
+    st: IngestStats,
+) -> Iterator[Dict]:
+    t0 = time.perf_counter()
+    try:
+        for pdf in _resolve_pdfs(path):
+            try:
+                for page in _iter_pdf_pages(pdf, start_page, end_page, st):
+                    st.elapsed = time.perf_counter() - t0
+                    yield page
+            except FFIngestionError:
+                raise
+            except Exception as e:
+                if on_error == "raise":
+                    raise FFIngestionError(f"❌ Failed to load {pdf}: {e}") from e
+                logger.warning("Skipping rest of %s: %s", pdf, e)
+                st.failed.append((str(pdf), str(e)))
+    finally:
+        st.elapsed = time.perf_counter() - t0
+        logger.info(
+            "Extracted %d pages from %d PDFs in %.2fs (%.1f pages/s), %d failed",
+            st.pages,
+            st.files,
+            st.elapsed,
+            st.pages_per_sec,
+            len(st.failed),
+        )
+
+
+@register_strategy("ingestion", "pdf_pages_iter")
+def pdf_pages_iter(
+    path: Union[str, Path],
+    *,
+    start_page: int = 1,
+    end_page: Optional[int] = None,
+    on_error: str = "raise",
+    stats: Optional[IngestStats] = None,
+) -> Iterator[Dict]:
+    """
+    Lazily stream pages ({"source", "page", "text"}) from one or many PDF files.
+
+    Unlike `pdf_loader`, nothing is extracted up front: each page is read from
+    a memory-mapped file only when the consumer asks for it, so chunking can
+    start on the first page of a 3,000-page document and memory stays flat.
+
+    `start_page` / `end_page` (1-based, inclusive) limit extraction to a page
+    range of every file; pages outside it are never parsed. `page` in the
+    output is always the page number within the original file.
+
+    on_error:
+      - "raise"   (default) stop at the first file that fails to load
+      - "collect" skip (the rest of) failing files, recording (file, error)
+                  in `stats.failed`
+
+    Raises:
+        FFConfigError: If the page range or on_error is invalid (immediately).
+        FFIngestionError: If the path is invalid, not a PDF, or no PDFs found
+        (immediately), or, with on_error="raise", when a file fails to load.
+    """
+    if on_error not in ("raise", "collect"):
+        raise FFConfigError(f"on_error must be 'raise' or 'collect', got {on_error!r}")
+    if start_page < 1 or (end_page is not None and end_page < start_page):
+        raise FFConfigError(
+            f"Invalid page range start_page={start_page}, end_page={end_page}"
+        )
+    _resolve_pdfs(path)  # fail fast on bad paths
+    st = stats if stats is not None else IngestStats()
+    return _iter_pages(path, start_page, end_page, on_error, st)
@@ -1,5 +1,28 @@
 from .identity import identity
-from .cross_encoder import cross_encoder
-from .bm25 import bm25_preselect
+from .cross_encoder import (
+    cross_encoder,
+    cross_encoder_batch,
+    get_cross_encoder_cached,
+    preload_cross_encoders,
+    clear_cross_encoder_cache,
+    set_cross_encoder_cache_size,
+)
+from .bm25 import bm25_preselect, bm25_scores
+from .fusion import fusion
+from .score_cache import ScoreCache, get_score_cache, close_score_caches
 
-__all__ = ["identity", "cross_encoder", "bm25_preselect"]
+__all__ = [
+    "identity",
+    "cross_encoder",
+    "cross_encoder_batch",
+    "get_cross_encoder_cached",
+    "preload_cross_encoders",
+    "clear_cross_encoder_cache",
+    "set_cross_encoder_cache_size",
+    "bm25_preselect",
+    "bm25_scores",
+    "fusion",
+    "ScoreCache",
+    "get_score_cache",
+    "close_score_caches",
+]
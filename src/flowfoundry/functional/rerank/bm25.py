@@ -1,25 +1,158 @@
 from __future__ import annotations
-from typing import List, Dict, Tuple, Any, Optional
+import hashlib
+from collections import Counter
+from typing import List, Dict, Tuple
+
+import numpy as np
+
 from ...utils import register_strategy
+from ...utils.tokenize import tokenize
+from ..indexing._common import _topk
+from .score_cache import score_with_cache
+
+
+# bytes that `tokenize` treats as word characters, for ASCII text
+_WORD_BYTE = np.zeros(256, dtype=bool)
+for _c in b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_":
+    _WORD_BYTE[_c] = True
+
+
+def _tf_ascii(texts: List[str], terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Term frequencies of `terms` and token counts for ASCII texts, without
+    materialising tokens: the texts are joined into one byte array, token
+    boundaries found from the word-byte mask, and each query term matched by
+    comparing bytes at the starts of same-length tokens.
+    Equivalent to counting `tokenize(text)` per text.
+    """
+    n = len(texts)
+    buf = np.frombuffer("\n".join(texts).lower().encode("ascii"), dtype=np.uint8)
+    word = np.zeros(len(buf) + 2, dtype=bool)
+    word[1:-1] = _WORD_BYTE[buf]
+    starts = np.flatnonzero(word[1:-1] & ~word[:-2])
+    tok_len = np.flatnonzero(word[1:-1] & ~word[2:]) + 1 - starts
+    lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=n)
+    text_starts = np.cumsum(lengths) - lengths
+    doc = np.searchsorted(text_starts, starts, side="right") - 1
+    doc_len = np.bincount(doc, minlength=n).astype(np.float32)
+    tf = np.zeros((n, len(terms)), dtype=np.float32)
+    for j, term in enumerate(terms):
+        if not term.isascii():
+            continue
+        tb = np.frombuffer(term.encode("ascii"), dtype=np.uint8)
+        cand = np.flatnonzero(tok_len == len(tb))
+        cand = cand[buf[starts[cand]] == tb[0]]
+        if len(tb) > 1:
+            rest = buf[starts[cand][:, None] + np.arange(1, len(tb))]
+            cand = cand[(rest == tb[1:]).all(axis=1)]
+        tf[:, j] = np.bincount(doc[cand], minlength=n)
+    return tf, doc_len
+
 
-BM25Okapi: Optional[Any]
-try:
-    from rank_bm25 import BM25Okapi as _BM25Okapi
+def _tf_tokens(
+    texts: List[str], terms: List[str], stem: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Same as `_tf_ascii` for any text, by tokenizing (and stemming) each one."""
+    tf = np.zeros((len(texts), len(terms)), dtype=np.float32)
+    doc_len = np.empty(len(texts), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text, stem=stem)
+        doc_len[row] = len(tokens)
+        counts = Counter(tokens)
+        tf[row] = [counts.get(t, 0) for t in terms]
+    return tf, doc_len
 
-    BM25Okapi = _BM25Okapi
-except Exception:
-    BM25Okapi = None
+
+def bm25_scores(
+    query: str,
+    texts: List[str],
+    *,
+    k1: float = 1.5,
+    b: float = 0.75,
+    stem: bool = False,
+) -> np.ndarray:
+    """
+    Okapi BM25 score of each text for `query`, treating `texts` as the corpus.
+
+    Only query terms can contribute, so term frequencies are collected into
+    a (len(texts), query terms) matrix, the sparse projection of the full
+    term-document matrix; IDF, length normalisation and the sum over terms
+    are then single array expressions. IDF is log(1 + (N - df + .5) / (df + .5)),
+    as in the BM25 index, so scores are never negative. ASCII texts are
+    counted in one vectorised pass (`_tf_ascii`); others, and `stem=True`,
+    go through `tokenize`.
+    """
+    n = len(texts)
+    terms = list(dict.fromkeys(tokenize(query, stem=stem)))
+    if n == 0 or not terms:
+        return np.zeros(n, dtype=np.float32)
+    tf = np.zeros((n, len(terms)), dtype=np.float32)
+    doc_len = np.zeros(n, dtype=np.float32)
+    if stem:
+        fast = np.zeros(n, dtype=bool)
+    elif all(t.isascii() for t in texts):
+        fast = np.ones(n, dtype=bool)
+    else:
+        fast = np.fromiter((t.isascii() for t in texts), dtype=bool, count=n)
+    rows = np.flatnonzero(fast)
+    if rows.size:
+        tf[rows], doc_len[rows] = _tf_ascii([texts[i] for i in rows], terms)
+    rows = np.flatnonzero(~fast)
+    if rows.size:
+        tf[rows], doc_len[rows] = _tf_tokens([texts[i] for i in rows], terms, stem)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+    avgdl = max(float(doc_len.mean()), 1e-9)
+    norm = (k1 * (1.0 - b + b * doc_len / avgdl))[:, None]
+    scores: np.ndarray = (tf * (k1 + 1.0) / (tf + norm)) @ idf
+    return scores
+
+
+def _corpus_key(corpus: List[str], k1: float, b: float, stem: bool) -> str:
+    """BM25 scores depend on every candidate (IDF, average length), so the
+    cache "model" is the scoring options plus the candidate set itself."""
+    h = hashlib.sha256(f"{k1}:{b}:{stem}".encode("utf-8"))
+    for digest in sorted(hashlib.sha256(c.encode("utf-8")).digest() for c in corpus):
+        h.update(digest)
+    return f"bm25:{h.hexdigest()}"
 
 
 @register_strategy("rerank", "bm25_preselect")
-def bm25_preselect(query: str, hits: List[Dict], top_k: int = 20) -> List[Dict]:
-    if BM25Okapi is None:
-        return hits[:top_k]
+def bm25_preselect(
+    query: str,
+    hits: List[Dict],
+    top_k: int = 20,
+    *,
+    score_cache: str | None = None,
+    k1: float = 1.5,
+    b: float = 0.75,
+    stem: bool = False,
+) -> List[Dict]:
+    """
+    Keep the `top_k` hits by BM25 score of their text against `query`
+    (best first; `bm25_scores`, no extra dependency). `stem` applies the
+    Porter stemmer to query and texts. `score_cache` ("memory" or a SQLite
+    path) reuses the scores of a repeated query over the same candidates.
+    """
+    if not hits:
+        return []
     corpus = [h.get("text", "") for h in hits]
-    tokenized = [c.split() for c in corpus]
-    bm25 = BM25Okapi(tokenized)
-    scores = bm25.get_scores(query.split())
-    paired: List[Tuple[int, float]] = list(enumerate(scores))
-    paired.sort(key=lambda x: x[1], reverse=True)
-    idxs = [i for i, _ in paired[:top_k]]
-    return [hits[i] for i in idxs]
+    if score_cache is None:
+        scores = bm25_scores(query, corpus, k1=k1, b=b, stem=stem)
+    else:
+
+        def score(idx: List[int]) -> List[float]:
+            all_scores = bm25_scores(query, corpus, k1=k1, b=b, stem=stem)
+            return [float(all_scores[i]) for i in idx]
+
+        scores = np.asarray(
+            score_with_cache(
+                score_cache,
+                _corpus_key(corpus, k1, b, stem),
+                [(query, c) for c in corpus],
+                score,
+            ),
+            dtype=np.float32,
+        )
+    idxs, _ = _topk(scores[None, :], top_k)
+    return [hits[i] for i in idxs[0]]
@@ -1,6 +1,9 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
-from ...utils import register_strategy
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from ...utils import register_strategy, FFConfigError, FFDependencyError
+from .score_cache import score_with_cache
 
 # Optional dependency with graceful fallback
 CrossEncoder: Optional[Any]
@@ -12,6 +15,112 @@ except Exception:
     CrossEncoder = None
 
 
+# ---------- process-wide model cache (LRU) ----------
+_ModelKey = Tuple[str, Optional[str]]
+_MODELS: "OrderedDict[_ModelKey, Any]" = OrderedDict()
+_LOADING: Dict[_ModelKey, Lock] = {}
+_LOCK = Lock()
+_MAX_MODELS = 4
+
+
+def set_cross_encoder_cache_size(max_models: int) -> None:
+    """Keep at most `max_models` cross-encoders loaded (least recently used evicted)."""
+    global _MAX_MODELS
+    if max_models < 1:
+        raise FFConfigError("max_models must be >= 1")
+    with _LOCK:
+        _MAX_MODELS = max_models
+        while len(_MODELS) > _MAX_MODELS:
+            _MODELS.popitem(last=False)
+
+
+def get_cross_encoder_cached(model: str, device: Optional[str] = None) -> Any:
+    """
+    Return a cached CrossEncoder for (model, device), loading it on first use.
+
+    Thread safe: concurrent first calls for the same model load it once,
+    while other cached models stay available. When more than the configured
+    number of models are loaded, the least recently used one is dropped.
+    """
+    if CrossEncoder is None:
+        raise FFDependencyError(
+            "Install with `pip install flowfoundry[rerank]` for cross-encoder reranking"
+        )
+    key = (model, device)
+    with _LOCK:
+        inst = _MODELS.get(key)
+        if inst is not None:
+            _MODELS.move_to_end(key)
+            return inst
+        loading = _LOADING.setdefault(key, Lock())
+    with loading:  # weights load outside the global lock
+        try:
+            with _LOCK:
+                inst = _MODELS.get(key)
+            if inst is None:
+                inst = CrossEncoder(model, device=device)
+            with _LOCK:
+                _MODELS[key] = inst
+                _MODELS.move_to_end(key)
+                while len(_MODELS) > _MAX_MODELS:
+                    _MODELS.popitem(last=False)
+            return inst
+        finally:  # also when loading fails; waiters then retry the load
+            with _LOCK:
+                if _LOADING.get(key) is loading:
+                    del _LOADING[key]
+
+
+def preload_cross_encoders(models: Iterable[str], device: Optional[str] = None) -> None:
+    """Warm the cache at startup so the first rerank call pays inference only."""
+    for model in models:
+        get_cross_encoder_cached(model, device)
+
+
+def clear_cross_encoder_cache() -> None:
+    with _LOCK:
+        _MODELS.clear()
+
+
+def _score_pairs(ce: Any, pairs: List[Tuple[str, str]], batch_size: int) -> List[float]:
+    """
+    Score (query, passage) pairs, feeding the model in length-sorted order
+    so each batch holds similar-length pairs and little padding; scores are
+    returned in input order.
+    """
+    if not pairs:
+        return []
+    order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][0]) + len(pairs[i][1]))
+    scores = ce.predict(
+        [pairs[i] for i in order], batch_size=batch_size, show_progress_bar=False
+    )
+    out = [0.0] * len(pairs)
+    for i, s in zip(order, scores):
+        out[i] = float(s)
+    return out
+
+
+def _cached_scores(
+    ce: Any,
+    model: str,
+    pairs: List[Tuple[str, str]],
+    batch_size: int,
+    score_cache: Optional[str],
+) -> List[float]:
+    return score_with_cache(
+        score_cache,
+        f"cross_encoder:{model}",
+        pairs,
+        lambda idx: _score_pairs(ce, [pairs[i] for i in idx], batch_size),
+    )
+
+
+def _rank(hits: List[Dict], scores: List[float], top_k: Optional[int]) -> List[Dict]:
+    reranked = [dict(h, score=s) for h, s in zip(hits, scores)]
+    reranked.sort(key=lambda x: x.get("score", 0.0), reverse=True)
+    return reranked[:top_k] if top_k else reranked
+
+
 @register_strategy("rerank", "cross_encoder")
 def cross_encoder(
     query: str,
@@ -19,20 +128,65 @@ def cross_encoder(
     *,
     model: str,
     top_k: int | None = None,
+    device: Optional[str] = None,
+    batch_size: int = 32,
+    candidates: int | None = None,
+    score_cache: Optional[str] = None,
 ) -> List[Dict]:
     """
     Contract: (query, hits, **kwargs) -> hits
     kwargs:
       - model: sentence-transformers cross-encoder name
       - top_k: keep top_k results after scoring
+      - device: "cpu", "cuda", ... (None = library default)
+      - batch_size: pairs per forward pass
+      - candidates: only score the first `candidates` hits (the rest are dropped)
+      - score_cache: "memory" or a SQLite path to reuse scores of (query,
+        passage) pairs seen before (see `get_score_cache`); None disables it
+    The model is loaded once per process (see `get_cross_encoder_cached`).
     """
     if CrossEncoder is None:
         # Dependency missing -> no-op, preserve pipeline
         return hits
 
-    ce = CrossEncoder(model)
+    ce = get_cross_encoder_cached(model, device)
+    hits = hits[:candidates] if candidates else hits
     pairs = [(query, h.get("text", "")) for h in hits]
-    scores = ce.predict(pairs)
-    reranked = [dict(h, score=float(s)) for h, s in zip(hits, scores)]
-    reranked.sort(key=lambda x: x.get("score", 0.0), reverse=True)
-    return reranked[:top_k] if top_k else reranked
+    return _rank(hits, _cached_scores(ce, model, pairs, batch_size, score_cache), top_k)
+
+
+@register_strategy("rerank", "cross_encoder_batch")
+def cross_encoder_batch(
+    queries: List[str],
+    hits: List[List[Dict]],
+    *,
+    model: str,
+    top_k: int | None = None,
+    device: Optional[str] = None,
+    batch_size: int = 32,
+    candidates: int | None = None,
+    score_cache: Optional[str] = None,
+) -> List[List[Dict]]:
+    """
+    Rerank many (query, hits) lists with one cross-encoder pass.
+
+    Pairs from all queries are pooled, sorted by length and scored
+    `batch_size` at a time, so batches are full and padded little even when
+    each query only has a few hits. Returns one reranked list per query, in
+    order; kwargs as for `cross_encoder`.
+    """
+    if len(queries) != len(hits):
+        raise FFConfigError(f"Got {len(queries)} queries but {len(hits)} hit lists")
+    if CrossEncoder is None:
+        return [list(h) for h in hits]
+
+    ce = get_cross_encoder_cached(model, device)
+    lists = [h[:candidates] if candidates else h for h in hits]
+    pairs = [(q, h.get("text", "")) for q, hs in zip(queries, lists) for h in hs]
+    scores = _cached_scores(ce, model, pairs, batch_size, score_cache)
+    out: List[List[Dict]] = []
+    start = 0
+    for hs in lists:
+        out.append(_rank(hs, scores[start : start + len(hs)], top_k))
+        start += len(hs)
+    return out
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ...utils import register_strategy, hit_id, FFConfigError
+from ..indexing._common import _topk
+
+_METHODS = ("rrf", "weighted")
+
+
+def _list_scores(hits: List[Dict], method: str, k: int) -> np.ndarray:
+    """
+    Per-hit contribution of one best-first list, in [0, 1] for "weighted".
+
+    RRF uses 1 / (k + rank). The weighted sum min-max normalises the hits'
+    "score"s; a list whose scores grow down the list holds distances (e.g.
+    Chroma), so it is flipped. Hits without scores fall back to rank.
+    """
+    n = len(hits)
+    ranks = np.arange(1, n + 1, dtype=np.float64)
+    if method == "rrf":
+        return 1.0 / (k + ranks)
+    raw = [h.get("score") for h in hits]
+    if any(s is None for s in raw):
+        return 1.0 - (ranks - 1) / n
+    scores = np.asarray(raw, dtype=np.float64)
+    if scores[0] < scores[-1]:
+        scores = -scores
+    lo, hi = scores.min(), scores.max()
+    return (scores - lo) / (hi - lo) if hi > lo else np.ones(n)
+
+
+@register_strategy("rerank", "fusion")
+def fusion(
+    query: str,
+    hits: List[Dict],
+    *,
+    lists: Optional[Sequence[List[Dict]]] = None,
+    method: str = "rrf",
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60,
+    top_k: int | None = None,
+) -> List[Dict]:
+    """
+    Fuse several best-first hit lists into one ranking.
+
+    kwargs:
+      - lists: further hit lists fused with `hits` (e.g. BM25 or
+        cross-encoder results next to vector hits)
+      - method: "rrf" (reciprocal rank, sum of 1 / (k + rank)) or
+        "weighted" (sum of per-list min-max normalised scores)
+      - weights: one per list, `hits` first (default all 1.0)
+      - k: RRF damping constant
+      - top_k: keep the best top_k fused hits
+    Hits are matched across lists by `hit_id`; the first occurrence's text
+    and metadata are kept and `score` is the fused score (higher is better).
+    Contributions go into one (lists, distinct hits) matrix, so fusion is a
+    single weighted sum plus a top-k selection.
+    """
+    if method not in _METHODS:
+        raise FFConfigError(f"Unknown fusion method '{method}' (expected {_METHODS})")
+    all_lists = [hits, *(lists or [])]
+    w = np.ones(len(all_lists)) if weights is None else np.asarray(weights, float)
+    if w.shape != (len(all_lists),):
+        raise FFConfigError(
+            f"Got {len(w)} weights for {len(all_lists)} hit lists (hits + lists)"
+        )
+
+    first: Dict[str, int] = {}
+    unique: List[Dict] = []
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, hs in enumerate(all_lists):
+        for h in hs:
+            col = first.setdefault(hit_id(h), len(unique))
+            if col == len(unique):
+                unique.append(h)
+            rows.append(row)
+            cols.append(col)
+    if not unique:
+        return []
+
+    contrib = np.concatenate([_list_scores(hs, method, k) for hs in all_lists if hs])
+    matrix = np.zeros((len(all_lists), len(unique)))
+    # a hit repeated within one list counts once, at its best position
+    np.maximum.at(matrix, (np.asarray(rows), np.asarray(cols)), contrib)
+    fused = w @ matrix
+    idxs, scores = _topk(fused[None, :], top_k or len(unique))
+    return [dict(unique[i], score=float(s)) for i, s in zip(idxs[0], scores[0])]
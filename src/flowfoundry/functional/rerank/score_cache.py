@@ -0,0 +1,179 @@
+from __future__ import annotations
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ...utils.tokenize import tokenize
+
+MEMORY = "memory"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    key   BLOB PRIMARY KEY,
+    score REAL NOT NULL
+) WITHOUT ROWID
+"""
+_SQL_VARS = 500
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case, drop punctuation, collapse whitespace ("People's  budget?" == "people s budget")."""
+    return " ".join(tokenize(query))
+
+
+class ScoreCache:
+    """
+    Cache of rerank scores keyed by (model, normalized query, passage hash).
+
+    An in-memory LRU tier of `max_entries` scores sits in front of an
+    optional SQLite file (`path`), which survives restarts and can be
+    shared by several processes. Counters track memory hits, disk hits and
+    misses per pair looked up.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100_000) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._mem: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    @staticmethod
+    def key(model: str, query: str, passage: str) -> bytes:
+        h = hashlib.sha256(model.encode("utf-8"))
+        h.update(b"\0")
+        h.update(normalize_query(query).encode("utf-8"))
+        h.update(b"\0")
+        h.update(hashlib.sha256(passage.encode("utf-8")).digest())
+        return h.digest()
+
+    def _remember(self, key: bytes, score: float) -> None:
+        self._mem[key] = score
+        self._mem.move_to_end(key)
+        if len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, float]:
+        found: Dict[bytes, float] = {}
+        with self._lock:
+            rest = []
+            for key in keys:
+                score = self._mem.get(key)
+                if score is None:
+                    rest.append(key)
+                else:
+                    self._mem.move_to_end(key)
+                    found[key] = score
+            self.memory_hits += len(keys) - len(rest)
+            if self._conn is not None and rest:
+                for i in range(0, len(rest), _SQL_VARS):
+                    part = rest[i : i + _SQL_VARS]
+                    rows = self._conn.execute(
+                        "SELECT key, score FROM scores WHERE key IN (%s)"
+                        % ",".join("?" * len(part)),
+                        part,
+                    )
+                    for key, score in rows:
+                        found[bytes(key)] = float(score)
+                        self._remember(bytes(key), float(score))
+                        self.disk_hits += 1
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, float]]) -> None:
+        rows = [(key, float(score)) for key, score in items]
+        with self._lock:
+            for key, score in rows:
+                self._remember(key, score)
+            if self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO scores (key, score) VALUES (?, ?)", rows
+                )
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+                "memory_entries": len(self._mem),
+            }
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier (the SQLite file is kept) and reset counters."""
+        with self._lock:
+            self._mem.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_CACHES: Dict[str, ScoreCache] = {}
+_LOCK = Lock()
+
+
+def get_score_cache(spec: str = MEMORY) -> ScoreCache:
+    """
+    Process-wide score cache for `spec`: "memory" (LRU only) or the path of
+    a SQLite file (LRU in front of the file).
+    """
+    key = spec if spec == MEMORY else str(Path(spec).resolve())
+    with _LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = ScoreCache(None if spec == MEMORY else spec)
+            _CACHES[key] = cache
+        return cache
+
+
+def close_score_caches() -> None:
+    with _LOCK:
+        for cache in _CACHES.values():
+            cache.close()
+        _CACHES.clear()
+
+
+def score_with_cache(
+    spec: Optional[str],
+    model: str,
+    pairs: List[Tuple[str, str]],
+    score_fn: Callable[[List[int]], List[float]],
+) -> List[float]:
+    """
+    Scores for (query, passage) `pairs`. Cached scores are reused;
+    `score_fn(indices)` computes the rest (each distinct pair once) and its
+    results are stored. With `spec=None` there is no cache.
+    """
+    if spec is None:
+        return score_fn(list(range(len(pairs))))
+    cache = get_score_cache(spec)
+    keys = [ScoreCache.key(model, q, p) for q, p in pairs]
+    found = cache.get_many(list(dict.fromkeys(keys)))
+    missing: Dict[bytes, int] = {}
+    for i, key in enumerate(keys):
+        if key not in found:
+            missing.setdefault(key, i)
+    if missing:
+        fresh = list(zip(missing, score_fn(list(missing.values()))))
+        cache.put_many(fresh)
+        found.update(fresh)
+    return [found[k] for k in keys]
@@ -17,10 +17,15 @@ from .exceptions import (
 from .functional_contracts import (
     STRATEGY_CONTRACT_VERSION,
     IngestionFn,
+    IngestionIterFn,
     ChunkingFn,
+    ChunkingIterFn,
+    EmbeddingFn,
     IndexUpsertFn,
     IndexQueryFn,
+    IndexQueryBatchFn,
     RerankFn,
+    RerankBatchFn,
     Chunk,
     InDoc,
     ComposeFn,
@@ -43,6 +48,10 @@ from .llm_contracts import (
     LLMProvider,
 )
 
+from .chunk_ids import chunk_id, hit_id
+
+from .tokenize import tokenize
+
 from .versions import __version__
 
 from .plugin_loader import load_plugins
@@ -73,10 +82,15 @@ __all__ = [
     # Functional Contracts
     "STRATEGY_CONTRACT_VERSION",
     "IngestionFn",
+    "IngestionIterFn",
     "ChunkingFn",
+    "ChunkingIterFn",
+    "EmbeddingFn",
     "IndexUpsertFn",
     "IndexQueryFn",
+    "IndexQueryBatchFn",
     "RerankFn",
+    "RerankBatchFn",
     "Chunk",
     "InDoc",
     "ComposeFn",
@@ -91,6 +105,11 @@ __all__ = [
     "clear_llm_cache",
     # LLM Contracts
     "LLMProvider",
+    # Chunk ids
+    "chunk_id",
+    "hit_id",
+    # Text
+    "tokenize",
     # Version
     "__version__",
     # Helpers
@@ -0,0 +1,33 @@
+# src/flowfoundry/utils/chunk_ids.py
+from __future__ import annotations
+import hashlib
+from typing import Any, Mapping
+
+
+def chunk_id(chunk: Mapping[str, Any], position: int = 0) -> str:
+    """
+    Deterministic, content-addressed id for a chunk.
+
+    Hashes (source or doc, page, chunk_index, text), so the same chunk gets
+    the same id regardless of its position in the input or of which other
+    documents are indexed alongside it, and any change to its text yields a
+    new id. `position` only stands in for a missing 'chunk_index'.
+    """
+    scope = chunk.get("source", chunk.get("doc", ""))
+    index = chunk.get("chunk_index", position)
+    key = "\x1f".join(
+        (str(scope), str(chunk.get("page", "")), str(index), str(chunk["text"]))
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def hit_id(hit: Mapping[str, Any]) -> str:
+    """
+    Identity of a retrieval hit, for deduplicating hits from different
+    indexes: its 'id' if present, else the `chunk_id` of its text and
+    metadata (which every built-in index stores from the chunk fields).
+    """
+    if hit.get("id"):
+        return str(hit["id"])
+    meta = hit.get("metadata") or {}
+    return chunk_id({**meta, "text": hit.get("text", "")})
@@ -1,6 +1,6 @@
 # src/flowfoundry/utils/contracts.py
 from __future__ import annotations
-from typing import Protocol, Dict, Any, List, Union
+from typing import Protocol, Dict, Any, Iterable, Iterator, List, Union
 from pathlib import Path
 
 STRATEGY_CONTRACT_VERSION = "1.0"
@@ -13,12 +13,27 @@ class IngestionFn(Protocol):
     def __call__(self, path: Union[str, Path], **kwargs: Any) -> List[InDoc]: ...
 
 
+class IngestionIterFn(Protocol):
+    def __call__(self, path: Union[str, Path], **kwargs: Any) -> Iterator[InDoc]: ...
+
+
 class ChunkingFn(Protocol):
     def __call__(
         self, data: Union[str, List[InDoc]], *, doc_id: str = "doc", **kwargs: Any
     ) -> List[Chunk]: ...
 
 
+class ChunkingIterFn(Protocol):
+    def __call__(
+        self, data: Union[str, Iterable[InDoc]], *, doc_id: str = "doc", **kwargs: Any
+    ) -> Iterator[Chunk]: ...
+
+
+class EmbeddingFn(Protocol):
+    # returns a (len(texts), dim) float32 array
+    def __call__(self, texts: List[str], **kwargs: Any) -> Any: ...
+
+
 class IndexUpsertFn(Protocol):
     def __call__(self, chunks: List[Chunk], **kwargs: Any) -> str: ...
 
@@ -27,12 +42,24 @@ class IndexQueryFn(Protocol):
     def __call__(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]: ...
 
 
+class IndexQueryBatchFn(Protocol):
+    def __call__(
+        self, queries: List[str], **kwargs: Any
+    ) -> List[List[Dict[str, Any]]]: ...
+
+
 class RerankFn(Protocol):
     def __call__(
         self, query: str, hits: List[Dict[str, Any]], **kwargs: Any
     ) -> List[Dict[str, Any]]: ...
 
 
+class RerankBatchFn(Protocol):
+    def __call__(
+        self, queries: List[str], hits: List[List[Dict[str, Any]]], **kwargs: Any
+    ) -> List[List[Dict[str, Any]]]: ...
+
+
 class ComposeFn(Protocol):
     def __call__(
         self, question: str, hits: List[Dict[str, Any]], **kwargs: Any
@@ -20,6 +20,7 @@ class StrategyRegistries:
         families = {
             "ingestion": {"name": callable, ...},
             "chunking":  {"name": callable, ...},
+            "embedding": {"name": callable, ...},
             "indexing":  {"name": callable, ...},
             "rerank":    {"name": callable, ...},
         }
@@ -57,11 +58,12 @@ class StrategyRegistries:
         Expected entry point groups:
           - flowfoundry.strategies.ingestion
           - flowfoundry.strategies.chunking
+          - flowfoundry.strategies.embedding
           - flowfoundry.strategies.indexing
           - flowfoundry.strategies.rerank
         """
         eps = entry_points()
-        for family in ("ingestion", "chunking", "indexing", "rerank"):
+        for family in ("ingestion", "chunking", "embedding", "indexing", "rerank"):
             for ep in eps.select(group=f"flowfoundry.strategies.{family}"):
                 self.register(family, ep.name, ep.load())
 
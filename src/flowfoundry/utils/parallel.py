@@ -0,0 +1,50 @@
+# src/flowfoundry/utils/parallel.py
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group an iterable into lists of `size` items (the last may be shorter)."""
+    it = iter(items)
+    while True:
+        batch = list(islice(it, max(1, size)))
+        if not batch:
+            return
+        yield batch
+
+
+def imap_ordered(
+    fn: Callable[[T], R],
+    tasks: Iterable[T],
+    *,
+    workers: int,
+    max_pending: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Run `fn` over `tasks` in a process pool and yield results in input order.
+
+    Unlike Executor.map, tasks are pulled lazily: at most `max_pending`
+    (default 2 * workers) are in flight, so a generator input is never drained
+    ahead of the consumer. `fn` and every task must be picklable.
+    Pending work is cancelled if the consumer stops early.
+    """
+    limit = max_pending or 2 * workers
+    pending: Deque[Future[R]] = deque()
+    it = iter(tasks)
+    ex = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for task in islice(it, limit):
+            pending.append(ex.submit(fn, task))
+        while pending:
+            result = pending.popleft().result()
+            for task in islice(it, 1):
+                pending.append(ex.submit(fn, task))
+            yield result
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,137 @@
+# src/flowfoundry/utils/tokenize.py
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str, *, stem: bool = False) -> List[str]:
+    """
+    Lexical tokenizer shared by the BM25 index and lexical reranking:
+    lower-cased runs of word characters (Unicode aware), so punctuation
+    is dropped and "Budget," matches "budget". With `stem`, English words
+    are reduced with the Porter stemmer ("budgets", "budgeted" -> "budget").
+    """
+    tokens = _WORD.findall(text.lower())
+    if stem:
+        return [porter_stem(t) for t in tokens]
+    return tokens
+
+
+# ---------- Porter (1980) stemmer ----------
+def _is_cons(w: str, i: int) -> bool:
+    c = w[i]
+    if c in "aeiou":
+        return False
+    if c == "y":
+        return i == 0 or not _is_cons(w, i - 1)
+    return True
+
+
+def _measure(stem: str) -> int:
+    """Number of vowel-consonant sequences (the 'm' in [C](VC)^m[V])."""
+    m, prev_vowel = 0, False
+    for i in range(len(stem)):
+        cons = _is_cons(stem, i)
+        if cons and prev_vowel:
+            m += 1
+        prev_vowel = not cons
+    return m
+
+
+def _has_vowel(stem: str) -> bool:
+    return any(not _is_cons(stem, i) for i in range(len(stem)))
+
+
+def _double_cons(w: str) -> bool:
+    return len(w) >= 2 and w[-1] == w[-2] and _is_cons(w, len(w) - 1)
+
+
+def _cvc(w: str) -> bool:
+    """Ends consonant-vowel-consonant, the last not w, x or y (e.g. -hop)."""
+    return (
+        len(w) >= 3
+        and _is_cons(w, len(w) - 3)
+        and not _is_cons(w, len(w) - 2)
+        and _is_cons(w, len(w) - 1)
+        and w[-1] not in "wxy"
+    )
+
+
+_STEP2: Tuple[Tuple[str, str], ...] = (
+    ("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"),
+    ("izer", "ize"), ("abli", "able"), ("alli", "al"), ("entli", "ent"),
+    ("eli", "e"), ("ousli", "ous"), ("ization", "ize"), ("ation", "ate"),
+    ("ator", "ate"), ("alism", "al"), ("iveness", "ive"), ("fulness", "ful"),
+    ("ousness", "ous"), ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"),
+)  # fmt: skip
+_STEP3: Tuple[Tuple[str, str], ...] = (
+    ("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"),
+    ("ical", "ic"), ("ful", ""), ("ness", ""),
+)  # fmt: skip
+_STEP4 = (
+    "al", "ance", "ence", "er", "ic", "able", "ible", "ant", "ement", "ment",
+    "ent", "ion", "ou", "ism", "ate", "iti", "ous", "ive", "ize",
+)  # fmt: skip
+
+
+def _replace(w: str, rules: Tuple[Tuple[str, str], ...], min_m: int) -> str:
+    for suffix, repl in rules:
+        if w.endswith(suffix):
+            stem = w[: -len(suffix)]
+            return stem + repl if _measure(stem) > min_m - 1 else w
+    return w
+
+
+@lru_cache(maxsize=1 << 16)
+def porter_stem(word: str) -> str:
+    """Stem one lower-case English word with the original Porter algorithm."""
+    w = word
+    if len(w) <= 2 or not w.isalpha():
+        return w
+    # step 1a: plurals
+    if w.endswith("sses"):
+        w = w[:-2]
+    elif w.endswith("ies"):
+        w = w[:-2]
+    elif w.endswith("s") and not w.endswith("ss"):
+        w = w[:-1]
+    # step 1b: -eed, -ed, -ing
+    if w.endswith("eed"):
+        if _measure(w[:-3]) > 0:
+            w = w[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if w.endswith(suffix) and _has_vowel(w[: -len(suffix)]):
+                w = w[: -len(suffix)]
+                if w.endswith(("at", "bl", "iz")):
+                    w += "e"
+                elif _double_cons(w) and w[-1] not in "lsz":
+                    w = w[:-1]
+                elif _measure(w) == 1 and _cvc(w):
+                    w += "e"
+                break
+    # step 1c: y -> i
+    if w.endswith("y") and _has_vowel(w[:-1]):
+        w = w[:-1] + "i"
+    # steps 2-3: derivational suffixes
+    w = _replace(w, _STEP2, 1)
+    w = _replace(w, _STEP3, 1)
+    # step 4: strip residual suffixes when the stem is long enough
+    for suffix in _STEP4:
+        if w.endswith(suffix):
+            stem = w[: -len(suffix)]
+            if _measure(stem) > 1 and (suffix != "ion" or stem.endswith(("s", "t"))):
+                w = stem
+            break
+    # step 5: final -e and -ll
+    if w.endswith("e"):
+        stem = w[:-1]
+        m = _measure(stem)
+        if m > 1 or (m == 1 and not _cvc(stem)):
+            w = stem
+    if w.endswith("ll") and _measure(w) > 1:
+        w = w[:-1]
+    return w
@@ -0,0 +1,28 @@
+# tests/conftest.py
+import pytest
+
+TEXTS = [
+    "the city budget grew by ten percent",
+    "school lunch programs were expanded",
+    "transit fares stay flat next year",
+    "housing grants for first time buyers",
+]
+
+
+@pytest.fixture
+def texts():
+    """Four short, lexically distinct chunk texts."""
+    return list(TEXTS)
+
+
+@pytest.fixture
+def make_chunks():
+    """Chunk dicts as the chunkers emit them: one page of a.pdf per text."""
+
+    def make(texts):
+        return [
+            {"doc": "d", "source": "a.pdf", "page": i + 1, "chunk_index": i, "text": t}
+            for i, t in enumerate(texts)
+        ]
+
+    return make
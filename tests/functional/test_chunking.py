@@ -1,7 +1,17 @@
 # tests/functional/test_chunking.py
 from typing import Dict, Any, List
 
-from flowfoundry import chunk_fixed, chunk_recursive, chunk_hybrid
+import pytest
+
+from flowfoundry import (
+    chunk_fixed,
+    chunk_recursive,
+    chunk_hybrid,
+    chunk_fixed_iter,
+    chunk_hybrid_iter,
+    chunk_token,
+)
+from flowfoundry.utils import FFConfigError
 
 
 def test_chunk_fixed_string_basic():
@@ -64,3 +74,144 @@ def test_chunk_recursive_breaks_text():
         assert isinstance(c["text"], str)
         # loose upper bound: chunk_size + small buffer for splitter behavior
         assert len(c["text"]) <= 30
+
+
+def test_chunk_records_share_metadata_unless_copy_requested():
+    meta = {"tags": ["x"]}
+    docs = [{"text": "abcdefghij", "doc": "A", "meta": meta}]
+
+    shared = chunk_fixed(docs, chunk_size=4, chunk_overlap=0)
+    assert len(shared) == 3
+    assert all(c["meta"] is meta for c in shared)
+    assert docs[0]["text"] == "abcdefghij"  # parent untouched
+
+    isolated = chunk_recursive(docs, chunk_size=4, chunk_overlap=0, copy_metadata=True)
+    assert all(c["meta"] == meta and c["meta"] is not meta for c in isolated)
+
+
+def test_chunk_fixed_offsets_exact_under_overlap():
+    text = "the quick brown fox jumps over the lazy dog"
+    chunks = chunk_fixed(text, chunk_size=10, chunk_overlap=4)
+    step = 10 - 4
+    for i, c in enumerate(chunks):
+        assert c["start"] == i * step
+        assert c["text"] == text[c["start"] : c["end"]]
+    assert chunks[-1]["end"] == len(text)
+
+
+def test_chunk_iter_consumes_documents_lazily():
+    pulled: List[int] = []
+
+    def pages():
+        for i in range(3):
+            pulled.append(i)
+            yield {"text": f"page {i} " * 10, "doc": f"D{i}"}
+
+    it = chunk_fixed_iter(pages(), chunk_size=16, chunk_overlap=0)
+    first = next(it)
+    assert first["doc"] == "D0" and pulled == [0]
+
+    rest = list(it)
+    assert pulled == [0, 1, 2]
+    docs = [{"text": f"page {i} " * 10, "doc": f"D{i}"} for i in range(3)]
+    assert [first, *rest] == chunk_fixed(docs, chunk_size=16, chunk_overlap=0)
+
+
+def test_chunk_hybrid_iter_matches_list_variant():
+    docs = [{"text": "x" * 300, "doc": "Z"}, {"text": "y" * 120, "doc": "W"}]
+    streamed = list(chunk_hybrid_iter(iter(docs), chunk_size=100, chunk_overlap=20))
+    assert streamed == chunk_hybrid(docs, chunk_size=100, chunk_overlap=20)
+
+
+_PROSE = (
+    "FlowFoundry splits documents.\n\nParagraphs come first, then lines.\n"
+    "Then words, and finally single characters when nothing else fits. " * 5
+)
+
+
+def test_chunk_recursive_native_offsets_are_exact():
+    chunks = chunk_recursive(_PROSE, chunk_size=60, chunk_overlap=10)
+    assert len(chunks) > 5
+    for c in chunks:
+        assert c["text"] == _PROSE[c["start"] : c["end"]]
+        assert len(c["text"]) <= 60
+
+
+def test_chunk_recursive_native_matches_langchain():
+    pytest.importorskip("langchain_text_splitters")
+    for size, overlap in [(20, 5), (60, 10), (200, 0)]:
+        native = chunk_recursive(_PROSE, chunk_size=size, chunk_overlap=overlap)
+        lc = chunk_recursive(
+            _PROSE, chunk_size=size, chunk_overlap=overlap, splitter="langchain"
+        )
+        assert [c["text"] for c in native] == [c["text"] for c in lc]
+
+
+def test_chunk_recursive_custom_separators_and_bad_splitter():
+    chunks = chunk_recursive("a|b|c|d", chunk_size=3, chunk_overlap=0, separators=["|"])
+    assert [c["text"] for c in chunks] == ["a|b", "|c", "|d"]
+    with pytest.raises(FFConfigError):
+        chunk_recursive("abc", splitter="nope")
+
+
+def test_chunk_hybrid_merges_on_offsets_with_threshold():
+    text = "ab\ncd\nef\ngh\nij\nkl"
+    docs = [{"text": text, "doc": "A"}, {"text": text, "doc": "B"}]
+
+    merged = chunk_hybrid(docs, chunk_size=6, chunk_overlap=0, merge_threshold=6)
+    unmerged = chunk_hybrid(docs, chunk_size=6, chunk_overlap=0, merge_threshold=0)
+    assert len(merged) < len(unmerged)
+    for c in merged:
+        assert c["text"] == text[c["start"] : c["end"]]
+    # chunk_index restarts for every parent doc
+    for d in ("A", "B"):
+        idx = [c["chunk_index"] for c in merged if c["doc"] == d]
+        assert idx == list(range(len(idx)))
+
+
+def test_chunk_parallel_workers_match_serial():
+    docs = [
+        {"text": f"document {i}. " * (5 + i % 7), "doc": f"D{i}", "page": i}
+        for i in range(40)
+    ]
+    for fn in (chunk_fixed, chunk_recursive, chunk_hybrid):
+        serial = fn(docs, chunk_size=30, chunk_overlap=5)
+        parallel = fn(docs, chunk_size=30, chunk_overlap=5, workers=2, batch_size=3)
+        assert parallel == serial
+
+    streamed = chunk_fixed_iter(
+        (d for d in docs), chunk_size=30, chunk_overlap=5, workers=2, batch_size=4
+    )
+    assert list(streamed) == chunk_fixed(docs, chunk_size=30, chunk_overlap=5)
+
+
+def test_chunk_token_windows_count_tokens_and_map_offsets():
+    text = "one two, three four. five six seven eight nine ten"
+    chunks = chunk_token(text, chunk_size=4, chunk_overlap=1, doc_id="T")
+    assert [c["n_tokens"] for c in chunks] == [4, 4, 4, 3]
+    for c in chunks:
+        assert c["doc"] == "T"
+        assert c["text"] == text[c["start"] : c["end"]]
+    assert chunks[0]["text"] == "one two, three"
+    assert chunks[-1]["end"] == len(text)
+
+    words = chunk_token(text, chunk_size=3, chunk_overlap=0, tokenizer="whitespace")
+    assert words[0]["text"] == "one two, three"
+
+
+def test_chunk_token_tokenizer_is_cached_and_validated():
+    from flowfoundry.functional.chunking.token import get_tokenizer
+
+    assert get_tokenizer("regex") is get_tokenizer("regex")
+    with pytest.raises(FFConfigError):
+        chunk_token("abc", tokenizer="nope")
+
+
+def test_chunkers_reject_overlap_not_below_chunk_size():
+    for fn in (chunk_fixed, chunk_recursive, chunk_hybrid, chunk_token):
+        with pytest.raises(FFConfigError):
+            fn("some text", chunk_size=10, chunk_overlap=20)
+        with pytest.raises(FFConfigError):
+            fn("some text", chunk_size=0, chunk_overlap=0)
+    with pytest.raises(FFConfigError):  # raised eagerly, before iteration
+        chunk_fixed_iter(iter([]), chunk_size=5, chunk_overlap=5)
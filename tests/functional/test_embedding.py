@@ -0,0 +1,70 @@
+# tests/functional/test_embedding.py
+import numpy as np
+import pytest
+
+from flowfoundry import embed_cached, embed_hashing, get_embedder, index_numpy_upsert
+from flowfoundry.functional.embedding import close_embedding_caches, get_embedding_cache
+from flowfoundry.utils import FFConfigError, strategies
+
+
+class _Counting:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, texts):
+        self.seen.extend(texts)
+        return embed_hashing(texts, dim=32)
+
+
+def test_hashing_is_deterministic_and_registered():
+    a = embed_hashing(["Budget grew", "budget grew"], dim=64)
+    assert a.shape == (2, 64) and a.dtype == np.float32
+    assert np.allclose(a[0], a[1]) and np.isclose(np.linalg.norm(a[0]), 1.0)
+    assert {"hashing", "sentence_transformer", "cached"} <= set(
+        strategies.list_names("embedding")
+    )
+
+
+def test_get_embedder_specs():
+    texts = ["a b c"]
+    assert get_embedder("hashing:16")(texts).shape == (1, 16)
+    assert get_embedder({"name": "hashing", "dim": 8})(texts).shape == (1, 8)
+    fn = _Counting()
+    assert get_embedder(fn) is fn
+    with pytest.raises(FFConfigError):
+        get_embedder("word2vec")
+    with pytest.raises(FFConfigError):
+        get_embedder(fn, cache="unused.sqlite")  # callable needs a cache_key
+
+
+def test_cache_embeds_each_text_once_and_persists(tmp_path):
+    db = str(tmp_path / "emb.sqlite")
+    fn = _Counting()
+    embed = get_embedder(fn, cache=db, cache_key="counting-32")
+    first = embed(["x y", "z", "x y"])
+    assert fn.seen == ["x y", "z"]  # duplicates embedded once
+    assert np.allclose(first[0], first[2])
+
+    close_embedding_caches()
+    again = get_embedder(fn, cache=db, cache_key="counting-32")(["z", "x y", "new"])
+    assert fn.seen == ["x y", "z", "new"]
+    assert np.allclose(again[:2], first[[1, 0]])
+    assert len(get_embedding_cache(db)) == 3
+
+    # other model options -> other namespace; runtime options share it
+    embed_cached(["z"], embedder="hashing:16", cache=db)
+    embed_cached(
+        ["z"], embedder={"name": "hashing", "dim": 16, "batch_size": 4}, cache=db
+    )
+    assert len(get_embedding_cache(db)) == 4
+    close_embedding_caches()
+
+
+def test_indexing_reuses_cached_embeddings_across_collections(tmp_path):
+    fn = _Counting()
+    chunks = [{"doc": "d", "chunk_index": i, "text": f"row {i}"} for i in range(4)]
+    spec = get_embedder(fn, cache=str(tmp_path / "emb.sqlite"), cache_key="c32")
+    index_numpy_upsert(chunks, collection="one", embedder=spec)
+    index_numpy_upsert(chunks, collection="two", embedder=spec)
+    assert len(fn.seen) == 4
+    close_embedding_caches()
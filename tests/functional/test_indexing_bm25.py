@@ -0,0 +1,105 @@
+# tests/functional/test_indexing_bm25.py
+import math
+
+import numpy as np
+import pytest
+
+from flowfoundry import index_bm25_query, index_bm25_upsert, index_hybrid_query
+from flowfoundry import index_hybrid_upsert
+from flowfoundry.functional.indexing import BM25Index, drop_bm25_index, drop_numpy_index
+from flowfoundry.functional.indexing.bm25_index import _decode_varint, _encode_varint
+from flowfoundry.utils import FFConfigError, tokenize
+
+DOCS = [
+    "The city budget grew by ten percent.",
+    "School lunch programs were expanded; budget unchanged.",
+    "Transit fares stay flat next year.",
+    "Invoice INV-20931 was paid in March.",
+]
+
+
+def test_varint_roundtrip():
+    v = np.array([0, 1, 127, 128, 300, 2**21, 2**28 + 5, 2**34])
+    assert _encode_varint(v[:3]).nbytes == 3
+    assert (_decode_varint(_encode_varint(v)) == v).all()
+
+
+def test_bm25_scores_match_reference_formula_across_merges():
+    rng = np.random.default_rng(0)
+    texts = [" ".join(f"w{j}" for j in rng.integers(0, 40, 12)) for _ in range(300)]
+    idx = BM25Index()
+    for start in range(0, 300, 70):  # several lazy merges
+        part = texts[start : start + 70]
+        idx.add([str(start + i) for i in range(len(part))], part, [{}] * len(part))
+        idx.search("w1", 1)
+
+    toks = [tokenize(t) for t in texts]
+    avgdl = sum(map(len, toks)) / len(toks)
+    expected = np.zeros(len(texts))
+    for term in ("w3", "w17"):
+        df = sum(term in t for t in toks)
+        idf = math.log1p((len(toks) - df + 0.5) / (df + 0.5))
+        for i, t in enumerate(toks):
+            tf = t.count(term)
+            expected[i] += idf * tf * 2.5 / (tf + 1.5 * (0.25 + 0.75 * len(t) / avgdl))
+    assert np.allclose(idx.scores("w3 w17"), expected, atol=1e-5)
+    assert idx.search("w3 w17", 1)[0][0] == int(np.argmax(expected))
+
+
+def test_bm25_persists_and_skips_existing(tmp_path, make_chunks):
+    path = str(tmp_path)
+    index_bm25_upsert(make_chunks(DOCS[:3]), path=path)
+    drop_bm25_index(path)
+    index_bm25_upsert(make_chunks(DOCS), path=path)  # reloads, adds one
+    drop_bm25_index(path)
+
+    hits = index_bm25_query("budget", path=path, k=5)
+    assert {h["text"] for h in hits} == set(DOCS[:2])
+    assert index_bm25_query("inv 20931", path=path)[0]["metadata"]["chunk_index"] == 3
+    assert index_bm25_query("nothing matches", path=path) == []
+    drop_bm25_index(path)
+
+
+def test_bm25_save_appends_records_and_merges_segments(tmp_path, make_chunks):
+    path, d = str(tmp_path), tmp_path / "docs"
+    index_bm25_upsert(make_chunks(DOCS[:3]), path=path)
+    log = (d / "records.jsonl").read_bytes()
+    first = {p.name for p in d.glob("seg*.npy")}
+
+    extra = [
+        {"doc": "e", "chunk_index": i, "text": f"ferry route {i}"} for i in range(4)
+    ]
+    index_bm25_upsert(extra[:1], path=path)  # smaller than the last: own segment
+    assert (d / "records.jsonl").read_bytes().startswith(log)
+    assert first < {p.name for p in d.glob("seg*.npy")}
+
+    drop_bm25_index(path)
+    index_bm25_upsert(extra[1:], path=path)  # 3 + 1 + 3 rows merge into one
+    assert not first & {p.name for p in d.glob("seg*.npy")}
+    drop_bm25_index(path)
+    assert index_bm25_query("ferry route 3", path=path)[0]["text"] == "ferry route 3"
+    assert index_bm25_query("budget", path=path, k=1)[0]["text"] in DOCS[:2]
+    with pytest.raises(FFConfigError):
+        index_bm25_query("budget", path=path, collection="typo")
+    drop_bm25_index(path)
+
+
+def test_hybrid_recovers_lexical_matches_the_vectors_miss(tmp_path, make_chunks):
+    path, lexical = str(tmp_path / "vec"), str(tmp_path / "bm25")
+    # a vector store that ranks by nothing useful: every text embeds the same
+    flat = {"embedder": lambda texts: np.ones((len(texts), 4))}
+    index_hybrid_upsert(
+        iter(make_chunks(DOCS)),
+        path=path,
+        lexical_path=lexical,
+        store_kwargs=flat,
+        batch_size=3,
+    )
+    hits = index_hybrid_query(
+        "invoice 20931", path=path, lexical_path=lexical, k=2, store_kwargs=flat
+    )
+    assert hits[0]["text"] == DOCS[3]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert len({h["text"] for h in hits}) == 2  # fused hits are deduplicated
+    drop_numpy_index(path)
+    drop_bm25_index(lexical)
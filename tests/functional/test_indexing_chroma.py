@@ -1,7 +1,7 @@
 # tests/functional/test_indexing_chroma.py
 import importlib.util
 import pytest
-from flowfoundry import index_chroma_upsert, index_chroma_query
+from flowfoundry import index_chroma_upsert, index_chroma_query, embed_hashing
 
 chromadb_available = importlib.util.find_spec("chromadb") is not None
 
@@ -34,3 +34,195 @@ def test_index_and_query_roundtrip(tmp_path):
     )
     assert isinstance(hits, list) and len(hits) >= 1
     assert any("budget" in h.get("text", "").lower() for h in hits)
+
+
+def test_collection_pool_reuses_evicts_and_closes(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from flowfoundry.functional.indexing import (
+        close_chroma,
+        evict_chroma_collection,
+        get_chroma_collection,
+    )
+
+    path = str(tmp_path / ".ff_chroma")
+    with ThreadPoolExecutor(4) as ex:
+        handles = list(ex.map(lambda _: get_chroma_collection(path, "docs"), range(8)))
+    assert all(h is handles[0] for h in handles)
+    assert get_chroma_collection(path, "other") is not handles[0]
+
+    evict_chroma_collection(path, "docs")
+    fresh = get_chroma_collection(path, "docs")
+    assert fresh is not handles[0] and fresh.name == "docs"
+
+    close_chroma(path)
+    assert get_chroma_collection(path, "docs") is not fresh
+    close_chroma()
+
+
+class _CountingEmbedder:
+    """Deterministic offline embedder (the `hashing` strategy) that records batch sizes."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(len(texts))
+        return embed_hashing(texts, dim=32)
+
+
+def test_upsert_streams_generator_in_batches(tmp_path):
+    from flowfoundry.functional.indexing import close_chroma, get_chroma_collection
+
+    path = str(tmp_path / ".ff_chroma")
+    coll = get_chroma_collection(path, "docs")
+    embed = _CountingEmbedder()
+
+    chunks = ({"doc": f"d{i}", "text": f"chunk {i} about budget"} for i in range(10))
+    index_chroma_upsert(
+        chunks, path=path, collection="docs", batch_size=4, embedder=embed
+    )
+    assert embed.calls == [4, 4, 2]
+    assert coll.count() == 10
+
+    hits = index_chroma_query(
+        "chunk 3 about budget", path=path, collection="docs", embedder=embed
+    )
+    assert hits[0]["text"] == "chunk 3 about budget"
+    close_chroma(path)
+
+
+def test_upsert_ids_are_content_addressed_and_skip_unchanged(tmp_path):
+    from flowfoundry.functional.indexing import close_chroma, get_chroma_collection
+    from flowfoundry.utils import chunk_id
+
+    path = str(tmp_path / ".ff_chroma")
+    coll = get_chroma_collection(path, "docs")
+    embed = _CountingEmbedder()
+
+    chunks = [
+        {"doc": "a", "chunk_index": i, "text": f"text {i}", "source": "/x/a.pdf"}
+        for i in range(5)
+    ]
+    index_chroma_upsert(chunks, path=path, embedder=embed)
+    assert embed.calls == [5]
+
+    # same chunks in another order (and batching) -> same ids, nothing embedded
+    index_chroma_upsert(list(reversed(chunks)), path=path, batch_size=2, embedder=embed)
+    assert embed.calls == [5]
+    assert chunk_id(chunks[0], position=3) == chunk_id(dict(chunks[0]))
+
+    edited = dict(chunks[2], text="text 2, revised")
+    index_chroma_upsert(chunks[:2] + [edited], path=path, embedder=embed)
+    assert embed.calls == [5, 1]
+    assert chunk_id(edited) != chunk_id(chunks[2])
+    assert coll.count() == 6
+    close_chroma(path)
+
+
+def test_query_batch_matches_single_queries(tmp_path):
+    from flowfoundry import index_chroma_query_batch
+    from flowfoundry.functional.indexing import close_chroma
+
+    path = str(tmp_path / ".ff_chroma")
+    spec = "hashing:32"  # deterministic offline embedder
+    texts = [f"topic {i} notes" for i in range(6)]
+    index_chroma_upsert(
+        [{"doc": "d", "text": t} for t in texts], path=path, embedder=spec
+    )
+
+    queries = [texts[4], texts[1], texts[3]]
+    batch = index_chroma_query_batch(
+        queries, path=path, k=2, batch_size=2, embedder=spec
+    )
+    assert len(batch) == 3
+    assert [hits[0]["text"] for hits in batch] == queries
+    assert batch == [
+        index_chroma_query(q, path=path, k=2, embedder=spec) for q in queries
+    ]
+    close_chroma(path)
+
+
+def test_metadata_passthrough_and_where_filters(tmp_path):
+    from flowfoundry.functional.indexing import close_chroma
+
+    path = str(tmp_path / ".ff_chroma")
+    spec = "hashing:32"
+    chunks = [
+        {
+            "doc": "a",
+            "source": f"{t}.pdf",
+            "page": p,
+            "chunk_index": 0,
+            "text": f"budget report {t} {p}",
+            "tags": ["dropped"],
+            "metadata": {"tenant": t},
+        }
+        for t in ("acme", "globex")
+        for p in (1, 2)
+    ]
+    index_chroma_upsert(chunks, path=path, embedder=spec)
+
+    hits = index_chroma_query("budget report", path=path, k=10, embedder=spec)
+    md = hits[0]["metadata"]
+    assert {"doc", "source", "page", "chunk_index", "tenant"} <= set(md)
+    assert "tags" not in md and "text" not in md
+
+    hits = index_chroma_query(
+        "budget report", path=path, k=10, where={"tenant": "acme"}, embedder=spec
+    )
+    assert sorted(h["metadata"]["page"] for h in hits) == [1, 2]
+    assert {h["metadata"]["source"] for h in hits} == {"acme.pdf"}
+
+    hits = index_chroma_query(
+        "budget report",
+        path=path,
+        k=10,
+        where={"page": {"$gte": 2}},
+        where_document={"$contains": "globex"},
+        embedder=spec,
+    )
+    assert [h["text"] for h in hits] == ["budget report globex 2"]
+    close_chroma(path)
+
+
+def test_embedding_spec_replaces_builtin_embedding_function(tmp_path):
+    from flowfoundry import index_chroma_query_batch
+    from flowfoundry.functional.indexing import close_chroma
+
+    path = str(tmp_path / ".ff_chroma")
+    spec = {"name": "hashing", "dim": 64, "cache": str(tmp_path / "emb.sqlite")}
+    texts = [f"minutes of meeting {i} on {w}" for i, w in enumerate("abcdef")]
+    index_chroma_upsert(
+        [{"doc": "d", "text": t} for t in texts], path=path, embedder=spec
+    )
+
+    hits = index_chroma_query(texts[2], path=path, k=1, embedder=spec)
+    assert hits[0]["text"] == texts[2]
+    batch = index_chroma_query_batch(texts[:3], path=path, k=1, embedder=spec)
+    assert [h[0]["text"] for h in batch] == texts[:3]
+    close_chroma(path)
+
+
+def test_embedder_kwarg_matches_other_stores_and_alias_warns(tmp_path):
+    from flowfoundry import index_hybrid_query, index_hybrid_upsert
+    from flowfoundry.functional.indexing import close_chroma
+    from flowfoundry.utils import FFConfigError
+
+    path = str(tmp_path / ".ff_chroma")
+    texts = [f"council minutes {i} on {w}" for i, w in enumerate("abcdef")]
+    chunks = [{"doc": "d", "chunk_index": i, "text": t} for i, t in enumerate(texts)]
+    kw = dict(store="chroma", path=path, lexical_path=str(tmp_path / "bm25"))
+    index_hybrid_upsert(chunks, store_kwargs={"embedder": "hashing:32"}, **kw)
+    hits = index_hybrid_query(
+        texts[3], k=1, store_kwargs={"embedder": "hashing:32"}, **kw
+    )
+    assert hits[0]["text"] == texts[3]
+
+    with pytest.warns(DeprecationWarning):
+        hits = index_chroma_query(texts[1], path=path, k=1, embedding="hashing:32")
+    assert hits[0]["text"] == texts[1]
+    with pytest.raises(FFConfigError):
+        index_chroma_query(
+            texts[1], path=path, embedder="hashing:32", embedding="hashing:32"
+        )
+    close_chroma(path)
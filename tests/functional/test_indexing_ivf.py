@@ -0,0 +1,110 @@
+# tests/functional/test_indexing_ivf.py
+import numpy as np
+import pytest
+
+from flowfoundry.functional.indexing import (
+    IVFIndex,
+    NumpyIndex,
+    drop_ivf_collection,
+    ivf_query,
+    ivf_upsert,
+)
+from flowfoundry.utils import FFConfigError
+
+
+def _vectors(n=2000, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(20, dim))
+    return (centers[rng.integers(0, 20, n)] + 0.3 * rng.normal(size=(n, dim))).astype(
+        np.float32
+    )
+
+
+def _recall(idx, x, q, k=10, **kw):
+    exact = NumpyIndex()
+    ids = [str(i) for i in range(len(x))]
+    exact.upsert(ids, ids, [{}] * len(x), x)
+    truth = [{r for r, _ in hits} for hits in exact.search(q, k)]
+    found = [{r for r, _ in hits} for hits in idx.search(q, k, **kw)]
+    return sum(len(a & b) for a, b in zip(found, truth)) / (k * len(q))
+
+
+@pytest.mark.parametrize(
+    "quantizer, min_recall, bytes_per_vec",
+    [("none", 1.0, 128), ("int8", 0.9, 32), ("pq", 0.4, 8)],
+)
+def test_ivf_recall_and_compression(quantizer, min_recall, bytes_per_vec):
+    x = _vectors()
+    idx = IVFIndex(nlist=16, quantizer=quantizer)
+    idx.train(x)
+    idx.add(x, np.arange(len(x)))
+    q = x[:50] + 0.01
+    # probing every list is exhaustive; only quantization error remains
+    assert _recall(idx, x, q, nprobe=16) >= min_recall
+    assert idx.bytes_per_vector == bytes_per_vec
+    assert len(idx) == len(x)
+
+
+def test_ivf_strategies_roundtrip_and_persist(tmp_path):
+    texts = [f"note {i} about {w}" for i, w in enumerate(["budget", "schools"] * 30)]
+    chunks = [{"doc": "d", "chunk_index": i, "text": t} for i, t in enumerate(texts)]
+    path = str(tmp_path)
+    ivf_upsert(chunks, path=path, quantizer="none", batch_size=16)
+    hits = ivf_query(texts[7], path=path, k=3, nprobe=64)
+    assert hits[0]["text"] == texts[7]
+
+    drop_ivf_collection(path)
+    hits = ivf_query(texts[7], path=path, k=3, nprobe=64)  # reloaded from disk
+    assert hits[0]["text"] == texts[7] and hits[0]["metadata"]["chunk_index"] == 7
+    drop_ivf_collection(path)
+
+
+def test_ivf_records_are_appended_not_rewritten(tmp_path):
+    from flowfoundry.functional.indexing import get_ivf_collection
+
+    path = str(tmp_path)
+    first = [{"doc": "a", "chunk_index": i, "text": f"alpha {i}"} for i in range(20)]
+    ivf_upsert(first, path=path, quantizer="none")
+    log = tmp_path / "docs" / "records.jsonl"
+    before = log.read_bytes()
+
+    second = [{"doc": "b", "chunk_index": i, "text": f"beta {i}"} for i in range(5)]
+    ivf_upsert(second, path=path, quantizer="none")
+    after = log.read_bytes()
+    assert after.startswith(before) and after.count(b"\n") == 25
+
+    drop_ivf_collection(path)
+    coll = get_ivf_collection(path)
+    assert len(coll) == 25 and coll.record(22)[0] == "beta 2"
+    ivf_upsert(first + second, path=path)  # all known: nothing appended
+    assert log.read_bytes() == after
+    assert ivf_query("beta 2", path=path, k=1, nprobe=64)[0]["text"] == "beta 2"
+    drop_ivf_collection(path)
+
+
+def test_ivf_rejects_bad_config():
+    with pytest.raises(FFConfigError):
+        IVFIndex(quantizer="fp4")
+    with pytest.raises(FFConfigError):
+        IVFIndex(nlist=4, quantizer="pq", pq_m=5).train(_vectors(dim=32))
+
+
+def test_ivf_unknown_collection_and_conflicting_settings(tmp_path):
+    from flowfoundry.functional.indexing import get_ivf_collection
+
+    path = str(tmp_path)
+    with pytest.raises(FFConfigError):
+        ivf_query("anything", path=path, collection="typo")
+    chunks = [{"doc": "d", "chunk_index": i, "text": f"note {i}"} for i in range(40)]
+    ivf_upsert(chunks, path=path, collection="typo", quantizer="pq", metric="dot")
+    index = get_ivf_collection(path, "typo").index
+    assert (index.quantizer, index.metric) == ("pq", "dot")
+
+    ivf_upsert(chunks[:5], path=path, collection="typo")  # None keeps the settings
+    for bad in ({"quantizer": "int8"}, {"metric": "cosine"}, {"nlist": 999}):
+        with pytest.raises(FFConfigError):
+            ivf_upsert(chunks, path=path, collection="typo", **bad)
+    drop_ivf_collection(path, "typo")
+    with pytest.raises(FFConfigError):  # also checked against a loaded collection
+        ivf_upsert(chunks, path=path, collection="typo", quantizer="none")
+    drop_ivf_collection(path, "typo")
@@ -0,0 +1,66 @@
+# tests/functional/test_indexing_mmap.py
+import numpy as np
+import pytest
+
+from flowfoundry import index_mmap_query, index_mmap_upsert
+from flowfoundry.functional.indexing import open_mmap_store
+from flowfoundry.functional.indexing.mmap_store import append_to_store
+from flowfoundry.utils import FFConfigError
+
+
+def test_mmap_store_roundtrip_and_append(tmp_path, texts, make_chunks):
+    path = str(tmp_path)
+    index_mmap_upsert(make_chunks(texts[:3]), path=path, batch_size=2)
+    hits = index_mmap_query("budget grew", path=path, k=2)
+    assert hits[0]["text"] == texts[0]
+    assert hits[0]["metadata"] == {
+        "doc": "d",
+        "source": "a.pdf",
+        "page": 1,
+        "chunk_index": 0,
+    }
+
+    store = open_mmap_store(path)
+    assert isinstance(store.vectors, np.memmap) and store.count == 3
+    assert open_mmap_store(path) is store  # warm reader reused
+
+    # unchanged chunks are skipped, new ones appended and picked up by readers
+    index_mmap_upsert(make_chunks(texts), path=path)
+    assert open_mmap_store(path).count == 4
+    top = index_mmap_query("housing grants", path=path, k=1)[0]
+    assert top["text"] == texts[3] and top["metadata"]["page"] == 4
+
+
+def test_mmap_store_ignores_and_repairs_torn_appends(tmp_path):
+    d = tmp_path / "docs"
+    vecs = np.eye(3, dtype=np.float32)
+    append_to_store(d, ["a", "b"], ["x", "y"], [{}, {}], vecs[:2])
+    for name in ("vectors.f32", "records.jsonl", "ids.txt"):
+        with open(d / name, "ab") as f:
+            f.write(b"partial write")  # crash before the header was committed
+
+    assert open_mmap_store(str(tmp_path)).count == 2
+    append_to_store(d, ["c"], ["z"], [{"k": 1}], vecs[2:])
+    store = open_mmap_store(str(tmp_path))
+    assert [store.record(i)["text"] for i in range(3)] == ["x", "y", "z"]
+    assert store.search(vecs[2:], 1)[0][0][0] == 2
+
+    with pytest.raises(FFConfigError):
+        append_to_store(d, ["d"], ["w"], [{}], np.ones((1, 4)))
+    with pytest.raises(FFConfigError):
+        open_mmap_store(str(tmp_path), "missing")
+
+
+def test_mmap_store_rejects_metric_mismatch_and_keeps_old_readers(
+    tmp_path, texts, make_chunks
+):
+    path = str(tmp_path)
+    index_mmap_upsert(make_chunks(texts[:2]), path=path, metric="dot")
+    old = open_mmap_store(path)
+    with pytest.raises(FFConfigError):
+        index_mmap_upsert(make_chunks(texts[:3]), path=path, metric="cosine")
+
+    index_mmap_upsert(make_chunks(texts[:3]), path=path)  # None keeps "dot"
+    new = open_mmap_store(path)
+    assert new is not old and (new.metric, new.count) == ("dot", 3)
+    assert old.count == 2 and old.record(1)["text"] == texts[1]  # still readable
@@ -0,0 +1,80 @@
+# tests/functional/test_indexing_numpy.py
+import numpy as np
+import pytest
+
+from flowfoundry import index_numpy_query, index_numpy_upsert
+from flowfoundry.functional.indexing import NumpyIndex, drop_numpy_index
+from flowfoundry.functional.indexing._common import _topk
+from flowfoundry.utils import FFConfigError
+
+
+def test_numpy_index_roundtrip_in_memory(texts, make_chunks):
+    index_numpy_upsert(make_chunks(texts), collection="t-mem")
+    hits = index_numpy_query("what happened to the budget", k=2, collection="t-mem")
+    assert hits[0]["text"] == texts[0]
+    assert hits[0]["metadata"]["page"] == 1
+    assert hits[0]["score"] >= hits[1]["score"]
+    drop_numpy_index(collection="t-mem")
+
+
+def test_numpy_index_skip_existing_and_custom_embedder(texts, make_chunks):
+    calls = []
+
+    def embed(batch):
+        calls.append(len(batch))
+        return np.ones((len(batch), 3)) * np.arange(1, 4)
+
+    index_numpy_upsert(
+        make_chunks(texts), collection="t-skip", embedder=embed, batch_size=3
+    )
+    index_numpy_upsert(make_chunks(texts), collection="t-skip", embedder=embed)
+    assert calls == [3, 1]
+    with pytest.raises(FFConfigError):
+        index_numpy_query("x", collection="t-skip", embedder="hashing:8")
+    drop_numpy_index(collection="t-skip")
+
+
+def test_numpy_index_save_and_mmap_load(tmp_path, texts, make_chunks):
+    path = str(tmp_path)
+    index_numpy_upsert(make_chunks(texts), path=path)
+    drop_numpy_index(path)
+
+    idx = NumpyIndex.load(tmp_path / "docs")
+    assert isinstance(idx.vectors, np.memmap) and len(idx) == 4
+    assert index_numpy_query("transit fares", path=path, k=1)[0]["text"] == texts[2]
+
+    index_numpy_upsert([{"doc": "e", "text": "new library hours"}], path=path)
+    assert len(NumpyIndex.load(tmp_path / "docs")) == 5
+    drop_numpy_index(path)
+
+
+def test_topk_matches_full_sort():
+    scores = np.random.default_rng(0).normal(size=(3, 50)).astype(np.float32)
+    rows, vals = _topk(scores, 5)
+    expected = np.argsort(-scores, axis=1)[:, :5]
+    assert (rows == expected).all()
+    assert np.allclose(vals, np.take_along_axis(scores, expected, axis=1))
+    assert _topk(scores, 100)[0].shape == (3, 50)
+
+
+def test_topk_breaks_ties_by_index():
+    scores = np.array([[0, 2, 0, 1, 0, 2, 0, 0]], dtype=np.float32)
+    rows, vals = _topk(scores, 5)
+    assert rows[0].tolist() == [1, 5, 3, 0, 2]
+    assert vals[0].tolist() == [2, 2, 1, 0, 0]
+    assert _topk(np.zeros((2, 6)), 3)[0].tolist() == [[0, 1, 2]] * 2
+    nan = np.array([[np.nan, 1.0, np.nan, 3.0]])
+    assert set(_topk(nan, 3)[0][0].tolist()) >= {1, 3}
+
+
+def test_numpy_index_unknown_collection_and_metric_mismatch(texts, make_chunks):
+    with pytest.raises(FFConfigError):
+        index_numpy_query("budget", collection="t-missing")
+    with pytest.raises(FFConfigError):  # nothing was cached by the failed query
+        index_numpy_query("budget", collection="t-missing")
+
+    index_numpy_upsert(make_chunks(texts), collection="t-dot", metric="dot")
+    index_numpy_upsert(make_chunks(texts), collection="t-dot")  # keeps "dot"
+    with pytest.raises(FFConfigError):
+        index_numpy_upsert(make_chunks(texts), collection="t-dot", metric="cosine")
+    drop_numpy_index(collection="t-dot")
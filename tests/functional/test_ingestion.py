@@ -0,0 +1,109 @@
+# tests/functional/test_ingestion.py
+import shutil
+from pathlib import Path
+
+import pytest
+
+from flowfoundry import pdf_loader, pdf_loader_iter, pdf_pages_iter
+from flowfoundry.functional.ingestion import IngestManifest, IngestStats
+from flowfoundry.utils import FFConfigError, FFIngestionError
+
+SAMPLES = Path(__file__).resolve().parents[2] / "docs" / "samples"
+
+
+@pytest.fixture
+def pdf_dir(tmp_path):
+    for name in ("sample2.pdf", "sample3.pdf"):
+        shutil.copy(SAMPLES / name, tmp_path / name)
+    return tmp_path
+
+
+def test_pdf_loader_pages_have_source_page_text(pdf_dir):
+    pages = pdf_loader(pdf_dir)
+    assert pages and all({"source", "page", "text"} <= set(p) for p in pages)
+    assert [p["page"] for p in pages if p["source"].endswith("sample2.pdf")][0] == 1
+
+
+def test_pdf_loader_parallel_matches_serial_and_reports_stats(pdf_dir):
+    stats = IngestStats()
+    parallel = pdf_loader(pdf_dir, workers=2, stats=stats)
+    assert parallel == pdf_loader(pdf_dir)
+    assert stats.files == 2 and stats.pages == len(parallel)
+    assert stats.pages_per_sec > 0
+
+
+def test_pdf_loader_collects_bad_files_instead_of_failing(pdf_dir):
+    (pdf_dir / "broken.pdf").write_bytes(b"not a pdf at all")
+    with pytest.raises(FFIngestionError):
+        pdf_loader(pdf_dir)
+
+    stats = IngestStats()
+    pages = list(pdf_loader_iter(pdf_dir, on_error="collect", stats=stats))
+    assert pages and stats.files == 2
+    assert [Path(f).name for f, _ in stats.failed] == ["broken.pdf"]
+
+
+def test_pdf_loader_iter_validates_path_eagerly(tmp_path):
+    with pytest.raises(FFIngestionError):
+        pdf_loader_iter(tmp_path / "missing")
+
+
+def test_manifest_skips_unchanged_and_queues_stale_ids(pdf_dir):
+    man = pdf_dir / "index" / "manifest.json"
+    stats = IngestStats()
+    assert {Path(p["source"]).name for p in pdf_loader(pdf_dir, manifest=man)} == {
+        "sample2.pdf",
+        "sample3.pdf",
+    }
+    # nothing recorded by an upsert yet -> both files are still pending
+    assert len(pdf_loader(pdf_dir, manifest=man, stats=stats)) > 0
+    assert stats.skipped == 0
+
+    m = IngestManifest.load(man)
+    m.record({src: [f"{Path(src).name}::{i}" for i in range(2)] for src in m.files})
+    m.save()
+
+    stats = IngestStats()
+    assert pdf_loader(pdf_dir, manifest=man, stats=stats) == []
+    assert stats.skipped == 2
+
+    shutil.copy(SAMPLES / "sample3.pdf", pdf_dir / "sample2.pdf")  # modify
+    (pdf_dir / "sample3.pdf").unlink()  # remove
+    pages = pdf_loader(pdf_dir, manifest=man)
+    assert {Path(p["source"]).name for p in pages} == {"sample2.pdf"}
+    m = IngestManifest.load(man)
+    assert sorted(m.stale_ids) == [
+        "sample2.pdf::0",
+        "sample2.pdf::1",
+        "sample3.pdf::0",
+        "sample3.pdf::1",
+    ]
+    assert [Path(k).name for k in m.files] == ["sample2.pdf"]
+
+
+def test_manifest_retries_files_that_failed_to_load(pdf_dir):
+    man = pdf_dir / "manifest.json"
+    (pdf_dir / "broken.pdf").write_bytes(b"not a pdf at all")
+    pdf_loader(pdf_dir, on_error="collect", manifest=man)
+    names = {Path(k).name for k in IngestManifest.load(man).files}
+    assert names == {"sample2.pdf", "sample3.pdf"}
+
+
+def test_pdf_pages_iter_matches_eager_loader(pdf_dir):
+    stats = IngestStats()
+    assert list(pdf_pages_iter(pdf_dir, stats=stats)) == pdf_loader(pdf_dir)
+    assert stats.files == 2
+
+
+def test_pdf_pages_iter_page_range_and_early_stop(pdf_dir):
+    pdf = pdf_dir / "sample3.pdf"
+    pages = list(pdf_pages_iter(pdf, start_page=2, end_page=3))
+    assert [p["page"] for p in pages] == [2, 3]
+    assert pages == pdf_loader(pdf)[1:3]
+
+    it = pdf_pages_iter(pdf)
+    assert next(it)["page"] == 1
+    it.close()  # releases the mapped file without extracting the rest
+
+    with pytest.raises(FFConfigError):
+        pdf_pages_iter(pdf, start_page=3, end_page=2)
@@ -1,4 +1,6 @@
 # tests/functional/test_rerank.py
+import pytest
+
 from flowfoundry import rerank_identity, preselect_bm25
 
 
@@ -29,3 +31,179 @@ def test_bm25_preselect_reduces_to_topk_and_keeps_dicts():
     out = preselect_bm25("What is people's budget?", hits, top_k=3)
     assert len(out) == 3
     assert all(isinstance(h, dict) and "text" in h for h in out)
+    assert "cats" not in " ".join(h["text"] for h in out)
+
+
+def test_bm25_preselect_keeps_input_order_for_ties():
+    hits = [{"text": f"unrelated passage {i}"} for i in range(8)]
+    hits.insert(5, {"text": "the budget"})
+    out = preselect_bm25("budget", hits, top_k=4)
+    assert [h["text"] for h in out] == [
+        "the budget",
+        "unrelated passage 0",
+        "unrelated passage 1",
+        "unrelated passage 2",
+    ]
+
+
+def test_bm25_scores_tokenize_and_stem():
+    from flowfoundry.functional.rerank.bm25 import bm25_scores
+    from flowfoundry.utils import tokenize
+
+    assert tokenize("Budgets, BUDGETED; budget!", stem=True) == ["budget"] * 3
+    texts = ["budgets were cut", "the budget", "cats and dogs"]
+    plain = bm25_scores("budget", texts)
+    assert plain[0] == 0 and plain[1] > 0 and plain[2] == 0
+    stemmed = bm25_scores("Budget?", texts, stem=True)
+    assert stemmed[0] > 0 and stemmed[1] > 0 and stemmed[2] == 0
+    out = preselect_bm25("budgeting", [{"text": t} for t in texts], top_k=1, stem=True)
+    assert out[0]["text"] == "the budget"  # shorter document wins the tie on tf
+
+
+class _FakeCrossEncoder:
+    loads = []
+    calls = []
+
+    def __init__(self, model, device=None):
+        _FakeCrossEncoder.loads.append((model, device))
+
+    def predict(self, pairs, batch_size=32, **_):
+        _FakeCrossEncoder.calls.append([len(q) + len(t) for q, t in pairs])
+        return [len(set(q.lower().split()) & set(t.lower().split())) for q, t in pairs]
+
+
+def test_cross_encoder_models_are_cached_with_lru_eviction(monkeypatch):
+    import importlib
+    from concurrent.futures import ThreadPoolExecutor
+    from flowfoundry import rerank_cross_encoder
+
+    ce = importlib.import_module("flowfoundry.functional.rerank.cross_encoder")
+
+    monkeypatch.setattr(ce, "CrossEncoder", _FakeCrossEncoder)
+    _FakeCrossEncoder.loads = []
+    ce.clear_cross_encoder_cache()
+    ce.set_cross_encoder_cache_size(2)
+    try:
+        ce.preload_cross_encoders(["m1"])
+        with ThreadPoolExecutor(4) as ex:
+            outs = list(
+                ex.map(
+                    lambda _: rerank_cross_encoder(
+                        "people budget", _hits(), model="m1"
+                    ),
+                    range(8),
+                )
+            )
+        assert _FakeCrossEncoder.loads == [("m1", None)]
+        assert outs[0][0]["score"] == 2 and outs[0][-1]["text"].endswith("cats.")
+
+        ce.get_cross_encoder_cached("m2")
+        ce.get_cross_encoder_cached("m1")  # refresh m1 -> m2 is least recent
+        ce.get_cross_encoder_cached("m3")
+        ce.get_cross_encoder_cached("m1")
+        ce.get_cross_encoder_cached("m2")
+        assert _FakeCrossEncoder.loads == [
+            ("m1", None),
+            ("m2", None),
+            ("m3", None),
+            ("m2", None),
+        ]
+    finally:
+        ce.set_cross_encoder_cache_size(4)
+        ce.clear_cross_encoder_cache()
+
+
+def test_cross_encoder_failed_load_releases_its_lock(monkeypatch):
+    import importlib
+
+    ce = importlib.import_module("flowfoundry.functional.rerank.cross_encoder")
+
+    def broken(model, device=None):
+        raise OSError(f"cannot download {model}")
+
+    monkeypatch.setattr(ce, "CrossEncoder", broken)
+    with pytest.raises(OSError):
+        ce.get_cross_encoder_cached("missing-model")
+    assert ("missing-model", None) not in ce._LOADING
+
+
+def test_cross_encoder_batch_pools_and_length_sorts_pairs(monkeypatch):
+    import importlib
+    from flowfoundry import rerank_cross_encoder, rerank_cross_encoder_batch
+
+    ce = importlib.import_module("flowfoundry.functional.rerank.cross_encoder")
+    monkeypatch.setattr(ce, "CrossEncoder", _FakeCrossEncoder)
+    _FakeCrossEncoder.calls = []
+    queries = ["people budget", "irrelevant text", "section 2 budget"]
+    lists = [_hits(), _hits()[1:], _hits()[:3]]
+    try:
+        out = rerank_cross_encoder_batch(
+            queries, lists, model="m", top_k=2, candidates=3
+        )
+        assert len(_FakeCrossEncoder.calls) == 1  # one pass over all 9 pairs
+        lengths = _FakeCrossEncoder.calls[0]
+        assert len(lengths) == 9 and lengths == sorted(lengths)
+        assert out == [
+            rerank_cross_encoder(q, h, model="m", top_k=2, candidates=3)
+            for q, h in zip(queries, lists)
+        ]
+        assert out[1][0]["text"] == "Irrelevant text about cats."
+    finally:
+        ce.clear_cross_encoder_cache()
+
+
+def test_score_cache_skips_inference_for_repeated_queries(monkeypatch, tmp_path):
+    import importlib
+    from flowfoundry import rerank_cross_encoder
+    from flowfoundry.functional.rerank import close_score_caches, get_score_cache
+
+    ce = importlib.import_module("flowfoundry.functional.rerank.cross_encoder")
+    monkeypatch.setattr(ce, "CrossEncoder", _FakeCrossEncoder)
+    db = str(tmp_path / "scores.sqlite")
+    _FakeCrossEncoder.calls = []
+    try:
+        first = rerank_cross_encoder(
+            "people budget", _hits(), model="m", score_cache=db
+        )
+        # near-repeat: case, punctuation and spacing are normalised away
+        again = rerank_cross_encoder(
+            "People  budget?", _hits(), model="m", score_cache=db
+        )
+        assert [h["score"] for h in again] == [h["score"] for h in first]
+        assert len(_FakeCrossEncoder.calls) == 1
+        assert get_score_cache(db).stats()["hit_rate"] == 0.5
+
+        # a fresh process (empty memory tier) is served from SQLite
+        close_score_caches()
+        rerank_cross_encoder("people budget", _hits()[:2], model="m", score_cache=db)
+        stats = get_score_cache(db).stats()
+        assert stats["disk_hits"] == 2 and stats["misses"] == 0
+        rerank_cross_encoder("people budget", _hits(), model="other", score_cache=db)
+        assert _FakeCrossEncoder.calls[-1] and len(_FakeCrossEncoder.calls) == 2
+    finally:
+        close_score_caches()
+        ce.clear_cross_encoder_cache()
+
+
+def test_fusion_dedups_and_fuses_rrf_and_weighted():
+    from flowfoundry import rerank_fusion
+
+    a, b, c, d = _hits()
+    vector = [dict(a, score=0.9), dict(b, score=0.5), dict(c, score=0.1)]
+    lexical = [dict(d, score=7.0), dict(b, score=3.0), dict(a, score=1.0)]
+
+    out = rerank_fusion("q", vector, lists=[lexical], k=1)
+    # a and b appear in both lists but once in the output
+    assert [h["text"] for h in out] == [a["text"], b["text"], d["text"], c["text"]]
+    assert [h["score"] for h in out] == pytest.approx([3 / 4, 2 / 3, 1 / 2, 1 / 4])
+
+    out = rerank_fusion(
+        "q", vector, lists=[lexical], method="weighted", weights=[1.0, 0.0], top_k=2
+    )
+    assert [h["text"] for h in out] == [a["text"], b["text"]]
+    assert out[0]["score"] == 1.0
+
+    # distances (ascending scores, e.g. Chroma) are flipped before normalising
+    dist = [dict(c, score=0.1), dict(a, score=0.4), dict(d, score=0.9)]
+    out = rerank_fusion("q", dist, method="weighted")
+    assert [h["score"] for h in out] == [1.0, 0.625, 0.0]